@@ -0,0 +1,988 @@
+import sys
+import error
+import parse
+
+# Ahead-of-time translation of program into standalone Python module
+#
+# Global frame variables become locals of function run, temporary frame is dict or None, local frame stack, call
+# stack and data stack are lists. Instructions are inlined as Python statements in basic blocks, which start at
+# first instruction, after labels and calls (where jumps and returns continue) and after unconditional jumps. Block
+# is selected by binary tree of comparisons of its number in loop, so jump only sets number of next block.
+#
+# Values are int, bool, str and Nil (str keeping its text) for int, bool, string and nil. Constants pushed to data
+# stack keep text of literal in interpreter, they become RawInt and RawBool, which behave as str in operations as
+# their values there do. Unset variable holds None, variable which is not defined UNDEF. Every instruction checks
+# its operands in the same order as its method of Executor, so program ends with the same output, exit code and
+# error message. Errors, which are known when program is translated, are emitted as call of fail at their place.
+
+# Argument count checked by method of Executor (None if it is not checked) and numbers of arguments it reads
+handlerArguments = {
+    "MOVE": (2, (1, 2)), "CREATEFRAME": (0, ()), "PUSHFRAME": (0, ()), "POPFRAME": (0, ()), "DEFVAR": (1, (1,)),
+    "CALL": (1, (1,)), "RETURN": (0, ()), "PUSHS": (1, (1,)), "POPS": (1, (1,)),
+    "ADD": (3, (1, 2, 3)), "SUB": (3, (1, 2, 3)), "MUL": (3, (1, 2, 3)), "IDIV": (3, (1, 2, 3)),
+    "LT": (3, (1, 2, 3)), "GT": (3, (1, 2, 3)), "EQ": (3, (1, 2, 3)),
+    "AND": (3, (1, 2, 3)), "OR": (3, (1, 2, 3)), "NOT": (2, (1, 2)),
+    "INT2CHAR": (2, (1, 2)), "STRI2INT": (3, (1, 2, 3)), "READ": (2, (1, 2)), "WRITE": (1, (1,)),
+    "CONCAT": (3, (1, 2, 3)), "STRLEN": (2, (1, 2)), "GETCHAR": (3, (1, 2, 3)), "SETCHAR": (3, (1, 2, 3)),
+    "TYPE": (2, (1, 2)), "LABEL": (1, ()), "JUMP": (1, (1,)), "JUMPIFEQ": (3, (1, 2, 3)), "JUMPIFNEQ": (3, (1, 2, 3)),
+    "EXIT": (1, (1,)), "DPRINT": (None, (1,)), "BREAK": (None, ()),
+}
+
+# Instructions after which execution does not continue with next instruction
+transferOps = {"JUMP", "CALL", "RETURN", "EXIT"}
+
+symbolTypes = ["int", "string", "bool", "nil"]
+
+arithmeticOperators = {"ADD": "+", "SUB": "-", "MUL": "*", "IDIV": "//"}
+
+# Type of value of each class known to translator
+classTypes = {"int": "int", "bool": "bool", "str": "string", "Nil": "nil"}
+
+# Return of call at the last instruction ends program, return of other call after the end fails
+returnEnd = -1
+returnPastEnd = -2
+
+# Runtime included in every generated module
+runtime = '''import sys
+
+class Nil(str):
+    __slots__ = ()
+
+# Int and bool constants pushed to data stack, interpreter keeps text of their literals
+class RawInt(str):
+    __slots__ = ()
+
+class RawBool(str):
+    __slots__ = ()
+
+class Undefined:
+    __slots__ = ()
+
+UNDEF = Undefined()
+
+TYPES = {int: "int", bool: "bool", str: "string", Nil: "nil", RawInt: "int", RawBool: "bool"}
+
+def fail(code, message):
+    sys.stdout.flush()
+    sys.stderr.write(message)
+    raise SystemExit(code)
+
+def missing(value, name):
+    if value is UNDEF:
+        fail(54, f"ERR: Variable {name} does not exist.")
+    fail(56, f"ERR: Variable {name} is not set.")
+
+# Jump or return after the end of program
+def pastEnd():
+    raise IndexError("list index out of range")
+
+# Value as interpreter keeps it
+def rawValue(value):
+    if type(value) is bool:
+        return int(value)
+    if type(value) in (Nil, RawInt, RawBool):
+        return str(value)
+    return value
+
+# Check of value read from variable holding pushed int constant
+def validate(value):
+    try:
+        int(value)
+    except ValueError:
+        fail(32, "ERR: Invalid value in instruction.")
+
+# Value converted to its type by MOVE
+def canonical(value):
+    if type(value) is RawInt:
+        return int(value)
+    if type(value) is RawBool:
+        return False
+    return value
+
+# Text of value written by WRITE
+def text(value):
+    if type(value) is bool:
+        return "true" if value else "false"
+    if type(value) is RawBool:
+        return "false"
+    if type(value) is Nil:
+        return ""
+    return str(value)
+
+def read(inputFile, typeName):
+    try:
+        value = inputFile.readline().strip()
+    except Exception:
+        return Nil("nil")
+    if typeName == "bool":
+        return value.lower() == "true"
+    if typeName == "int":
+        try:
+            return int(value)
+        except ValueError:
+            sys.stderr.write("ERR: Invalid value in instruction.")
+            return Nil("nil")
+    if typeName == "nil":
+        return Nil(value)
+    return value
+
+def int2char(value):
+    try:
+        return chr(value)
+    except ValueError:
+        fail(58, "ERR: Invalid value in INT2CHAR instruction.")
+
+def exitWith(code):
+    sys.stdout.flush()
+    raise SystemExit(code)
+
+def debug(order, globalFrame, TF, LS, DS, depth):
+    print("Current instruction order: ", order, file=sys.stderr)
+    print("Call depth: ", depth, file=sys.stderr)
+    print("Global frame: ", file=sys.stderr)
+    for name, value in globalFrame:
+        if value is not UNDEF:
+            print(f"    {name} = {rawValue(value)}", file=sys.stderr)
+    for title, frame in (("Temporary frame", TF), ("Local frame", LS[-1] if LS else None)):
+        if frame is None:
+            print(f"{title}: None", file=sys.stderr)
+            continue
+        print(f"{title}: ", file=sys.stderr)
+        for name, value in frame.items():
+            print(f"    {name} = {rawValue(value)}", file=sys.stderr)
+    print("Data stack: ", file=sys.stderr)
+    # Interpreter fails on the first value printed from data stack
+    if DS:
+        DS.pop()
+        fail(32, "ERR: Error while executing opcode BREAK.")
+'''
+
+main = '''
+def main():
+    inputFile = sys.stdin
+    for argument in sys.argv[1:]:
+        if not argument.startswith("--input="):
+            fail(10, f"ERR: Unknown argument {argument}.")
+        try:
+            inputFile = open(argument[len("--input="):], "r")
+        except IOError:
+            fail(11, "ERR: File does not appear to exist.")
+    run(inputFile)
+
+if __name__ == "__main__":
+    main()
+'''
+
+# Program uses instruction which can not be translated
+class CompileError(Exception):
+    pass
+
+# Operand of instruction, type is type of constant, None for variable
+# Variable of global frame has its local and class of its value if it is known
+class Operand:
+    __slots__ = ("expr", "type", "valid", "local", "cls")
+
+    def __init__(self, expr, type=None, valid=True, local=None, cls=None):
+        self.expr = expr
+        self.type = type
+        self.valid = valid
+        self.local = local
+        self.cls = cls
+
+class Transpiler:
+    def __init__(self, program:parse.XMLElements, sourceName):
+        self.program = program
+        self.sourceName = sourceName
+        self.orderList = sorted(program.getInstructions())
+        self.indexes = {order: index for index, order in enumerate(self.orderList)}
+        # Locals holding global frame variables, module level constants and sets of classes
+        self.globals = {}
+        self.constants = {}
+        self.typeSets = {}
+        self.labels = {}
+        self.labelError = None
+        self.rawInts = False
+        self.rawBools = False
+        self.findVariables()
+        # Classes of values of each type
+        self.classes = {"int": ["int"] + (["RawInt"] if self.rawInts else []),
+                        "bool": ["bool"] + (["RawBool"] if self.rawBools else []),
+                        "string": ["str"], "nil": ["Nil"]}
+        self.rawClasses = (["RawInt"] if self.rawInts else []) + (["RawBool"] if self.rawBools else [])
+        # Code of instruction being translated, dead after statement which always fails
+        self.lines = []
+        self.dead = False
+        self.instruction = None
+        self.index = None
+        # Locals of global variables known in current block to be defined and to be set with class of value
+        # (None if it is not known), their checks are not repeated
+        self.defined = set()
+        self.known = {}
+
+    # Return source of module
+    def run(self) -> str:
+        self.registerLabels()
+        body = self.translate()
+        lines = [f"# Program {self.sourceName} translated by aot.py", runtime]
+        for name, expr in self.constants.values():
+            lines.append(f"{name} = {expr}")
+        for classes, name in self.typeSets.items():
+            lines.append(f"{name} = frozenset(({', '.join(classes)},))")
+
+        # Names used in every instruction are locals of run
+        defaults = ["type=type", "len=len", "UNDEF=UNDEF"] + [f"{name}={name}" for name in self.typeSets.values()]
+        lines.append("")
+        lines.append(f"def run(inputFile, {', '.join(defaults)}):")
+        for name, local in self.globals.items():
+            lines.append(f"    # {local} = GF@{name}")
+        lines.append("    write = sys.stdout.write")
+        if len(self.globals) != 0:
+            lines.append(f"    {' = '.join(self.globals.values())} = UNDEF")
+        lines.append("    TF = None")
+        lines.append("    LS = []")
+        lines.append("    CS = []")
+        lines.append("    DS = []")
+        lines += ["    " + line for line in body]
+        lines.append(main)
+        return "\n".join(lines)
+
+    # Assign locals to variables of global frame, find constants pushed with text of literal
+    def findVariables(self):
+        program = self.program
+        for order in self.orderList:
+            instruction = program.getInstruction(order)
+            for key in instruction.getArgumentsKeys():
+                argument = instruction.getArgument(key)
+                if argument.getXmlType() == "var":
+                    if argument.getData().getFrameName() == "GF":
+                        self.globalName(argument.getData().getName())
+                elif instruction.getOpcode() == "PUSHS" and key == 1:
+                    value = argument.getData().getValue()
+                    if argument.getXmlType() == "int" and isinstance(value, str):
+                        self.rawInts = True
+                    elif argument.getXmlType() == "bool" and isinstance(value, str):
+                        self.rawBools = True
+
+    def globalName(self, name) -> str:
+        local = self.globals.get(name)
+        if local is None:
+            local = f"v{len(self.globals)}"
+            self.globals[name] = local
+        return local
+
+    # Return name of module level constant of class Nil, RawInt or RawBool
+    def constant(self, className, value) -> str:
+        key = (className, value)
+        entry = self.constants.get(key)
+        if entry is None:
+            entry = (f"K{len(self.constants)}", f"{className}({value!r})")
+            self.constants[key] = entry
+        return entry[0]
+
+    def typeSet(self, classes) -> str:
+        classes = tuple(classes)
+        name = self.typeSets.get(classes)
+        if name is None:
+            name = f"T{len(self.typeSets)}"
+            self.typeSets[classes] = name
+        return name
+
+    # Labels are saved before program runs, as Interpret.execute does, error stops program at its start
+    def registerLabels(self):
+        for order, instruction in self.program.getLabelInstructions():
+            if 1 not in instruction.getArgumentsKeys():
+                self.labelError = self.failCall(error.wrongXMLStructure, "ERR: Argument 1 not found.")
+                return
+            try:
+                labelName = instruction.getArgument(1).getData().getValue()
+            except AttributeError:
+                self.labelError = "raise AttributeError('value')"
+                return
+            if self.labels.get(labelName) is not None:
+                self.labelError = self.failCall(error.semantics, f"ERR: Label {labelName} already exists.")
+                return
+            self.labels[labelName] = order
+
+    # Return code of function body, loop selecting basic blocks
+    def translate(self) -> list:
+        count = len(self.orderList)
+        if count == 0:
+            return ["return"]
+        if self.labelError is not None:
+            return [self.labelError]
+
+        leaders = {0}
+        for order in self.labels.values():
+            if self.indexes[order] + 2 < count:
+                leaders.add(self.indexes[order] + 2)
+        for index, order in enumerate(self.orderList):
+            opcode = self.program.getInstruction(order).getOpcode()
+            if opcode == "CALL" and index + 2 < count:
+                leaders.add(index + 2)
+            if opcode in transferOps and index + 1 < count:
+                leaders.add(index + 1)
+        # Calls among the last two instructions return to the end of program or after it
+        self.returnsOutside = any(self.program.getInstruction(order).getOpcode() == "CALL"
+                                  for order in self.orderList[-2:])
+        self.leaders = sorted(leaders)
+        self.blockNumbers = {index: number for number, index in enumerate(self.leaders)}
+
+        blocks = [self.translateBlock(number) for number in range(len(self.leaders))]
+        return ["pc = 0", "while True:"] + indent(selectBlock(blocks, 0, len(blocks) - 1))
+
+    def translateBlock(self, number) -> list:
+        start = self.leaders[number]
+        end = self.leaders[number + 1] if number + 1 < len(self.leaders) else len(self.orderList)
+        lines = []
+        self.defined = set()
+        self.known = {}
+        for index in range(start, end):
+            self.lines = []
+            self.dead = False
+            transfer = self.translateInstruction(index)
+            lines += self.lines
+            if self.dead or transfer:
+                return lines
+        if end == len(self.orderList):
+            lines.append("return")
+        else:
+            lines += [f"pc = {number + 1}", "continue"]
+        return lines
+
+    # Translate instruction, return True if it does not continue with next one
+    def translateInstruction(self, index) -> bool:
+        order = self.orderList[index]
+        instruction = self.program.getInstruction(order)
+        opcode = instruction.getOpcode()
+        self.instruction = instruction
+        self.index = index
+        self.emit(f"# {order} {opcode}")
+
+        handler = handlerArguments.get(opcode)
+        if handler is None:
+            self.fail(error.wrongXMLStructure, f"ERR: Error while executing opcode {opcode}.")
+            return True
+        count, numbers = handler
+        keys = instruction.getArgumentsKeys()
+        if count is not None and len(keys) != count:
+            self.fail(error.wrongXMLStructure, f"ERR: Invalid count of arguments in {opcode} instruction.")
+            return True
+        for number in numbers:
+            if number not in keys:
+                self.fail(error.wrongXMLStructure, f"ERR: Argument {number} not found.")
+                return True
+        getattr(self, opcode)(instruction)
+        return opcode in transferOps
+
+    ## CODE HELPERS ##
+
+    def emit(self, line):
+        if not self.dead:
+            self.lines.append(line)
+
+    def failCall(self, code, message) -> str:
+        return f"fail({code}, {message!r})"
+
+    # Emit statement which always fails, rest of instruction is not reachable
+    def fail(self, code, message):
+        self.emit(self.failCall(code, message))
+        self.dead = True
+
+    def wrongTypeCall(self, code=error.wrongType) -> str:
+        instruction = self.instruction
+        return self.failCall(code, f"ERR: Error in {instruction.getOpcode()} instruction with order "
+                                   f"{instruction.getOrder()}. Error code: {code}.")
+
+    def wrongType(self, code=error.wrongType):
+        self.emit(self.wrongTypeCall(code))
+        self.dead = True
+
+    # Check argument kind as myAssert does, return False if it always fails
+    def requireKind(self, argument, kind) -> bool:
+        if argument.getXmlType() != kind:
+            self.wrongType()
+            return False
+        return True
+
+    # Statements continuing after instruction at index, as Interpret.jumpAfter does
+    def continueAfter(self, index) -> list:
+        if index == len(self.orderList) - 1:
+            return ["return"]
+        if index + 2 >= len(self.orderList):
+            return ["pastEnd()"]
+        return [f"pc = {self.blockNumbers[index + 2]}", "continue"]
+
+    # Return labelled index, emit failure if label does not exist
+    def labelIndex(self, argument):
+        labelName = argument.getData().getValue()
+        if self.labels.get(labelName) is None:
+            self.fail(error.semantics, f"ERR: Label {labelName} does not exist.")
+            return None
+        return self.indexes[self.labels[labelName]]
+
+    # Emit lookup of variable which is read, return expression of its value
+    def load(self, argument, checkSet=True):
+        data = argument.getData()
+        frameName = data.getFrameName()
+        name = data.getName()
+        if frameName == "GF":
+            expr = self.globalName(name)
+            if expr in self.known or (not checkSet and expr in self.defined):
+                return expr
+            self.defined.add(expr)
+            if checkSet:
+                self.known[expr] = None
+        elif frameName == "TF":
+            expr = f"x{argument.getArgNumber()}"
+            self.emit(f"if TF is None: {self.failCall(error.notExistingFrame, 'ERR: Frame is not defined.')}")
+            self.emit(f"{expr} = TF.get({name!r}, UNDEF)")
+        elif frameName == "LF":
+            expr = f"x{argument.getArgNumber()}"
+            self.emit(f"if not LS: {self.failCall(error.notExistingFrame, 'ERR: Local frame is not defined.')}")
+            self.emit(f"{expr} = LS[-1].get({name!r}, UNDEF)")
+        else:
+            self.fail(error.notExistingFrame, f"ERR: Invalid frame name {frameName}.")
+            return None
+        if checkSet:
+            self.emit(f"if {expr} is None or {expr} is UNDEF: missing({expr}, {name!r})")
+        else:
+            self.emit(f"if {expr} is UNDEF: missing(UNDEF, {name!r})")
+        return expr
+
+    # Emit lookup of variable which is written, return start of statement assigning to it
+    def target(self, argument):
+        data = argument.getData()
+        frameName = data.getFrameName()
+        name = data.getName()
+        if frameName == "GF":
+            local = self.globalName(name)
+            if local not in self.defined:
+                self.emit(f"if {local} is UNDEF: missing(UNDEF, {name!r})")
+                self.defined.add(local)
+            return f"{local} = "
+        if frameName == "TF":
+            self.emit(f"if TF is None: {self.failCall(error.notExistingFrame, 'ERR: Frame is not defined.')}")
+            self.emit(f"if {name!r} not in TF: missing(UNDEF, {name!r})")
+            return f"TF[{name!r}] = "
+        if frameName == "LF":
+            self.emit(f"if not LS: {self.failCall(error.notExistingFrame, 'ERR: Local frame is not defined.')}")
+            self.emit("f = LS[-1]")
+            self.emit(f"if {name!r} not in f: missing(UNDEF, {name!r})")
+            return f"f[{name!r}] = "
+        self.fail(error.notExistingFrame, f"ERR: Invalid frame name {frameName}.")
+        return None
+
+    # Return operand of argument, variable is checked as getSymbolType does unless checkSet is False
+    def operand(self, argument, checkSet=True):
+        if argument.getXmlType() == "var":
+            expr = self.load(argument, checkSet)
+            if expr is None:
+                return None
+            if argument.getData().getFrameName() == "GF":
+                return Operand(expr, local=expr, cls=self.known.get(expr))
+            return Operand(expr)
+        type = argument.getXmlType()
+        value = argument.getData().getValue()
+        # Constant is converted by getSymbolValue
+        if type == "int":
+            if isinstance(value, int):
+                return Operand(repr(value), type)
+            try:
+                return Operand(repr(int(value)), type)
+            except (TypeError, ValueError):
+                return Operand(None, type, False)
+        if type == "bool":
+            if isinstance(value, int):
+                return Operand(repr(value == 1), type)
+            return Operand(repr(str(value).lower() == "true"), type)
+        if type == "string":
+            return Operand(repr(value), type)
+        if type == "nil":
+            return Operand(self.constant("Nil", value), type)
+        return Operand("None", type)
+
+    # Value of constant as it is pushed to data stack
+    def pushedValue(self, argument) -> str:
+        type = argument.getXmlType()
+        value = argument.getData().getValue()
+        if type == "int":
+            return repr(value) if isinstance(value, int) else self.constant("RawInt", value)
+        if type == "bool":
+            return repr(value == 1) if isinstance(value, int) else self.constant("RawBool", value)
+        if type == "string":
+            return repr(value)
+        return self.constant("Nil", value)
+
+    # Emit check of operand type, return False if it always fails
+    def requireType(self, operand, types) -> bool:
+        type = self.knownType(operand)
+        if type is not None:
+            if type not in types:
+                self.wrongType()
+                return False
+            return True
+        self.emit(f"if {self.notOfTypes(operand.expr, types)}: {self.wrongTypeCall()}")
+        # Value of the only class passed the check
+        classes = self.typeClasses(types)
+        if len(classes) == 1 and operand.local is not None:
+            operand.cls = classes[0]
+            self.known[operand.local] = classes[0]
+        return True
+
+    # Type of constant or of variable with known class, None if it is not known
+    def knownType(self, operand):
+        if operand.type is not None:
+            return operand.type
+        return classTypes.get(operand.cls)
+
+    def typeClasses(self, types) -> list:
+        classes = []
+        for type in types:
+            classes += self.classes[type]
+        return classes
+
+    # Condition true if value has none of types
+    def notOfTypes(self, expr, types) -> str:
+        classes = self.typeClasses(types)
+        if len(classes) == 1:
+            return f"type({expr}) is not {classes[0]}"
+        return f"type({expr}) not in {self.typeSet(classes)}"
+
+    # Emit check that operands have the same type, nil is accepted with any type if nil is True
+    def requireSameType(self, operand1, operand2, nil=False) -> bool:
+        type1, type2 = self.knownType(operand1), self.knownType(operand2)
+        if type1 is not None and type2 is not None:
+            if type1 != type2 and not (nil and "nil" in (type1, type2)):
+                self.wrongType()
+                return False
+            return True
+        if nil and "nil" in (type1, type2):
+            return True
+        if type1 is not None or type2 is not None:
+            type, dynamic = (type1, operand2) if type1 is not None else (type2, operand1)
+            if type not in self.classes:
+                self.wrongType()
+                return False
+            types = [type, "nil"] if nil else [type]
+            self.emit(f"if {self.notOfTypes(dynamic.expr, types)}: {self.wrongTypeCall()}")
+            return True
+        expr1, expr2 = operand1.expr, operand2.expr
+        condition = f"type({expr1}) is not type({expr2}) and TYPES[type({expr1})] != TYPES[type({expr2})]"
+        if nil:
+            condition += f" and type({expr1}) is not Nil and type({expr2}) is not Nil"
+        self.emit(f"if {condition}: {self.wrongTypeCall()}")
+        return True
+
+    # Emit check of value as getSymbolValue does, only int literals can be invalid
+    def value(self, operand) -> bool:
+        if operand.type is not None:
+            if not operand.valid:
+                self.fail(error.wrongXMLStructure, "ERR: Invalid value in instruction.")
+                return False
+            return True
+        if self.rawInts and operand.cls is None:
+            self.emit(f"if type({operand.expr}) is RawInt: validate({operand.expr})")
+        return True
+
+    # Emit operands of instruction with variable and two symbols checked as by arithmetic and string instructions
+    def binaryOperands(self, instruction, type1, type2):
+        if not self.requireKind(instruction.getArgument(1), "var"):
+            return None
+        operand1 = self.operand(instruction.getArgument(2))
+        if operand1 is None or not self.requireType(operand1, [type1]):
+            return None
+        operand2 = self.operand(instruction.getArgument(3))
+        if operand2 is None or not self.requireType(operand2, [type2]):
+            return None
+        if not self.value(operand1) or not self.value(operand2):
+            return None
+        return operand1, operand2
+
+    # Emit assignment of value of given class (None if it is not known) to variable
+    def store(self, argument, expr, cls):
+        start = self.target(argument)
+        if start is not None:
+            self.emit(start + expr)
+            self.assigned(argument, cls)
+
+    def assigned(self, argument, cls):
+        if argument.getData().getFrameName() == "GF":
+            local = self.globalName(argument.getData().getName())
+            self.defined.add(local)
+            self.known[local] = cls
+
+    ## INSTRUCTIONS ##
+
+    def MOVE(self, instruction:parse.XMLInstruction):
+        if not self.requireKind(instruction.getArgument(1), "var"):
+            return
+        start = self.target(instruction.getArgument(1))
+        if start is None:
+            return
+        operand = self.operand(instruction.getArgument(2))
+        if operand is None or not self.value(operand):
+            return
+        if operand.type is not None and operand.type not in self.classes:
+            raise CompileError(f"MOVE of {operand.type} constant at order {instruction.getOrder()}")
+        expr = operand.expr
+        if operand.type is None and len(self.rawClasses) != 0:
+            if len(self.rawClasses) == 1:
+                condition = f"type({expr}) is {self.rawClasses[0]}"
+            else:
+                condition = f"type({expr}) in {self.typeSet(self.rawClasses)}"
+            expr = f"canonical({expr}) if {condition} else {expr}"
+        self.emit(start + expr)
+        cls = operand.cls if operand.type is None else self.classes[operand.type][0]
+        self.assigned(instruction.getArgument(1), cls)
+
+    def CREATEFRAME(self, instruction:parse.XMLInstruction):
+        self.emit("TF = {}")
+
+    def PUSHFRAME(self, instruction:parse.XMLInstruction):
+        self.emit(f"if TF is None: {self.failCall(error.notExistingFrame, 'ERR: Frame is not defined.')}")
+        self.emit("LS.append(TF)")
+        self.emit("TF = None")
+
+    def POPFRAME(self, instruction:parse.XMLInstruction):
+        self.emit(f"if not LS: {self.failCall(error.notExistingFrame, 'ERR: Local frame stack is empty.')}")
+        self.emit("TF = LS.pop()")
+
+    def DEFVAR(self, instruction:parse.XMLInstruction):
+        argument = instruction.getArgument(1)
+        if not self.requireKind(argument, "var"):
+            return
+        frameName = argument.getData().getFrameName()
+        name = argument.getData().getName()
+        exists = self.failCall(error.semantics, f"ERR: Variable {name} already exists.")
+        if frameName == "GF":
+            local = self.globalName(name)
+            self.emit(f"if {local} is not UNDEF: {exists}")
+            self.emit(f"{local} = None")
+            self.defined.add(local)
+            self.known.pop(local, None)
+        elif frameName == "TF":
+            self.emit(f"if TF is None: {self.failCall(error.notExistingFrame, 'ERR: Frame is not defined.')}")
+            self.emit(f"if {name!r} in TF: {exists}")
+            self.emit(f"TF[{name!r}] = None")
+        elif frameName == "LF":
+            self.emit(f"if not LS: {self.failCall(error.notExistingFrame, 'ERR: Local frame is not defined.')}")
+            self.emit(f"if {name!r} in LS[-1]: {exists}")
+            self.emit(f"LS[-1][{name!r}] = None")
+        else:
+            self.fail(error.notExistingFrame, f"ERR: Invalid frame name {frameName}.")
+
+    def CALL(self, instruction:parse.XMLInstruction):
+        argument = instruction.getArgument(1)
+        if not self.requireKind(argument, "label"):
+            return
+        index = self.labelIndex(argument)
+        if index is None:
+            return
+        if self.index == len(self.orderList) - 1:
+            returnTo = returnEnd
+        elif self.index + 2 >= len(self.orderList):
+            returnTo = returnPastEnd
+        else:
+            returnTo = self.blockNumbers[self.index + 2]
+        self.emit(f"CS.append({returnTo})")
+        for line in self.continueAfter(index):
+            self.emit(line)
+
+    def RETURN(self, instruction:parse.XMLInstruction):
+        self.emit(f"if not CS: {self.failCall(error.missingValue, 'ERR: Call stack is empty.')}")
+        self.emit("pc = CS.pop()")
+        if self.returnsOutside:
+            self.emit(f"if pc == {returnEnd}: return")
+            self.emit(f"if pc == {returnPastEnd}: pastEnd()")
+        self.emit("continue")
+
+    def PUSHS(self, instruction:parse.XMLInstruction):
+        argument = instruction.getArgument(1)
+        operand = self.operand(argument)
+        if operand is None or not self.requireType(operand, symbolTypes):
+            return
+        if operand.type is None:
+            self.emit(f"DS.append({operand.expr})")
+        else:
+            self.emit(f"DS.append({self.pushedValue(argument)})")
+
+    def POPS(self, instruction:parse.XMLInstruction):
+        argument = instruction.getArgument(1)
+        if not self.requireKind(argument, "var"):
+            return
+        self.emit(f"if not DS: {self.failCall(error.missingValue, 'ERR: Data stack is empty.')}")
+        self.store(argument, "DS.pop()", None)
+
+    def arithmetic(self, instruction:parse.XMLInstruction):
+        operands = self.binaryOperands(instruction, "int", "int")
+        if operands is None:
+            return
+        expr1, expr2 = operands[0].expr, operands[1].expr
+        operator = arithmeticOperators[instruction.getOpcode()]
+        if operator == "//":
+            if operands[1].type is not None:
+                if expr2 == "0":
+                    self.fail(error.wrongOperandValue, "ERR: Division by zero.")
+                    return
+            else:
+                self.emit(f"if {expr2} == 0: {self.failCall(error.wrongOperandValue, 'ERR: Division by zero.')}")
+        start = self.target(instruction.getArgument(1))
+        if start is None:
+            return
+        # Text of pushed literals is concatenated or repeated as in interpreter, other operations fail on it
+        exact = [operand.type == "int" or operand.cls == "int" for operand in operands]
+        if self.rawInts and (operator == "+" and not any(exact) or operator == "*" and not all(exact)):
+            self.emit(f"r = {expr1} {operator} {expr2}")
+            self.emit(start + "r if type(r) is int else RawInt(r)")
+            self.assigned(instruction.getArgument(1), None)
+        else:
+            self.emit(start + f"{expr1} {operator} {expr2}")
+            self.assigned(instruction.getArgument(1), "int")
+
+    ADD = SUB = MUL = IDIV = arithmetic
+
+    def relational(self, instruction:parse.XMLInstruction):
+        if not self.requireKind(instruction.getArgument(1), "var"):
+            return
+        operand1 = self.operand(instruction.getArgument(2))
+        if operand1 is None:
+            return
+        operand2 = self.operand(instruction.getArgument(3))
+        if operand2 is None or not self.requireSameType(operand1, operand2):
+            return
+        for operand in (operand1, operand2):
+            if not self.requireType(operand, ["int", "string", "bool"]):
+                return
+        if not self.value(operand1) or not self.value(operand2):
+            return
+        operator = "<" if instruction.getOpcode() == "LT" else ">"
+        self.store(instruction.getArgument(1), f"{operand1.expr} {operator} {operand2.expr}", "bool")
+
+    LT = GT = relational
+
+    # Operands of EQ and conditional jumps, checked before label is
+    def comparedOperands(self, instruction):
+        operand1 = self.operand(instruction.getArgument(2))
+        if operand1 is None or not self.requireType(operand1, symbolTypes):
+            return None
+        operand2 = self.operand(instruction.getArgument(3))
+        if operand2 is None or not self.requireType(operand2, symbolTypes):
+            return None
+        if not self.requireSameType(operand1, operand2, True):
+            return None
+        return operand1, operand2
+
+    def EQ(self, instruction:parse.XMLInstruction):
+        if not self.requireKind(instruction.getArgument(1), "var"):
+            return
+        operands = self.comparedOperands(instruction)
+        if operands is None or not self.value(operands[0]) or not self.value(operands[1]):
+            return
+        self.store(instruction.getArgument(1), f"{operands[0].expr} == {operands[1].expr}", "bool")
+
+    def logical(self, instruction:parse.XMLInstruction):
+        operands = self.binaryOperands(instruction, "bool", "bool")
+        if operands is None:
+            return
+        expr = f"{operands[0].expr} {instruction.getOpcode().lower()} {operands[1].expr}"
+        # Result is true only if it is true value, pushed literal is false
+        if self.rawBools:
+            expr = f"({expr}) is True"
+        self.store(instruction.getArgument(1), expr, "bool")
+
+    AND = OR = logical
+
+    def NOT(self, instruction:parse.XMLInstruction):
+        if not self.requireKind(instruction.getArgument(1), "var"):
+            return
+        operand = self.operand(instruction.getArgument(2))
+        if operand is None or not self.requireType(operand, ["bool"]) or not self.value(operand):
+            return
+        self.store(instruction.getArgument(1), f"not {operand.expr}", "bool")
+
+    def INT2CHAR(self, instruction:parse.XMLInstruction):
+        if not self.requireKind(instruction.getArgument(1), "var"):
+            return
+        operand = self.operand(instruction.getArgument(2))
+        if operand is None or not self.requireType(operand, ["int"]) or not self.value(operand):
+            return
+        self.store(instruction.getArgument(1), f"int2char({operand.expr})", "str")
+
+    # Emit index check of STRI2INT and GETCHAR, return start of assignment to result
+    def indexedString(self, instruction):
+        operands = self.binaryOperands(instruction, "string", "int")
+        if operands is None:
+            return None
+        start = self.target(instruction.getArgument(1))
+        if start is None:
+            return None
+        string, index = operands[0].expr, operands[1].expr
+        self.emit(f"if not ({index} >= 0 and {index} < len({string})): {self.wrongTypeCall(error.invalidString)}")
+        return start, f"{string}[{index}]"
+
+    def STRI2INT(self, instruction:parse.XMLInstruction):
+        result = self.indexedString(instruction)
+        if result is not None:
+            self.emit(f"{result[0]}ord({result[1]})")
+            self.assigned(instruction.getArgument(1), "int")
+
+    def GETCHAR(self, instruction:parse.XMLInstruction):
+        result = self.indexedString(instruction)
+        if result is not None:
+            self.emit(result[0] + result[1])
+            self.assigned(instruction.getArgument(1), "str")
+
+    def READ(self, instruction:parse.XMLInstruction):
+        if not self.requireKind(instruction.getArgument(1), "var"):
+            return
+        if not self.requireKind(instruction.getArgument(2), "type"):
+            return
+        typeName = instruction.getArgument(2).getData().getValue()
+        if typeName not in symbolTypes:
+            raise CompileError(f"READ of type {typeName} at order {instruction.getOrder()}")
+        self.store(instruction.getArgument(1), f"read(inputFile, {typeName!r})", None)
+
+    def WRITE(self, instruction:parse.XMLInstruction):
+        operand = self.operand(instruction.getArgument(1))
+        if operand is None or not self.value(operand):
+            return
+        if operand.type is None:
+            expr = operand.expr
+            self.emit(f"write({expr} if type({expr}) is str else text({expr}))")
+            return
+        # Text of constant is known, interpreter prints None for constants of other than symbol types
+        if operand.type == "bool":
+            value = "true" if operand.expr == "True" else "false"
+        elif operand.type == "int":
+            value = operand.expr
+        elif operand.type == "string":
+            value = instruction.getArgument(1).getData().getValue()
+        elif operand.type == "nil":
+            value = ""
+        else:
+            value = "None"
+        if len(value) != 0:
+            self.emit(f"write({value!r})")
+
+    def CONCAT(self, instruction:parse.XMLInstruction):
+        operands = self.binaryOperands(instruction, "string", "string")
+        if operands is not None:
+            self.store(instruction.getArgument(1), f"{operands[0].expr} + {operands[1].expr}", "str")
+
+    def STRLEN(self, instruction:parse.XMLInstruction):
+        if not self.requireKind(instruction.getArgument(1), "var"):
+            return
+        operand = self.operand(instruction.getArgument(2))
+        if operand is None or not self.requireType(operand, ["string"]):
+            return
+        start = self.target(instruction.getArgument(1))
+        if start is not None:
+            self.emit(f"{start}len({operand.expr})")
+            self.assigned(instruction.getArgument(1), "int")
+
+    def SETCHAR(self, instruction:parse.XMLInstruction):
+        operands = []
+        for number, type in ((1, "string"), (2, "int"), (3, "string")):
+            operand = self.operand(instruction.getArgument(number))
+            if operand is None or not self.requireType(operand, [type]):
+                return
+            operands.append(operand)
+        for operand in operands:
+            if not self.value(operand):
+                return
+        string, index, replacement = [operand.expr for operand in operands]
+        self.emit(f"if not (len({string}) > {index} and len({replacement}) != 0 and {index} >= 0): "
+                  f"{self.wrongTypeCall(error.invalidString)}")
+        argument = instruction.getArgument(1)
+        if argument.getXmlType() != "var":
+            self.fail(error.wrongXMLStructure, "ERR: Error while executing opcode SETCHAR.")
+            return
+        self.store(argument, f"{string}[:{index}] + {replacement}[0] + {string}[{index} + 1:]", "str")
+
+    def TYPE(self, instruction:parse.XMLInstruction):
+        if not self.requireKind(instruction.getArgument(1), "var"):
+            return
+        start = self.target(instruction.getArgument(1))
+        if start is None:
+            return
+        argument = instruction.getArgument(2)
+        if argument.getXmlType() != "var":
+            self.emit(start + repr(argument.getXmlType()))
+            self.assigned(instruction.getArgument(1), "str")
+            return
+        expr = self.load(argument, False)
+        if expr is not None:
+            self.emit(f"{start}'' if {expr} is None else TYPES[type({expr})]")
+            self.assigned(instruction.getArgument(1), "str")
+
+    def LABEL(self, instruction:parse.XMLInstruction):
+        pass
+
+    def JUMP(self, instruction:parse.XMLInstruction):
+        argument = instruction.getArgument(1)
+        if not self.requireKind(argument, "label"):
+            return
+        index = self.labelIndex(argument)
+        if index is not None:
+            for line in self.continueAfter(index):
+                self.emit(line)
+
+    def conditionalJump(self, instruction:parse.XMLInstruction):
+        if not self.requireKind(instruction.getArgument(1), "label"):
+            return
+        operands = self.comparedOperands(instruction)
+        if operands is None:
+            return
+        index = self.labelIndex(instruction.getArgument(1))
+        if index is None or not self.value(operands[0]) or not self.value(operands[1]):
+            return
+        operator = "==" if instruction.getOpcode() == "JUMPIFEQ" else "!="
+        self.emit(f"if {operands[0].expr} {operator} {operands[1].expr}:")
+        for line in self.continueAfter(index):
+            self.emit("    " + line)
+
+    JUMPIFEQ = JUMPIFNEQ = conditionalJump
+
+    def EXIT(self, instruction:parse.XMLInstruction):
+        operand = self.operand(instruction.getArgument(1))
+        if operand is None or not self.requireType(operand, ["int"]) or not self.value(operand):
+            return
+        expr = operand.expr
+        self.emit(f"if not ({expr} >= 0 and {expr} <= 49): {self.wrongTypeCall(error.wrongOperandValue)}")
+        self.emit(f"exitWith({expr})")
+
+    def DPRINT(self, instruction:parse.XMLInstruction):
+        operand = self.operand(instruction.getArgument(1), False)
+        if operand is not None and self.value(operand):
+            self.emit(f"sys.stderr.write({operand.expr})")
+
+    def BREAK(self, instruction:parse.XMLInstruction):
+        globalFrame = ", ".join(f"({name!r}, {local})" for name, local in self.globals.items())
+        self.emit(f"debug({instruction.getOrder()}, ({globalFrame}{',' if len(self.globals) == 1 else ''}), "
+                  "TF, LS, DS, len(CS))")
+
+def indent(lines) -> list:
+    return ["    " + line for line in lines]
+
+# Return code selecting block by binary search of its number
+def selectBlock(blocks, first, last) -> list:
+    if first == last:
+        return blocks[first]
+    middle = (first + last + 1) // 2
+    return ([f"if pc < {middle}:"] + indent(selectBlock(blocks, first, middle - 1)) +
+            ["else:"] + indent(selectBlock(blocks, middle, last)))
+
+# Write program translated to Python module
+def run(interpret, program:parse.XMLElements, fileName):
+    sourceName = interpret.sourceFile if interpret.sourceFile is not None else "from standard input"
+    try:
+        source = Transpiler(program, sourceName).run()
+    except CompileError as e:
+        sys.stderr.write(f"ERR: Program can not be compiled: {e}.")
+        exit(error.internalError)
+    try:
+        with open(fileName, "w", encoding="utf-8") as file:
+            file.write(source)
+    except IOError:
+        sys.stderr.write("ERR: Cannot write compiled program.")
+        exit(error.wrongOutputFile)
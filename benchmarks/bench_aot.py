@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+def run(arguments):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + arguments + ["--input=/dev/null"], capture_output=True, text=True,
+                            check=True)
+    return time.perf_counter() - start, result.stdout
+
+# Compare interpreter, --jit and program translated by --aot on loops and recursion
+# Usage: bench_aot.py [iterations] [depth]
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    cases = [(f"counting loop, {iterations} iterations", programs.countingLoop(iterations)),
+             (f"loop with branch, {iterations} iterations", programs.biasedLoop(iterations)),
+             (f"recursion, depth {depth}", programs.countdown(depth, False))]
+    with tempfile.TemporaryDirectory() as directory:
+        for number, (name, instructions) in enumerate(cases):
+            path = os.path.join(directory, f"{number}.xml")
+            module = os.path.join(directory, f"{number}.py")
+            programs.writeProgram(path, instructions)
+            start = time.perf_counter()
+            subprocess.run([sys.executable, interpreter, f"--source={path}", f"--aot={module}"], check=True)
+            translation = time.perf_counter() - start
+
+            interpreted, expected = run([interpreter, f"--source={path}"])
+            jit, jitOutput = run([interpreter, f"--source={path}", "--jit"])
+            compiled, compiledOutput = run([module])
+            if jitOutput != expected or compiledOutput != expected:
+                raise RuntimeError("output differs from interpreter")
+            print(name)
+            print(f"  interpreter     {interpreted:7.3f} s")
+            print(f"  --jit           {jit:7.3f} s  speedup {interpreted / jit:5.1f}x")
+            print(f"  --aot module    {compiled:7.3f} s  speedup {interpreted / compiled:5.1f}x  "
+                  f"(translation {translation:.3f} s)")
+
+if __name__ == "__main__":
+    main()
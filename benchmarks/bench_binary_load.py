@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+import time
+import programs
+import binprog
+import parse
+
+# Compare load time of large program in XML and binary representation
+# Usage: bench_binary_load.py [instruction count]
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as directory:
+        xmlPath = os.path.join(directory, "program.xml")
+        binaryPath = os.path.join(directory, "program.ippb")
+        programs.writeProgram(xmlPath, programs.straightLine(count))
+        binprog.convert(xmlPath, binaryPath)
+        print(f"instructions: {count}")
+        print(f"xml size:     {os.path.getsize(xmlPath)} B")
+        print(f"binary size:  {os.path.getsize(binaryPath)} B")
+
+        xmlTime = measure(lambda: parse.Parser(xmlPath).run())
+        binaryTime = measure(lambda: binprog.load(binaryPath))
+        print(f"xml load:     {xmlTime:.3f} s")
+        print(f"binary load:  {binaryTime:.3f} s ({xmlTime / binaryTime:.1f}x faster)")
+
+# Time loading program and preparing it for execution (labels, sorted orders, first instruction)
+def measure(load) -> float:
+    start = time.perf_counter()
+    program = load()
+    instructions = program.getInstructions()
+    orders = sorted(instructions.keys())
+    program.getLabelInstructions()
+    program.getInstruction(orders[0])
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    main()
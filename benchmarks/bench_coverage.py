@@ -0,0 +1,48 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+import covmap
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+def run(path, options):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, interpreter, f"--source={path}", "--input=/dev/null"] + options,
+                   capture_output=True, check=True)
+    return time.perf_counter() - start
+
+# Compare run of counting loop with and without --coverage and time merging of many coverage files
+# Usage: bench_coverage.py [iterations] [merged files]
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    files = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "loop.xml")
+        coverageFile = os.path.join(directory, "loop.cov")
+        programs.writeProgram(path, programs.countingLoop(iterations))
+        print(f"iterations: {iterations}")
+        # Best of three runs, single runs are too noisy for few percent
+        plain = min(run(path, []) for _ in range(3))
+        covered = min(run(path, [f"--coverage={coverageFile}"]) for _ in range(3))
+        print(f"default      {plain:.3f} s")
+        print(f"--coverage   {covered:.3f} s  overhead {100 * (covered / plain - 1):+.1f} %")
+
+        # Coverage of large program copied as if recorded by many runs
+        path = os.path.join(directory, "line.xml")
+        programs.writeProgram(path, programs.straightLine(100000))
+        run(path, [f"--coverage={coverageFile}"])
+        inputs = []
+        for index in range(files):
+            inputs.append(os.path.join(directory, f"run{index}.cov"))
+            shutil.copyfile(coverageFile, inputs[-1])
+        start = time.perf_counter()
+        covmap.mergeFiles(os.path.join(directory, "merged.cov"), inputs)
+        elapsed = time.perf_counter() - start
+        print(f"merge of {files} files with 100000 instructions  {elapsed:.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+import error
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+limitOptions = ["--max-memory=100000000", "--max-stack-depth=100000", "--max-string-length=10000000"]
+
+def run(path, options):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, interpreter, f"--source={path}", "--input=/dev/null"] + options,
+                            capture_output=True)
+    return time.perf_counter() - start, result.returncode
+
+# Measure cost of limit checks on counting loop and how fast limits stop doubling of string
+# Usage: bench_limits.py [iterations]
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "loop.xml")
+        programs.writeProgram(path, programs.countingLoop(iterations))
+        print(f"iterations: {iterations}")
+        # Best of three interleaved runs, single runs are too noisy for few percent
+        times = [(run(path, [])[0], run(path, limitOptions)[0]) for _ in range(3)]
+        plain = min(pair[0] for pair in times)
+        limited = min(pair[1] for pair in times)
+        print(f"loop                {plain:.3f} s")
+        print(f"loop with limits    {limited:.3f} s  overhead {100 * (limited / plain - 1):+.1f} %")
+
+        # Without limits 40 doublings would need terabytes of memory
+        path = os.path.join(directory, "doubling.xml")
+        programs.writeProgram(path, programs.concatDoubling(40))
+        elapsed, code = run(path, limitOptions)
+        print(f"doubling stopped    {elapsed:.3f} s  exit code {code}")
+
+        # Copies made by MOVE into pushed frames hold about 200 MB, each of them is charged
+        path = os.path.join(directory, "copies.xml")
+        programs.writeProgram(path, programs.pushedCopies(20000))
+        elapsed, code = run(path, ["--max-memory=5000000"])
+        print(f"copies stopped      {elapsed:.3f} s  exit code {code}")
+        elapsed, jitCode = run(path, ["--max-memory=5000000", "--jit"])
+        print(f"copies with --jit   {elapsed:.3f} s  exit code {jitCode}")
+        if code != error.limitExceeded or jitCode != error.limitExceeded:
+            raise RuntimeError("memory limit was not exceeded by copies in pushed frames")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+# Return (seconds, peak RSS in MB, output) of interpreter run
+def run(path, options):
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, interpreter, f"--source={path}", "--input=/dev/null"] + options,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    output = process.stdout.read()
+    # Resource usage of the process alone, RUSAGE_CHILDREN would keep peak of earlier runs
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"interpreter exited with code {process.returncode}")
+    return time.perf_counter() - start, usage.ru_maxrss / 1024, output
+
+# Compare peak memory of string building phases with and without --release-dead (Linux, ru_maxrss in kB)
+# Usage: bench_liveness.py [phases] [doublings]
+def main():
+    phases = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    doublings = int(sys.argv[2]) if len(sys.argv) > 2 else 22
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "phases.xml")
+        programs.writeProgram(path, programs.stringPhases(phases, doublings))
+        print(f"{phases} phases, string of {16 << doublings >> 20} MiB characters in each")
+        print(f"{'options':30} {'peak RSS [MB]':>14} {'time [s]':>9}")
+        expected = None
+        for options in ([], ["--release-dead"], ["--optimize"], ["--optimize", "--release-dead"]):
+            elapsed, peak, output = run(path, options)
+            if expected is None:
+                expected = output
+            elif output != expected:
+                raise RuntimeError("output differs from interpreter")
+            print(f"{' '.join(options) or 'default':30} {peak:14.1f} {elapsed:9.2f}")
+
+if __name__ == "__main__":
+    main()
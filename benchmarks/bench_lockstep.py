@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import time
+import programs
+import interpreter
+import lockstep
+
+# Run program for every input in one process, vectorized or by scalar Executor one input after another
+def run(path, inputs, vectorize):
+    interpret = interpreter.Interpret()
+    interpret.sourceFile = path
+    runner = lockstep.LockstepRunner(interpret, interpret.loadProgram())
+    start = time.perf_counter()
+    runner.execute(runner.openInputs(inputs), vectorize)
+    return time.perf_counter() - start, runner
+
+def results(runner):
+    return ["".join(output) for output in runner.outputs], ["".join(errors) for errors in runner.errors], runner.codes
+
+# Compare lockstep execution with scalar interpreter run for every input
+# Usage: bench_lockstep.py [inputs] [iterations]
+def main():
+    if lockstep.numpy is None:
+        print("NumPy is not installed")
+        exit(1)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 128
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "loop.xml")
+        programs.writeProgram(path, programs.inputLoop())
+        print(f"inputs: {count}, iterations: {iterations}")
+
+        # Same count for every input keeps instances together, different counts split them at the end
+        for name, counts in [("same input", [iterations] * count),
+                             ("different inputs", [iterations + index % 16 for index in range(count)])]:
+            inputs = []
+            for index, value in enumerate(counts):
+                inputs.append(os.path.join(directory, f"input{index}.txt"))
+                with open(inputs[-1], "w", encoding="utf-8") as file:
+                    file.write(f"{value}\n")
+            scalar, scalarRunner = run(path, inputs, False)
+            vector, vectorRunner = run(path, inputs, True)
+            if results(vectorRunner) != results(scalarRunner):
+                raise RuntimeError("lockstep results differ from scalar execution")
+            print(f"{name:<17} scalar {scalar:7.3f} s  lockstep {vector:7.3f} s  speedup {scalar / vector:6.1f}x  "
+                  f"{count / vector:9.1f} runs/s")
+
+if __name__ == "__main__":
+    main()
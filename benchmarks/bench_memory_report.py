@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+def run(path, options):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, interpreter, f"--source={path}", "--input=/dev/null"] + options,
+                   capture_output=True, check=True)
+    return time.perf_counter() - start
+
+# Compare run of counting loop with and without --memory-report at several sampling intervals
+# Usage: bench_memory_report.py [iterations]
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "loop.xml")
+        report = os.path.join(directory, "memory.txt")
+        programs.writeProgram(path, programs.countingLoop(iterations))
+        print(f"iterations: {iterations}")
+        # Best of three runs, single runs are too noisy for few percent
+        plain = min(run(path, []) for _ in range(3))
+        print(f"{'default':<44} {plain:.3f} s")
+        for interval in (100000, 10000, 100):
+            options = [f"--memory-report={report}", f"--memory-interval={interval}"]
+            elapsed = min(run(path, options) for _ in range(3))
+            print(f"{' '.join(options[1:]) + ' --memory-report':<44} {elapsed:.3f} s  "
+                  f"overhead {100 * (elapsed / plain - 1):+.1f} %")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+# Compare run of loop with constant expressions with and without --optimize
+# Usage: bench_optimizer.py [iterations]
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "program.xml")
+        programs.writeProgram(path, programs.constantExpressions(iterations))
+        print(f"iterations: {iterations}")
+        for options in ([], ["--optimize"], ["--jit"], ["--optimize", "--jit"]):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, interpreter, f"--source={path}", "--input=/dev/null"] + options,
+                                    capture_output=True, text=True, check=True)
+            elapsed = time.perf_counter() - start
+            name = " ".join(options) or "default"
+            print(f"{name:<20} {elapsed:.3f} s  {result.stderr.strip()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import os
+import sys
+import tempfile
+import time
+import programs
+import parallel
+import parse
+
+# Compare sequential and parallel parsing of large XML program
+# Usage: bench_parallel_parse.py [instruction count] [workers]
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "program.xml")
+        programs.writeProgram(path, programs.straightLine(count))
+        print(f"instructions: {count}, workers: {workers}, cpus: {os.cpu_count()}")
+
+        start = time.perf_counter()
+        parse.Parser(path).run()
+        sequential = time.perf_counter() - start
+        print(f"sequential:   {sequential:.3f} s")
+
+        start = time.perf_counter()
+        program = parallel.load(path, workers)
+        program.getLabelInstructions()
+        elapsed = time.perf_counter() - start
+        print(f"parallel:     {elapsed:.3f} s ({sequential / elapsed:.2f}x)")
+
+if __name__ == "__main__":
+    main()
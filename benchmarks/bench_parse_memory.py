@@ -0,0 +1,33 @@
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import programs
+import parse
+
+# Measure memory of parsed program (tracemalloc peak while parsing and size kept afterwards)
+# Usage: bench_parse_memory.py [instruction count]
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "program.xml")
+        programs.writeProgram(path, programs.straightLine(count))
+        print(f"instructions: {count}")
+
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        program = parse.Parser(path).run()
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"parse time:   {elapsed:.3f} s")
+        print(f"peak:         {peak / 2**20:.1f} MiB")
+        print(f"retained:     {current / 2**20:.1f} MiB ({current / count:.0f} B per instruction)")
+        del program
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+def run(path, options):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, interpreter, f"--source={path}", "--input=/dev/null"] + options,
+                            capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, result.stdout
+
+# Compare JIT warming up on its own with JIT using profile of earlier run
+# Usage: bench_pgo.py [iterations]
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "loop.xml")
+        profile = os.path.join(directory, "loop.prof")
+        programs.writeProgram(path, programs.biasedLoop(iterations))
+        print(f"iterations: {iterations}")
+
+        recorded, expected = run(path, [f"--profile-save={profile}"])
+        print(f"profiling run         {recorded:.3f} s  profile {os.path.getsize(profile)} B")
+        # Best of three interleaved runs
+        times = []
+        for _ in range(3):
+            jit, jitOutput = run(path, ["--jit"])
+            guided, guidedOutput = run(path, [f"--profile-use={profile}"])
+            if jitOutput != expected or guidedOutput != expected:
+                raise RuntimeError("output differs from profiling run")
+            times.append((jit, guided))
+        jit = min(pair[0] for pair in times)
+        guided = min(pair[1] for pair in times)
+        print(f"--jit                 {jit:.3f} s")
+        print(f"--profile-use         {guided:.3f} s  speedup {jit / guided:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+import error
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+# Compare time to first output and total time of large program read from stdin with and without --pipeline
+# Usage: bench_pipeline.py [instruction count]
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "program.xml")
+        first = [("WRITE", [("string", "first")])]
+        programs.writeProgram(path, itertools.chain(first, programs.straightLine(count - 1)))
+        inputPath = os.path.join(directory, "input.txt")
+        open(inputPath, "w").close()
+        print(f"instructions: {count}")
+        for options in ([], ["--pipeline"]):
+            firstOutput, total = measure(path, [f"--input={inputPath}"] + options)
+            name = " ".join(options) or "default"
+            print(f"{name:<11} first output {firstOutput:.3f} s, total {total:.3f} s")
+
+        # Program can not be optimized before it is parsed, combination is rejected instead of ignoring --optimize
+        result = subprocess.run([sys.executable, interpreter, f"--source={path}", f"--input={inputPath}", "--pipeline",
+                                 "--optimize"], capture_output=True)
+        if result.returncode != error.wrongArguments:
+            raise RuntimeError(f"--pipeline with --optimize exited with code {result.returncode}")
+
+def measure(path, options):
+    with open(path, "rb") as source:
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, interpreter] + options, stdin=source, stdout=subprocess.PIPE)
+        process.stdout.read(1)
+        firstOutput = time.perf_counter() - start
+        process.stdout.read()
+        process.wait()
+        return firstOutput, time.perf_counter() - start
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+import server
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+# Send requests from clients over their own connections, return latencies of all requests
+async def generateLoad(socketPath, message, requests, clients):
+    latencies = []
+    remaining = [requests]
+
+    async def client():
+        reader, writer = await asyncio.open_unix_connection(socketPath, limit=server.maxRequestSize)
+        try:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                start = time.perf_counter()
+                stdout, stderr, code = await server.request(reader, writer, message)
+                latencies.append(time.perf_counter() - start)
+                if code != 0:
+                    raise RuntimeError(f"request failed with code {code}: {stderr}")
+        finally:
+            writer.close()
+
+    await asyncio.gather(*[client() for _ in range(clients)])
+    return latencies
+
+# Send short requests while large program is parsed, return (latencies of short requests, time of large one)
+async def loadDuringParse(socketPath, largeMessage, message, requests):
+    async def large():
+        reader, writer = await asyncio.open_unix_connection(socketPath, limit=server.maxRequestSize)
+        try:
+            start = time.perf_counter()
+            await server.request(reader, writer, largeMessage)
+            return time.perf_counter() - start
+        finally:
+            writer.close()
+
+    parsing = asyncio.create_task(large())
+    # Large request must reach server first
+    await asyncio.sleep(0.2)
+    latencies = await generateLoad(socketPath, message, requests, 1)
+    return latencies, await parsing
+
+def percentile(values, share) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+def waitForSocket(path, process):
+    while not os.path.exists(path):
+        if process.poll() is not None:
+            raise RuntimeError("server exited")
+        time.sleep(0.01)
+
+# Compare requests to persistent server with starting interpreter for each program
+# Usage: bench_serve.py [requests] [clients]
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "short.xml")
+        socketPath = os.path.join(directory, "interpret.sock")
+        programs.writeProgram(path, programs.straightLine(10))
+        with open(path, encoding="utf-8") as file:
+            message = {"program": file.read()}
+
+        # Interpreter started for each program, one after another
+        runs = 50
+        start = time.perf_counter()
+        for _ in range(runs):
+            subprocess.run([sys.executable, interpreter, f"--source={path}", "--input=/dev/null"],
+                           capture_output=True, check=True)
+        elapsed = time.perf_counter() - start
+        print(f"process per program    {runs / elapsed:8.1f} requests/s  {1000 * elapsed / runs:7.2f} ms each")
+
+        largePath = os.path.join(directory, "large.xml")
+        programs.writeProgram(largePath, programs.straightLine(200000))
+        largeMessage = {"source": largePath}
+
+        process = subprocess.Popen([sys.executable, interpreter, f"--serve={socketPath}"])
+        try:
+            waitForSocket(socketPath, process)
+            start = time.perf_counter()
+            latencies = asyncio.run(generateLoad(socketPath, message, requests, clients))
+            elapsed = time.perf_counter() - start
+            # Short programs are already parsed, only large one is parsed while they run
+            parseLatencies, largeTime = asyncio.run(loadDuringParse(socketPath, largeMessage, message, 20))
+        finally:
+            process.terminate()
+            process.wait()
+        print(f"--serve, {clients} clients     {requests / elapsed:8.1f} requests/s  "
+              f"p50 {1000 * percentile(latencies, 0.5):.2f} ms  p99 {1000 * percentile(latencies, 0.99):.2f} ms")
+        print(f"while large program is parsed and run ({largeTime:.2f} s): "
+              f"max latency of short request {1000 * max(parseLatencies):.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+import binprog
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+# Large straight line program, it waits for input at its end so memory of workers can be measured
+def waitingProgram(count):
+    yield from programs.straightLine(count)
+    yield "DEFVAR", [("var", "GF@x")]
+    yield "READ", [("var", "GF@x"), ("type", "int")]
+
+# Return memory of process in kB from /proc: Rss, Pss and private memory
+def memory(pid) -> dict:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        for line in file:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                values[name] = int(rest.split()[0])
+    return {"Rss": values["Rss"], "Pss": values["Pss"],
+            "Private": values["Private_Clean"] + values["Private_Dirty"]}
+
+# Process blocked in READ sleeps, others run or wait for processor
+def sleeping(pid) -> bool:
+    with open(f"/proc/{pid}/stat") as file:
+        return file.read().rsplit(")", 1)[1].split()[0] == "S"
+
+# Start workers and measure their memory when all of them wait in READ at end of program
+def measure(arguments, workers) -> tuple:
+    # Closed input ends READ with error, its message is not shown
+    processes = [subprocess.Popen([sys.executable, interpreter] + arguments, stdin=subprocess.PIPE,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for _ in range(workers)]
+    try:
+        start = time.perf_counter()
+        # Waiting must be seen twice, short sleeps happen while process starts
+        stable = 0
+        while stable < 2:
+            time.sleep(0.2)
+            for process in processes:
+                if process.poll() is not None:
+                    raise RuntimeError(f"worker exited with code {process.returncode}")
+            stable = stable + 1 if all(sleeping(process.pid) for process in processes) else 0
+        elapsed = time.perf_counter() - start
+        return [memory(process.pid) for process in processes], elapsed
+    finally:
+        for process in processes:
+            process.stdin.close()
+            process.wait()
+
+def report(name, samples, elapsed, extra=None):
+    average = lambda key: sum(sample[key] for sample in samples) / len(samples) / 1024
+    total = sum(sample["Pss"] for sample in samples) / 1024
+    if extra is not None:
+        total += extra["Pss"] / 1024
+    print(f"{name:16} {average('Rss'):8.1f} {average('Pss'):8.1f} {average('Private'):8.1f} {total:10.1f} "
+          f"{elapsed:8.1f}")
+
+# Compare memory of workers running the same large program from XML, binary file and shared memory (Linux only)
+# Usage: bench_shared.py [instruction count] [workers]
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "program.xml")
+        binaryPath = os.path.join(directory, "program.ippb")
+        programs.writeProgram(path, waitingProgram(count))
+        binprog.convert(path, binaryPath)
+        print(f"{count} instructions, {workers} workers, memory in MB per worker, total PSS includes loader")
+        print(f"{'program':16} {'RSS':>8} {'PSS':>8} {'private':>8} {'total PSS':>10} {'time [s]':>8}")
+
+        samples, elapsed = measure([f"--source={path}"], workers)
+        report("XML", samples, elapsed)
+        samples, elapsed = measure([f"--source={binaryPath}"], workers)
+        report("binary file", samples, elapsed)
+
+        name = f"ipp-bench-{os.getpid()}"
+        loader = subprocess.Popen([sys.executable, interpreter, f"--source={path}", f"--share={name}"],
+                                  stdout=subprocess.PIPE, text=True)
+        try:
+            if loader.stdout.readline() == "":
+                raise RuntimeError("program was not shared")
+            loaderMemory = memory(loader.pid)
+            samples, elapsed = measure([f"--attach={name}"], workers)
+            report("shared memory", samples, elapsed, loaderMemory)
+            print(f"loader RSS {loaderMemory['Rss'] / 1024:.1f} MB")
+        finally:
+            loader.terminate()
+            loader.wait()
+
+if __name__ == "__main__":
+    main()
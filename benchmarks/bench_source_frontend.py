@@ -0,0 +1,54 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+import ippcode
+import parse
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+interpreter = os.path.join(root, "interpret.py")
+
+# Compare end-to-end run of large program given as XML (and parse.php chain if php is installed)
+# and as IPPcode23 source text read directly by interpret.py
+# Usage: bench_source_frontend.py [instruction count]
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as directory:
+        xmlPath = os.path.join(directory, "program.xml")
+        sourcePath = os.path.join(directory, "program.IPPcode23")
+        programs.writeProgram(xmlPath, programs.straightLine(count))
+        programs.writeSource(sourcePath, programs.straightLine(count))
+        print(f"instructions: {count}")
+
+        if shutil.which("php") is not None:
+            chainTime = measure(f"php {os.path.join(root, 'parse.php')} < {sourcePath} | "
+                                f"{sys.executable} {interpreter} --input=/dev/null")
+            print(f"parse.php | interpret.py: {chainTime:.3f} s")
+        else:
+            print("parse.php | interpret.py: skipped, php is not installed")
+
+        xmlTime = measure(f"{sys.executable} {interpreter} --source={xmlPath} --input=/dev/null")
+        sourceTime = measure(f"{sys.executable} {interpreter} --source={sourcePath} --input=/dev/null")
+        print(f"interpret.py on XML:      {xmlTime:.3f} s")
+        print(f"interpret.py on source:   {sourceTime:.3f} s ({xmlTime / sourceTime:.2f}x)")
+
+        # Loading only, without process startup and execution
+        start = time.perf_counter()
+        parse.Parser(xmlPath).run()
+        xmlLoad = time.perf_counter() - start
+        start = time.perf_counter()
+        ippcode.SourceParser(sourcePath).run()
+        sourceLoad = time.perf_counter() - start
+        print(f"load XML:                 {xmlLoad:.3f} s")
+        print(f"load source:              {sourceLoad:.3f} s ({xmlLoad / sourceLoad:.2f}x)")
+
+def measure(command) -> float:
+    start = time.perf_counter()
+    subprocess.run(command, shell=True, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    main()
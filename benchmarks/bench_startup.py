@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+# Time above bare Python start allowed for 10 instruction program, in milliseconds
+defaultBudget = 25
+
+def run(arguments):
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + arguments, capture_output=True)
+    return time.perf_counter() - start
+
+# Best of runs, start of process is noisy
+def best(arguments, runs) -> float:
+    return min(run(arguments) for _ in range(runs))
+
+# Return total import time and (cumulative, module) of modules imported by interpreter directly, in microseconds
+def importTimes(path):
+    result = subprocess.run([sys.executable, "-X", "importtime", interpreter, f"--source={path}", "--input=/dev/null"],
+                            capture_output=True, text=True)
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        selfTime, cumulative, name = line[len("import time:"):].split("|")
+        total += int(selfTime)
+        # Nested imports are indented
+        if not name.startswith("  "):
+            modules.append((int(cumulative), name.strip()))
+    return total, sorted(modules, reverse=True)
+
+# Measure end to end time of short program and imports done before it runs
+# Usage: bench_startup.py [runs] [budget ms], exits with 1 when XML program exceeds budget
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else defaultBudget
+    with tempfile.TemporaryDirectory() as directory:
+        xmlPath = os.path.join(directory, "short.xml")
+        sourcePath = os.path.join(directory, "short.src")
+        programs.writeProgram(xmlPath, programs.straightLine(10))
+        programs.writeSource(sourcePath, programs.straightLine(10))
+        # First run writes cached bytecode
+        run([interpreter, f"--source={xmlPath}", "--input=/dev/null"])
+
+        python = best(["-c", "pass"], runs)
+        print(f"python -c pass       {1000 * python:7.1f} ms")
+        xml = best([interpreter, f"--source={xmlPath}", "--input=/dev/null"], runs)
+        for name, elapsed in [("10 instructions XML", xml),
+                              ("10 instructions src", best([interpreter, f"--source={sourcePath}", "--input=/dev/null"], runs)),
+                              ("--help", best([interpreter, "--help"], runs))]:
+            print(f"{name:<20} {1000 * elapsed:7.1f} ms  {1000 * (elapsed - python):+7.1f} ms over python")
+
+        total, modules = importTimes(xmlPath)
+        print(f"\nimports {total / 1000:.1f} ms, largest:")
+        for cumulative, name in modules[:8]:
+            print(f"  {name:<24} {cumulative / 1000:6.1f} ms")
+
+        overhead = 1000 * (xml - python)
+        print(f"\nbudget {budget:.1f} ms over python: {'ok' if overhead <= budget else 'exceeded'}")
+        if overhead > budget:
+            exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+import tracer
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+# Compare deep recursion with call in tail position and without it
+# Usage: bench_tail_calls.py [depth]
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"depth: {depth}")
+    with tempfile.TemporaryDirectory() as directory:
+        # Peak memory of children only grows, so the smaller run goes first
+        for name, tail, options in (("tail", True, []), ("tail --jit", True, ["--jit"]),
+                                    ("non-tail", False, []), ("non-tail --jit", False, ["--jit"])):
+            path = os.path.join(directory, f"{name.split()[0]}.xml")
+            programs.writeProgram(path, programs.countdown(depth, tail))
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, interpreter, f"--source={path}", "--input=/dev/null"] + options,
+                                    capture_output=True, text=True)
+            elapsed = time.perf_counter() - start
+            peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+            print(f"{name:<16} {elapsed:8.3f} s  peak RSS so far {peak:8.1f} MiB  exit code {result.returncode}")
+
+        # Depth of calls replaced by tail calls is traced as well, it must fit into trace records
+        path = os.path.join(directory, "tail.xml")
+        trace = os.path.join(directory, "tail.bin")
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, interpreter, f"--source={path}", "--input=/dev/null",
+                                 f"--trace={trace}", "--trace-calls"], capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            raise RuntimeError(f"traced tail recursion exited with code {result.returncode}: {result.stderr}")
+        deepest = max(record.depth for record in tracer.readTrace(trace)[1])
+        if deepest != depth + 1:
+            raise RuntimeError(f"trace of tail recursion reached depth {deepest} instead of {depth + 1}")
+        print(f"{'tail --trace':<16} {elapsed:8.3f} s  deepest traced call {deepest}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+import tracer
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+# Trace recursion deeper than 65535 calls with and without calls in tail position and summarize the traces
+# Usage: bench_trace.py [depth]
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 70000
+    print(f"depth: {depth}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, tail in (("tail", True), ("non-tail", False)):
+            path = os.path.join(directory, f"{name}.xml")
+            trace = os.path.join(directory, f"{name}.bin")
+            programs.writeProgram(path, programs.countdown(depth, tail))
+            start = time.perf_counter()
+            # Ring keeps every CALL and RETURN, unwinding of recursion would push out the deepest calls
+            result = subprocess.run([sys.executable, interpreter, f"--source={path}", "--input=/dev/null",
+                                     f"--trace={trace}", "--trace-calls",
+                                     f"--trace-size={4 * depth}"], capture_output=True, text=True)
+            elapsed = time.perf_counter() - start
+            if result.returncode != 0:
+                raise RuntimeError(f"traced {name} recursion exited with code {result.returncode}: {result.stderr}")
+            _, records = tracer.readTrace(trace)
+            # Countdown is called once from main body and then depth times recursively
+            deepest = max(record.depth for record in records)
+            if deepest != depth + 1:
+                raise RuntimeError(f"trace of {name} recursion reached depth {deepest} instead of {depth + 1}")
+            with open(os.devnull, "w") as file:
+                tracer.summarize(trace, file=file)
+            print(f"{name:<10} {elapsed:8.3f} s  {len(records)} records, deepest call {deepest}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import fuzz
+import programs
+
+interpreter = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpret.py")
+
+# Seconds program may run, programs looping in both ways agree
+timeout = 10
+
+# Programs of benchmarks, they run to the end
+def benchmarkPrograms() -> list:
+    return [("straightLine", programs.straightLine(200)), ("countingLoop", programs.countingLoop(1000)),
+            ("constantExpressions", programs.constantExpressions(100)), ("countdown", programs.countdown(100)),
+            ("countdown without tail call", programs.countdown(100, False)),
+            ("concatDoubling", programs.concatDoubling(10)), ("inputLoop", programs.inputLoop()),
+            ("biasedLoop", programs.biasedLoop(1000))]
+
+# Traceback is reduced to exception name, BREAK of translated program does not print instruction count
+def reduceErrors(stderr) -> str:
+    if "Traceback" in stderr:
+        return "Traceback: " + stderr.strip().split("\n")[-1].split(":")[0]
+    return "".join(line for line in stderr.splitlines(True) if not line.startswith("Instruction count:"))
+
+# Return (exit code, stdout, stderr) of program
+def run(arguments, inputPath):
+    try:
+        result = subprocess.run([sys.executable] + arguments + [f"--input={inputPath}"], capture_output=True,
+                                text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return "timeout", "", ""
+    return result.returncode, result.stdout, reduceErrors(result.stderr)
+
+# Return exit code of interpreter and description of difference from translated program, None if they agree
+def check(path, inputPath, module):
+    expected = run([interpreter, f"--source={path}"], inputPath)
+    translation = subprocess.run([sys.executable, interpreter, f"--source={path}", f"--aot={module}"],
+                                 capture_output=True, text=True)
+    if translation.returncode != 0:
+        # Program which can not be loaded stops translation with the same error
+        if (translation.returncode, "", reduceErrors(translation.stderr)) == expected:
+            return expected[0], None
+        return expected[0], f"translation failed with code {translation.returncode}: {translation.stderr}"
+    actual = run([module], inputPath)
+    if actual != expected:
+        return expected[0], f"interpreter {expected!r}\n    translated  {actual!r}"
+    return expected[0], None
+
+# Run programs by interpreter and as translated modules, compare exit codes and outputs
+# Usage: conformance_aot.py [random programs] [seed] [program ...], exits with 1 when some program differs
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    with tempfile.TemporaryDirectory() as directory:
+        inputPath = os.path.join(directory, "input.txt")
+        with open(inputPath, "w") as file:
+            file.write(fuzz.inputText)
+
+        cases = []
+        for name, instructions in benchmarkPrograms():
+            path = os.path.join(directory, f"{len(cases)}.xml")
+            programs.writeProgram(path, instructions)
+            cases.append((name, path))
+        for number in range(seed, seed + count):
+            rng = random.Random(number)
+            path = os.path.join(directory, f"{len(cases)}.xml")
+            programs.writeProgram(path, fuzz.typedProgram(rng) if number % 2 else fuzz.randomProgram(rng))
+            cases.append((f"random program {number}", path))
+        cases += [(path, path) for path in sys.argv[3:]]
+
+        failed = 0
+        codes = {}
+        module = os.path.join(directory, "translated.py")
+        for name, path in cases:
+            code, difference = check(path, inputPath, module)
+            if difference is not None:
+                failed += 1
+                print(f"{name}: {difference}")
+            codes[code] = codes.get(code, 0) + 1
+        print(f"{len(cases) - failed} of {len(cases)} programs agree, exit codes: "
+              + ", ".join(f"{code}: {number}" for code, number in sorted(codes.items(), key=str)))
+        if failed != 0:
+            exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import programs
+import server
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+interpreter = os.path.join(root, "interpret.py")
+
+# Seconds program may run, programs which reference mode does not finish are not compared
+timeout = 5
+
+variables = ["GF@a", "GF@b", "GF@c", "TF@t", "LF@l"]
+# Label "missing" is never defined
+labels = ["L1", "L2", "L3", "f", "missing"]
+binaryOps = ["ADD", "SUB", "MUL", "IDIV", "LT", "GT", "EQ", "AND", "OR", "CONCAT", "STRI2INT", "GETCHAR", "SETCHAR"]
+
+inputText = "5\nabc\ntrue\n-3\n\nnil\n"
+
+def constant(rng):
+    choice = rng.random()
+    if choice < 0.4:
+        return "int", str(rng.randint(-3, 5))
+    if choice < 0.55:
+        return "bool", rng.choice(["true", "false"])
+    if choice < 0.75:
+        return "string", rng.choice(["", "ab", "x\\032y", "nil", "\\092"])
+    if choice < 0.85:
+        return "nil", "nil"
+    # Literals which are valid only for some instructions
+    return "int", rng.choice(["0", "1", "x", "+2", "49", "50"])
+
+def symbol(rng):
+    return ("var", rng.choice(variables)) if rng.random() < 0.5 else constant(rng)
+
+def variable(rng):
+    return "var", rng.choice(variables)
+
+# Any instruction with operands of random types, most programs end with error
+def randomInstruction(rng):
+    choice = rng.random()
+    if choice < 0.22:
+        return "MOVE", [variable(rng), symbol(rng)]
+    if choice < 0.45:
+        return rng.choice(binaryOps), [variable(rng), symbol(rng), symbol(rng)]
+    if choice < 0.53:
+        return rng.choice(["NOT", "INT2CHAR", "STRLEN", "TYPE"]), [variable(rng), symbol(rng)]
+    if choice < 0.62:
+        return "WRITE", [symbol(rng)]
+    if choice < 0.65:
+        return "DEFVAR", [variable(rng)]
+    if choice < 0.69:
+        return rng.choice(["CREATEFRAME", "PUSHFRAME", "POPFRAME", "RETURN"]), []
+    if choice < 0.74:
+        return "LABEL", [("label", rng.choice(labels[:-1]))]
+    if choice < 0.78:
+        return "JUMP", [("label", rng.choice(labels))]
+    if choice < 0.83:
+        return rng.choice(["JUMPIFEQ", "JUMPIFNEQ"]), [("label", rng.choice(labels)), symbol(rng), symbol(rng)]
+    if choice < 0.86:
+        return "CALL", [("label", rng.choice(labels))]
+    if choice < 0.91:
+        return rng.choice(["PUSHS", "POPS"]), [symbol(rng) if rng.random() < 0.5 else variable(rng)]
+    if choice < 0.92:
+        return "EXIT", [symbol(rng)]
+    if choice < 0.935:
+        return "DPRINT", [symbol(rng)]
+    if choice < 0.94:
+        return "BREAK", []
+    if choice < 0.96:
+        return "READ", [variable(rng), ("type", rng.choice(["int", "string", "bool", "nil"]))]
+    return "MOVE", [variable(rng), variable(rng)]
+
+# Break instruction in way which parser or executor has to report
+def malformed(rng, instruction):
+    opcode, arguments = instruction
+    choice = rng.random()
+    if choice < 0.2:
+        return opcode, arguments[:-1]
+    if choice < 0.4:
+        return opcode, arguments + [constant(rng)]
+    if choice < 0.5:
+        return "NOPE", arguments
+    if choice < 0.6:
+        return opcode.lower(), arguments
+    if choice < 0.7:
+        return opcode, [("var", "XF@a")] + arguments[1:]
+    if choice < 0.8:
+        return opcode, [("type", "int")] + arguments[1:]
+    if choice < 0.9:
+        return opcode, [("float", "0x1p0")] + arguments[1:]
+    return opcode, [("string", "a\\0b")] + arguments[1:]
+
+# Keep few duplicate labels, which stop program at its start
+def uniqueLabels(rng, body) -> list:
+    seen = set()
+    for index, (opcode, arguments) in enumerate(body):
+        if opcode == "LABEL" and len(arguments) != 0:
+            if arguments[0][1] in seen and rng.random() < 0.9:
+                body[index] = ("LABEL", [("label", f"U{index}")])
+            seen.add(body[index][1][0][1])
+    return body
+
+def randomProgram(rng) -> list:
+    body = [("DEFVAR", [("var", name)]) for name in ["GF@a", "GF@b", "GF@c"] if rng.random() < 0.8]
+    if rng.random() < 0.5:
+        body += [("CREATEFRAME", []), ("DEFVAR", [("var", "TF@t")])]
+    body += [randomInstruction(rng) for _ in range(rng.randint(3, 25))]
+    if rng.random() < 0.15:
+        index = rng.randrange(len(body))
+        body[index] = malformed(rng, body[index])
+    return uniqueLabels(rng, body)
+
+# Instruction keeping types of variables a, b (int), c (string) and d (bool), so programs run longer
+def typedInstruction(rng):
+    number = lambda: ("int", str(rng.randint(-2, 4)))
+    integer = lambda: ("var", rng.choice(["GF@a", "GF@b"]))
+    choice = rng.random()
+    if choice < 0.3:
+        return rng.choice(["ADD", "ADD", "SUB", "MUL", "IDIV"]), [integer(), rng.choice([integer(), number()]),
+                                                                 rng.choice([integer(), number()])]
+    if choice < 0.4:
+        return "MOVE", [integer(), rng.choice([integer(), ("int", str(rng.randint(0, 3)))])]
+    if choice < 0.5:
+        return "CONCAT", [("var", "GF@c"), rng.choice([("var", "GF@c"), ("string", "q")]), ("string", "r\\010")]
+    if choice < 0.6:
+        return rng.choice(["LT", "GT", "EQ"]), [("var", "GF@d"), rng.choice([integer(), number()]), integer()]
+    if choice < 0.72:
+        return "WRITE", [("var", rng.choice(["GF@a", "GF@b", "GF@c", "GF@d"]))]
+    if choice < 0.78:
+        return "JUMPIFNEQ", [("label", rng.choice(labels[:-1])), ("var", "GF@a"), ("int", str(rng.randint(0, 30)))]
+    if choice < 0.84:
+        return "LABEL", [("label", rng.choice(labels[:-1]))]
+    if choice < 0.89:
+        return "PUSHS", [rng.choice([integer(), ("int", "7")])]
+    if choice < 0.92:
+        return "POPS", [("var", "GF@b")]
+    if choice < 0.96:
+        return "CALL", [("label", "f")]
+    return "RETURN", []
+
+def typedProgram(rng) -> list:
+    body = [("DEFVAR", [("var", "GF@" + name)]) for name in "abcd"]
+    body += [("MOVE", [("var", "GF@a"), ("int", "1")]), ("MOVE", [("var", "GF@b"), ("int", "2")]),
+             ("MOVE", [("var", "GF@c"), ("string", "s")]), ("MOVE", [("var", "GF@d"), ("bool", "true")])]
+    body += [typedInstruction(rng) for _ in range(rng.randint(3, 30))]
+    return uniqueLabels(rng, body)
+
+# Programs of benchmarks, they run to the end and their timing is not dominated by start of interpreter
+def benchmarkPrograms() -> list:
+    return [("straightLine", list(programs.straightLine(200))), ("countingLoop", list(programs.countingLoop(20000))),
+            ("constantExpressions", list(programs.constantExpressions(2000))),
+            ("countdown", list(programs.countdown(2000))),
+            ("countdown without tail call", list(programs.countdown(2000, False))),
+            ("concatDoubling", list(programs.concatDoubling(12))), ("inputLoop", list(programs.inputLoop())),
+            ("biasedLoop", list(programs.biasedLoop(20000)))]
+
+# Variables named only in one of local and temporary frame, PUSHFRAME and POPFRAME keep their value, which
+# random programs hardly reach before error
+def framePrograms() -> list:
+    temporary = [("CREATEFRAME", []), ("DEFVAR", [("var", "TF@y")]), ("MOVE", [("var", "TF@y"), ("string", "hello")]),
+                 ("PUSHFRAME", []), ("POPFRAME", []), ("WRITE", [("var", "TF@y")])]
+    local = [("CREATEFRAME", []), ("PUSHFRAME", []), ("DEFVAR", [("var", "LF@x")]),
+             ("MOVE", [("var", "LF@x"), ("string", "kept")]), ("POPFRAME", []), ("PUSHFRAME", []),
+             ("WRITE", [("var", "LF@x")])]
+    return [("temporary frame pushed and popped", temporary), ("local frame popped and pushed", local)]
+
+# Return ((exit code, stdout, stderr), seconds) of process
+def execute(arguments, inputPath=None):
+    if inputPath is not None:
+        arguments = arguments + [f"--input={inputPath}"]
+    start = time.perf_counter()
+    try:
+        result = subprocess.run([sys.executable] + arguments, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return ("timeout", "", ""), time.perf_counter() - start
+    return (result.returncode, result.stdout, result.stderr), time.perf_counter() - start
+
+# Execution modes, each runs program at path with input and returns result and seconds of its execution.
+# Files of mode are created in work directory.
+def interpreterMode(*options):
+    return lambda path, inputPath, work: execute([interpreter, f"--source={path}", *options], inputPath)
+
+def profileMode(path, inputPath, work):
+    profile = os.path.join(work, "profile.ippf")
+    if os.path.exists(profile):
+        os.remove(profile)
+    execute([interpreter, f"--source={path}", f"--profile-save={profile}"], inputPath)
+    return execute([interpreter, f"--source={path}", f"--profile-use={profile}"], inputPath)
+
+def binaryMode(path, inputPath, work):
+    binary = os.path.join(work, "program.ippb")
+    result, seconds = execute([os.path.join(root, "binprog.py"), path, binary])
+    if result[0] != 0:
+        return result, seconds
+    return execute([interpreter, f"--source={binary}"], inputPath)
+
+def sharedMode(path, inputPath, work):
+    name = f"ipp-fuzz-{os.getpid()}"
+    start = time.perf_counter()
+    loader = subprocess.Popen([sys.executable, interpreter, f"--source={path}", f"--share={name}"],
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        # Loader prints name when program is shared, it ends at once when program can not be loaded
+        if loader.stdout.readline() == "":
+            stderr = loader.stderr.read()
+            loader.wait()
+            return (loader.returncode, "", stderr), time.perf_counter() - start
+        return execute([interpreter, f"--attach={name}"], inputPath)
+    finally:
+        loader.terminate()
+        loader.communicate()
+
+def aotMode(path, inputPath, work):
+    module = os.path.join(work, "translated.py")
+    result, seconds = execute([interpreter, f"--source={path}", f"--aot={module}"])
+    if result[0] != 0:
+        return result, seconds
+    return execute([module], inputPath)
+
+def lockstepMode(path, inputPath, work):
+    instance = os.path.join(work, "instance.txt")
+    listFile = os.path.join(work, "inputs.txt")
+    with open(inputPath, encoding="utf-8") as source, open(instance, "w", encoding="utf-8") as file:
+        file.write(source.read())
+    with open(listFile, "w", encoding="utf-8") as file:
+        file.write(instance + "\n")
+    for suffix in (".out", ".err"):
+        if os.path.exists(instance + suffix):
+            os.remove(instance + suffix)
+    result, seconds = execute([interpreter, f"--source={path}", f"--lockstep={listFile}"])
+    if result[0] != 0 or not os.path.exists(instance + ".out"):
+        return result, seconds
+    with open(instance + ".out", encoding="utf-8") as out, open(instance + ".err", encoding="utf-8") as err:
+        return (int(result[1].split()[0]), out.read(), err.read()), seconds
+
+def serveMode(path, inputPath, work):
+    request = asyncio.wait_for(server.runClient(os.path.join(work, "interpret.sock"), path, inputPath), timeout)
+    start = time.perf_counter()
+    try:
+        stdout, stderr, code = asyncio.run(request)
+    except asyncio.TimeoutError:
+        return ("timeout", "", ""), time.perf_counter() - start
+    return (code, stdout, stderr), time.perf_counter() - start
+
+# Mode "interpreter" is reference the others are compared with
+modes = {
+    "interpreter": interpreterMode(),
+    "optimize": interpreterMode("--optimize"),
+    "liveness": interpreterMode("--release-dead"),
+    "pipeline": interpreterMode("--pipeline"),
+    "parallel": interpreterMode("--parallel=2"),
+    "jit": interpreterMode("--jit"),
+    "jit-eager": interpreterMode("--jit-threshold=1"),
+    "limits": interpreterMode("--max-instructions=1000000000", "--max-stack-depth=1000000000"),
+    "profile": profileMode,
+    "binary": binaryMode,
+    "shared": sharedMode,
+    "aot": aotMode,
+    "lockstep": lockstepMode,
+    "serve": serveMode,
+}
+
+# Class of error output: exception of traceback or last error message, debug output is not compared
+def errorClass(stderr) -> str:
+    if "Traceback" in stderr:
+        return "Traceback: " + stderr.strip().split("\n")[-1].split(":")[0]
+    if "ERR:" in stderr:
+        return stderr[stderr.rindex("ERR:"):].strip()
+    return ""
+
+# Return names of parts of result which differ from reference
+def differences(reference, result, mode) -> tuple:
+    names = []
+    if result[0] != reference[0]:
+        names.append("exit code")
+    # Mode pipeline keeps output written before error found later in program
+    loadError = mode == "pipeline" and reference[1] == "" and len(names) == 0
+    if result[1] != reference[1] and not loadError:
+        names.append("stdout")
+    if errorClass(result[2]) != errorClass(reference[2]):
+        names.append("stderr")
+    return tuple(names)
+
+# Differences of mode from reference on program, None when reference does not finish in time
+def compare(instructions, mode, inputPath, work):
+    path = os.path.join(work, "shrink.xml")
+    programs.writeProgram(path, instructions)
+    reference, _ = modes["interpreter"](path, inputPath, work)
+    if reference[0] == "timeout":
+        return None
+    return differences(reference, modes[mode](path, inputPath, work)[0], mode)
+
+# Remove instructions and arguments while mode differs from reference in the same way
+def shrink(instructions, mode, expected, inputPath, work) -> list:
+    fails = lambda candidate: compare(candidate, mode, inputPath, work) == expected
+    chunk = len(instructions) // 2
+    while chunk >= 1:
+        index = 0
+        while index < len(instructions):
+            candidate = instructions[:index] + instructions[index + chunk:]
+            if len(candidate) != 0 and fails(candidate):
+                instructions = candidate
+            else:
+                index += chunk
+        chunk //= 2
+
+    # Replace operands by simpler constants
+    for index, (opcode, arguments) in enumerate(instructions):
+        for number, argument in enumerate(arguments):
+            for simpler in (("int", "0"), ("nil", "nil")):
+                if argument[0] in ("label", "type") or argument == simpler:
+                    continue
+                candidate = list(instructions)
+                candidate[index] = (opcode, arguments[:number] + [simpler] + arguments[number + 1:])
+                if fails(candidate):
+                    instructions = candidate
+                    arguments = candidate[index][1]
+                    break
+    return instructions
+
+def waitForSocket(path, process):
+    while not os.path.exists(path):
+        if process.poll() is not None:
+            raise RuntimeError("server exited")
+        time.sleep(0.01)
+
+# Run generated programs in every execution mode, compare exit codes, outputs and classes of error output with
+# interpreter and report time of each mode. Failing programs are shrunk and written to output directory with
+# timings of all runs (fuzz-timings.csv).
+# Usage: fuzz.py [programs] [seed] [output directory] [mode ...], exits with 1 when some mode differs
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    output = sys.argv[3] if len(sys.argv) > 3 else "fuzz-results"
+    selected = ["interpreter"] + [mode for mode in sys.argv[4:] if mode != "interpreter"]
+    if len(sys.argv) <= 4:
+        selected = list(modes)
+        try:
+            import numpy
+        except ImportError:
+            print("NumPy is not available, mode lockstep is skipped")
+            selected.remove("lockstep")
+    for mode in selected:
+        if mode not in modes:
+            sys.stderr.write(f"Unknown mode {mode}, modes: {', '.join(modes)}\n")
+            exit(1)
+    os.makedirs(output, exist_ok=True)
+    # Failing programs written to output directory read the same input
+    inputPath = os.path.abspath(os.path.join(output, "input.txt"))
+    with open(inputPath, "w", encoding="utf-8") as file:
+        file.write(inputText)
+    cases = benchmarkPrograms() + framePrograms()
+    for number in range(seed, seed + count):
+        rng = random.Random(number)
+        cases.append((f"random{number}", typedProgram(rng) if number % 2 else randomProgram(rng)))
+
+    times = {mode: [] for mode in selected}
+    failures = 0
+    with tempfile.TemporaryDirectory() as work:
+        daemon = None
+        if "serve" in selected:
+            socketPath = os.path.join(work, "interpret.sock")
+            daemon = subprocess.Popen([sys.executable, interpreter, f"--serve={socketPath}"])
+            waitForSocket(socketPath, daemon)
+        try:
+            with open(os.path.join(output, "fuzz-timings.csv"), "w", encoding="utf-8") as timingFile:
+                timingFile.write("program,mode,seconds,exit code\n")
+                for name, instructions in cases:
+                    path = os.path.join(work, "program.xml")
+                    programs.writeProgram(path, instructions)
+                    results = {}
+                    for mode in selected:
+                        result, seconds = modes[mode](path, inputPath, work)
+                        results[mode] = result
+                        times[mode].append(seconds)
+                        timingFile.write(f"{name},{mode},{seconds:.6f},{result[0]}\n")
+                    reference = results["interpreter"]
+                    if reference[0] == "timeout":
+                        continue
+                    for mode in selected[1:]:
+                        different = differences(reference, results[mode], mode)
+                        if len(different) == 0:
+                            continue
+                        failures += 1
+                        reproducer = shrink(instructions, mode, different, inputPath, work)
+                        failurePath = os.path.join(output, f"{name}-{mode}.xml")
+                        programs.writeProgram(failurePath, reproducer)
+                        print(f"{name}: {mode} differs in {', '.join(different)}, "
+                              f"{len(reproducer)} instructions in {failurePath}")
+        finally:
+            if daemon is not None:
+                daemon.terminate()
+                daemon.wait()
+
+    print(f"{len(cases)} programs, {failures} differences")
+    print(f"{'mode':12} {'total':>9} {'median speedup':>15} {'benchmarks speedup':>19}")
+    benchmarks = len(benchmarkPrograms())
+    for mode in selected:
+        speedups = [reference / seconds for reference, seconds in zip(times["interpreter"], times[mode])]
+        print(f"{mode:12} {sum(times[mode]):8.2f}s {statistics.median(speedups):14.2f}x "
+              f"{statistics.geometric_mean(speedups[:benchmarks]):18.2f}x")
+    if failures != 0:
+        exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import os
+import sys
+from xml.sax.saxutils import escape
+
+# Make interpreter modules importable from benchmark scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Write program given as iterable of (opcode, [(type, text), ...]) to XML file
+def writeProgram(path, instructions):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n<program language="IPPcode23">\n')
+        for order, (opcode, arguments) in enumerate(instructions, 1):
+            file.write(f'  <instruction order="{order}" opcode="{opcode}">')
+            for number, (type, text) in enumerate(arguments, 1):
+                file.write(f'<arg{number} type="{type}">{escape(text)}</arg{number}>')
+            file.write("</instruction>\n")
+        file.write("</program>\n")
+
+# Write same program as IPPcode23 source text
+def writeSource(path, instructions):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(".IPPcode23\n")
+        for opcode, arguments in instructions:
+            operands = [text if type in ("var", "label", "type") else f"{type}@{text}" for type, text in arguments]
+            file.write(" ".join([opcode] + operands) + "\n")
+
+# Straight line program mixing common instructions, count instructions in total
+def straightLine(count):
+    yield "DEFVAR", [("var", "GF@a")]
+    yield "DEFVAR", [("var", "GF@b")]
+    yield "DEFVAR", [("var", "GF@s")]
+    yield "MOVE", [("var", "GF@b"), ("int", "1")]
+    yield "MOVE", [("var", "GF@s"), ("string", "x")]
+    body = [
+        ("ADD", [("var", "GF@a"), ("var", "GF@b"), ("int", "3")]),
+        ("MUL", [("var", "GF@b"), ("var", "GF@a"), ("int", "1")]),
+        ("CONCAT", [("var", "GF@s"), ("string", "ab\\032c"), ("string", "d")]),
+        ("LT", [("var", "GF@a"), ("var", "GF@b"), ("int", "100")]),
+        ("MOVE", [("var", "GF@a"), ("int", "7")]),
+        ("WRITE", [("string", "")]),
+    ]
+    for index in range(count - 5):
+        yield body[index % len(body)]
+
+# Counting loop executed iterations times
+def countingLoop(iterations):
+    yield "DEFVAR", [("var", "GF@i")]
+    yield "DEFVAR", [("var", "GF@sum")]
+    yield "MOVE", [("var", "GF@i"), ("int", "0")]
+    yield "MOVE", [("var", "GF@sum"), ("int", "0")]
+    yield "LABEL", [("label", "loop")]
+    # Jump to label continues after instruction following the label
+    yield "WRITE", [("string", "")]
+    yield "ADD", [("var", "GF@i"), ("var", "GF@i"), ("int", "1")]
+    yield "ADD", [("var", "GF@sum"), ("var", "GF@sum"), ("var", "GF@i")]
+    yield "JUMPIFNEQ", [("label", "loop"), ("var", "GF@i"), ("int", str(iterations))]
+    yield "WRITE", [("var", "GF@sum")]
+
+# Loop with constant expressions and chains of copies, as produced by simple code generators
+def constantExpressions(iterations):
+    yield "DEFVAR", [("var", "GF@i")]
+    yield "DEFVAR", [("var", "GF@t1")]
+    yield "DEFVAR", [("var", "GF@t2")]
+    yield "DEFVAR", [("var", "GF@t3")]
+    yield "DEFVAR", [("var", "GF@s")]
+    yield "MOVE", [("var", "GF@i"), ("int", "0")]
+    yield "LABEL", [("label", "loop")]
+    yield "WRITE", [("string", "")]
+    yield "MOVE", [("var", "GF@t1"), ("int", "2")]
+    yield "ADD", [("var", "GF@t2"), ("var", "GF@t1"), ("int", "3")]
+    yield "MUL", [("var", "GF@t3"), ("var", "GF@t2"), ("var", "GF@t2")]
+    yield "MOVE", [("var", "GF@t1"), ("var", "GF@t3")]
+    yield "CONCAT", [("var", "GF@s"), ("string", "a"), ("string", "b")]
+    yield "EQ", [("var", "GF@t2"), ("var", "GF@s"), ("string", "ab")]
+    yield "ADD", [("var", "GF@i"), ("var", "GF@i"), ("int", "1")]
+    yield "JUMPIFNEQ", [("label", "loop"), ("var", "GF@i"), ("int", str(iterations))]
+    yield "WRITE", [("var", "GF@t1")]
+
+# Recursive countdown of given depth, recursive call is in tail position unless tail is False
+def countdown(depth, tail=True):
+    yield "DEFVAR", [("var", "GF@n")]
+    yield "MOVE", [("var", "GF@n"), ("int", str(depth))]
+    yield "CALL", [("label", "countdown")]
+    # Return continues after instruction following the call
+    yield "WRITE", [("string", "")]
+    yield "WRITE", [("var", "GF@n")]
+    yield "EXIT", [("int", "0")]
+    yield "LABEL", [("label", "countdown")]
+    yield "WRITE", [("string", "")]
+    yield "JUMPIFEQ", [("label", "done"), ("var", "GF@n"), ("int", "0")]
+    yield "SUB", [("var", "GF@n"), ("var", "GF@n"), ("int", "1")]
+    yield "CALL", [("label", "countdown")]
+    yield "WRITE", [("string", "")]
+    if not tail:
+        yield "WRITE", [("string", "")]
+    yield "RETURN", []
+    yield "LABEL", [("label", "done")]
+    yield "WRITE", [("string", "")]
+    yield "RETURN", []
+
+# String doubled by CONCAT in every iteration, pushed to data stack as well
+def concatDoubling(iterations):
+    yield "DEFVAR", [("var", "GF@s")]
+    yield "DEFVAR", [("var", "GF@i")]
+    yield "MOVE", [("var", "GF@s"), ("string", "ab")]
+    yield "MOVE", [("var", "GF@i"), ("int", "0")]
+    yield "LABEL", [("label", "loop")]
+    yield "WRITE", [("string", "")]
+    yield "CONCAT", [("var", "GF@s"), ("var", "GF@s"), ("var", "GF@s")]
+    yield "PUSHS", [("var", "GF@s")]
+    yield "ADD", [("var", "GF@i"), ("var", "GF@i"), ("int", "1")]
+    yield "JUMPIFNEQ", [("label", "loop"), ("var", "GF@i"), ("int", str(iterations))]
+    yield "WRITE", [("var", "GF@i")]
+
+# Strings built by doubling in loop, each phase builds its own and writes only its length
+def stringPhases(phases, doublings):
+    yield "DEFVAR", [("var", "GF@i")]
+    yield "DEFVAR", [("var", "GF@n")]
+    for phase in range(phases):
+        yield "DEFVAR", [("var", f"GF@s{phase}")]
+        yield "MOVE", [("var", f"GF@s{phase}"), ("string", "0123456789abcdef")]
+        yield "MOVE", [("var", "GF@i"), ("int", "0")]
+        yield "LABEL", [("label", f"build{phase}")]
+        yield "WRITE", [("string", "")]
+        yield "CONCAT", [("var", f"GF@s{phase}"), ("var", f"GF@s{phase}"), ("var", f"GF@s{phase}")]
+        yield "ADD", [("var", "GF@i"), ("var", "GF@i"), ("int", "1")]
+        yield "JUMPIFNEQ", [("label", f"build{phase}"), ("var", "GF@i"), ("int", str(doublings))]
+        yield "STRLEN", [("var", "GF@n"), ("var", f"GF@s{phase}")]
+        yield "WRITE", [("var", "GF@n")]
+    # Released variables keep their type
+    for phase in range(phases):
+        yield "TYPE", [("var", "GF@n"), ("var", f"GF@s{phase}")]
+        yield "WRITE", [("var", "GF@n")]
+
+# Growing string copied into new frame in every iteration, frames stay pushed so all copies are kept
+def pushedCopies(iterations):
+    yield "DEFVAR", [("var", "GF@s")]
+    yield "DEFVAR", [("var", "GF@i")]
+    yield "MOVE", [("var", "GF@s"), ("string", "")]
+    yield "MOVE", [("var", "GF@i"), ("int", "0")]
+    yield "LABEL", [("label", "loop")]
+    yield "WRITE", [("string", "")]
+    yield "CONCAT", [("var", "GF@s"), ("var", "GF@s"), ("string", "x")]
+    yield "CREATEFRAME", []
+    yield "DEFVAR", [("var", "TF@keep")]
+    yield "MOVE", [("var", "TF@keep"), ("var", "GF@s")]
+    yield "PUSHFRAME", []
+    yield "ADD", [("var", "GF@i"), ("var", "GF@i"), ("int", "1")]
+    yield "JUMPIFNEQ", [("label", "loop"), ("var", "GF@i"), ("int", str(iterations))]
+
+# Loop of count read from input, every third iteration takes other branch
+def inputLoop():
+    yield "DEFVAR", [("var", "GF@n")]
+    yield "DEFVAR", [("var", "GF@i")]
+    yield "DEFVAR", [("var", "GF@r")]
+    yield "DEFVAR", [("var", "GF@sum")]
+    yield "READ", [("var", "GF@n"), ("type", "int")]
+    yield "MOVE", [("var", "GF@i"), ("int", "0")]
+    yield "MOVE", [("var", "GF@sum"), ("int", "0")]
+    yield "LABEL", [("label", "loop")]
+    yield "WRITE", [("string", "")]
+    yield "ADD", [("var", "GF@i"), ("var", "GF@i"), ("int", "1")]
+    yield "IDIV", [("var", "GF@r"), ("var", "GF@i"), ("int", "3")]
+    yield "MUL", [("var", "GF@r"), ("var", "GF@r"), ("int", "3")]
+    yield "JUMPIFEQ", [("label", "third"), ("var", "GF@r"), ("var", "GF@i")]
+    yield "ADD", [("var", "GF@sum"), ("var", "GF@sum"), ("var", "GF@i")]
+    yield "JUMP", [("label", "next")]
+    yield "LABEL", [("label", "third")]
+    yield "WRITE", [("string", "")]
+    yield "SUB", [("var", "GF@sum"), ("var", "GF@sum"), ("var", "GF@n")]
+    yield "LABEL", [("label", "next")]
+    yield "WRITE", [("string", "")]
+    yield "LT", [("var", "GF@r"), ("var", "GF@i"), ("var", "GF@n")]
+    yield "JUMPIFEQ", [("label", "loop"), ("var", "GF@r"), ("bool", "true")]
+    yield "WRITE", [("var", "GF@sum")]
+
+# Loop whose rare branch is taken every fiftieth iteration, variables keep one type
+def biasedLoop(iterations):
+    yield "DEFVAR", [("var", "GF@i")]
+    yield "DEFVAR", [("var", "GF@r")]
+    yield "DEFVAR", [("var", "GF@sum")]
+    yield "DEFVAR", [("var", "GF@last")]
+    yield "DEFVAR", [("var", "GF@zero")]
+    yield "MOVE", [("var", "GF@i"), ("int", "0")]
+    yield "MOVE", [("var", "GF@sum"), ("int", "0")]
+    yield "MOVE", [("var", "GF@last"), ("int", "0")]
+    yield "LABEL", [("label", "loop")]
+    yield "WRITE", [("string", "")]
+    yield "ADD", [("var", "GF@i"), ("var", "GF@i"), ("int", "1")]
+    yield "IDIV", [("var", "GF@r"), ("var", "GF@i"), ("int", "50")]
+    yield "MUL", [("var", "GF@r"), ("var", "GF@r"), ("int", "50")]
+    yield "JUMPIFEQ", [("label", "rare"), ("var", "GF@r"), ("var", "GF@i")]
+    yield "ADD", [("var", "GF@sum"), ("var", "GF@sum"), ("var", "GF@i")]
+    yield "JUMP", [("label", "next")]
+    yield "LABEL", [("label", "rare")]
+    yield "WRITE", [("string", "")]
+    yield "MOVE", [("var", "GF@last"), ("var", "GF@i")]
+    yield "LABEL", [("label", "next")]
+    yield "WRITE", [("string", "")]
+    yield "EQ", [("var", "GF@zero"), ("var", "GF@sum"), ("var", "GF@last")]
+    yield "MOVE", [("var", "GF@r"), ("var", "GF@sum")]
+    yield "JUMPIFNEQ", [("label", "loop"), ("var", "GF@i"), ("int", str(iterations))]
+    yield "WRITE", [("var", "GF@sum")]
@@ -0,0 +1,296 @@
+import bisect
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+import error
+import parse
+
+# Binary representation of IPPcode23 program
+#
+# Header is followed by tables, all numbers are little endian:
+#   string offsets  - (stringCount + 1) x u32 offsets into string data
+#   string data     - UTF-8 encoded strings (opcodes, names, constant texts, types)
+#   opcodes         - opcodeCount x u32 string index, instruction refers to it by byte
+#   constants       - constantCount x (u32 type string, u32 kind, i64 value)
+#   orders          - instructionCount x u64 instruction order in document order
+#   instructions    - instructionCount x (u8 opcode, u8 argument count, u16 reserved, u32 first argument)
+#   arguments       - argumentCount x (u16 argument number, u8 tag, u32 reference)
+#   labels          - labelCount x u32 index of LABEL instruction in document order
+
+magic = parse.binaryMagic
+version = 1
+
+headerFormat = struct.Struct("<4sHHIIIIII8Q")
+instructionFormat = struct.Struct("<BBHI")
+argumentFormat = struct.Struct("<HBxI")
+constantFormat = struct.Struct("<IIq")
+
+# Flag set when orders are ascending in document order
+flagSorted = 1
+
+# Argument tags, variables in standard frames refer directly to name string
+tagGF = 0
+tagLF = 1
+tagTF = 2
+tagVariable = 3
+tagConstant = 4
+frameTags = {"GF": tagGF, "LF": tagLF, "TF": tagTF}
+tagFrames = {tagGF: "GF", tagLF: "LF", tagTF: "TF"}
+
+# Kinds of values in constant table
+kindString = 0
+kindInt = 1
+kindNone = 2
+kindVariable = 3
+
+class Encoder:
+    def __init__(self):
+        self.strings = {}
+        self.opcodes = {}
+        self.constants = {}
+        self.constantData = bytearray()
+        self.orders = array("Q")
+        self.instructions = bytearray()
+        self.arguments = bytearray()
+        self.argumentCount = 0
+        self.labels = array("I")
+
+    # Encode parsed program into bytes
+    def encode(self, program:parse.XMLElements) -> bytes:
+        for instruction in program.getInstructions().values():
+            self.addInstruction(instruction)
+        return self.build()
+
+    def addInstruction(self, instruction:parse.XMLInstruction):
+        opcode = instruction.getOpcode()
+        if opcode not in self.opcodes:
+            if len(self.opcodes) == 256:
+                sys.stderr.write("ERR: Too many distinct opcodes for binary program.")
+                exit(error.internalError)
+            self.opcodes[opcode] = len(self.opcodes)
+        if opcode == "LABEL":
+            self.labels.append(len(self.orders))
+
+        keys = list(instruction.getArgumentsKeys())
+        self.orders.append(instruction.getOrder())
+        self.instructions += instructionFormat.pack(self.opcodes[opcode], len(keys), 0, self.argumentCount)
+        for key in keys:
+            self.addArgument(instruction.getArgument(key))
+
+    def addArgument(self, argument:parse.XMLArgument):
+        data = argument.getData()
+        if argument.getXmlType() == "var":
+            frameName = data.getFrameName()
+            if frameName in frameTags:
+                tag, reference = frameTags[frameName], self.string(data.getName())
+            else:
+                tag, reference = tagVariable, self.constant(frameName, kindVariable, self.string(data.getName()))
+        else:
+            tag, reference = tagConstant, self.symbolConstant(data)
+        self.arguments += argumentFormat.pack(argument.getArgNumber(), tag, reference)
+        self.argumentCount += 1
+
+    # Store converted value of symbol into constant table
+    def symbolConstant(self, symbol:parse.Symbol) -> int:
+        value = symbol.getValue()
+        if value is None:
+            return self.constant(symbol.getType(), kindNone, 0)
+        if type(value) == int:
+            return self.constant(symbol.getType(), kindInt, value)
+        return self.constant(symbol.getType(), kindString, self.string(value))
+
+    def constant(self, typeName, kind, value) -> int:
+        key = (typeName, kind, value)
+        index = self.constants.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants[key] = index
+            self.constantData += constantFormat.pack(self.string(typeName), kind, value)
+        return index
+
+    def string(self, value:str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings[value] = index
+        return index
+
+    # Join header and all tables
+    def build(self) -> bytes:
+        opcodeData = array("I", (self.string(opcode) for opcode in self.opcodes)).tobytes()
+
+        stringData = bytearray()
+        stringOffsets = array("I", [0])
+        for value in self.strings:
+            stringData += value.encode("utf-8", "surrogatepass")
+            stringOffsets.append(len(stringData))
+
+        flags = flagSorted if all(a < b for a, b in zip(self.orders, self.orders[1:])) else 0
+        tables = [stringOffsets.tobytes(), bytes(stringData), opcodeData, bytes(self.constantData),
+                  self.orders.tobytes(), bytes(self.instructions), bytes(self.arguments), self.labels.tobytes()]
+
+        offsets = []
+        offset = headerFormat.size
+        for table in tables:
+            # Keep every table 8 bytes aligned so memoryview casts work
+            offset += -offset % 8
+            offsets.append(offset)
+            offset += len(table)
+
+        data = bytearray(headerFormat.pack(magic, version, flags, len(self.orders), len(self.strings),
+                                           len(self.opcodes), len(self.constants), self.argumentCount,
+                                           len(self.labels), *offsets))
+        for table, offset in zip(tables, offsets):
+            data += bytes(offset - len(data))
+            data += table
+        return bytes(data)
+
+class BinaryInstructions(Mapping):
+    def __init__(self, program):
+        self.program = program
+
+    def __getitem__(self, order):
+        return self.program.getInstruction(order)
+
+    def __iter__(self):
+        return iter(self.program.orders)
+
+    def __len__(self):
+        return len(self.program.orders)
+
+class BinaryElements(parse.XMLElements):
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.view = memoryview(buffer)
+        self.elements = {}
+        self.positions = None
+        self.readHeader()
+
+    def readHeader(self):
+        if len(self.view) < headerFormat.size:
+            self.invalidProgram()
+        (fileMagic, fileVersion, self.flags, instructionCount, self.stringCount, opcodeCount,
+         constantCount, argumentCount, labelCount, *offsets) = headerFormat.unpack_from(self.view)
+        if fileMagic != magic or fileVersion != version:
+            self.invalidProgram()
+        self.stringCache = [None] * self.stringCount
+
+        sizes = [4 * (self.stringCount + 1), None, 4 * opcodeCount, constantFormat.size * constantCount,
+                 8 * instructionCount, instructionFormat.size * instructionCount,
+                 argumentFormat.size * argumentCount, 4 * labelCount]
+        for offset, size in zip(offsets, sizes):
+            if offset > len(self.view) or (size is not None and offset + size > len(self.view)):
+                self.invalidProgram()
+
+        stringOffsets, stringData, opcodes, constants, orders, instructions, arguments, labels = offsets
+        self.stringOffsets = self.view[stringOffsets:stringOffsets + sizes[0]].cast("I")
+        self.stringData = stringData
+        self.orders = self.view[orders:orders + sizes[4]].cast("Q")
+        self.labels = self.view[labels:labels + sizes[7]].cast("I")
+        self.constantsOffset = constants
+        self.instructionsOffset = instructions
+        self.argumentsOffset = arguments
+        self.opcodeNames = [self.getString(index) for index in self.view[opcodes:opcodes + sizes[2]].cast("I")]
+
+    def invalidProgram(self):
+        sys.stderr.write("ERR: Invalid binary program.")
+        exit(error.wrongXMLFormat)
+
+    def getString(self, index) -> str:
+        value = self.stringCache[index]
+        if value is None:
+            start = self.stringData + self.stringOffsets[index]
+            end = self.stringData + self.stringOffsets[index + 1]
+            value = str(self.view[start:end], "utf-8", "surrogatepass")
+            self.stringCache[index] = value
+        return value
+
+    def getInstructions(self) -> Mapping:
+        return BinaryInstructions(self)
+
+    def getInstruction(self, order) -> parse.XMLInstruction:
+        instruction = self.elements.get(order)
+        if instruction is None:
+            instruction = self.decodeInstruction(self.findPosition(order))
+            self.elements[order] = instruction
+        return instruction
+
+    def getLabelInstructions(self) -> list:
+        labels = []
+        for position in self.labels:
+            order = self.orders[position]
+            labels.append((order, self.getInstruction(order)))
+        return labels
+
+    # Ascending orders are used directly from buffer, without list of their own
+    def getOrderList(self):
+        if self.flags & flagSorted:
+            return self.orders
+        return sorted(self.orders)
+
+    # Find position of instruction with given order in document order
+    def findPosition(self, order) -> int:
+        if self.flags & flagSorted:
+            position = bisect.bisect_left(self.orders, order)
+            if position < len(self.orders) and self.orders[position] == order:
+                return position
+            raise KeyError(order)
+        if self.positions is None:
+            self.positions = {value: position for position, value in enumerate(self.orders)}
+        return self.positions[order]
+
+    def decodeInstruction(self, position) -> parse.XMLInstruction:
+        opcode, argumentCount, _, first = instructionFormat.unpack_from(
+            self.view, self.instructionsOffset + position * instructionFormat.size)
+        instruction = parse.XMLInstruction({"opcode": self.opcodeNames[opcode], "order": self.orders[position]})
+        for index in range(first, first + argumentCount):
+            instruction.appendArgument(self.decodeArgument(index))
+        return instruction
+
+    def decodeArgument(self, index) -> parse.XMLArgument:
+        argNumber, tag, reference = argumentFormat.unpack_from(
+            self.view, self.argumentsOffset + index * argumentFormat.size)
+        if tag in tagFrames:
+            return parse.makeVariableArgument(argNumber, tagFrames[tag], self.getString(reference))
+
+        typeIndex, kind, value = constantFormat.unpack_from(
+            self.view, self.constantsOffset + reference * constantFormat.size)
+        typeName = self.getString(typeIndex)
+        if kind == kindVariable:
+            return parse.makeVariableArgument(argNumber, typeName, self.getString(value))
+        if kind == kindString:
+            value = self.getString(value)
+        elif kind == kindNone:
+            value = None
+        return parse.makeSymbolArgument(argNumber, typeName, value)
+
+# Load binary program from file (stdin if None), file is memory mapped
+def load(fileName) -> BinaryElements:
+    if fileName is None:
+        return BinaryElements(sys.stdin.buffer.read())
+    try:
+        with open(fileName, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (IOError, ValueError):
+        sys.stderr.write("ERR: File does not appear to exist.")
+        exit(error.wrongInputFile)
+    return BinaryElements(buffer)
+
+# Convert XML program to binary representation
+def convert(sourceFile, outputFile):
+    program = parse.Parser(sourceFile).run()
+    data = Encoder().encode(program)
+    try:
+        with open(outputFile, "wb") as file:
+            file.write(data)
+    except IOError:
+        sys.stderr.write("ERR: Cannot write output file.")
+        exit(error.wrongOutputFile)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.stderr.write("Usage: binprog.py source.xml output.ippb")
+        exit(error.wrongArguments)
+    convert(sys.argv[1], sys.argv[2])
@@ -0,0 +1,191 @@
+import struct
+import sys
+from array import array
+import error
+import parse
+
+# Coverage file layout (little endian):
+#   header   - magic, version, opcode count, instruction count, number of merged runs
+#   opcodes  - opcodeCount x (u8 length, UTF-8 name)
+#   orders   - instructionCount x u64 instruction order in execution order (sorted)
+#   ids      - instructionCount x u16 index into opcodes
+#   covered  - instructionCount x u8, nonzero if instruction was executed in any run
+
+magic = b"IPPC"
+version = 1
+
+headerFormat = struct.Struct("<4sHHIQ")
+
+class Coverage:
+    def __init__(self, fileName, interpret):
+        self.fileName = fileName
+        self.interpret = interpret
+        self.covered = bytearray()
+
+    # Return map for plain execution loop, indexed by position in interpret.orderList
+    def prepare(self, size) -> bytearray:
+        if len(self.covered) < size:
+            self.covered.extend(bytes(size - len(self.covered)))
+        return self.covered
+
+    # Mark instruction when it is executed together with other observers
+    def beforeInstruction(self, interpret, executor, instruction:parse.XMLInstruction):
+        index = interpret.orderIndex
+        if index >= len(self.covered):
+            self.prepare(len(interpret.orderList))
+        self.covered[index] = 1
+
+    # Write coverage map of all loaded instructions
+    def close(self):
+        orderList = self.interpret.orderList
+        program = self.interpret.program
+        opcodes = {}
+        ids = array("H")
+        for order in orderList:
+            opcode = program.getInstruction(order).getOpcode()
+            if opcode not in opcodes:
+                opcodes[opcode] = len(opcodes)
+            ids.append(opcodes[opcode])
+        self.prepare(len(orderList))
+
+        try:
+            with open(self.fileName, "wb") as file:
+                writeCoverage(file, list(opcodes), array("Q", orderList), ids, self.covered[:len(orderList)], 1)
+        except (IOError, OverflowError):
+            sys.stderr.write("ERR: Cannot write coverage file.")
+            exit(error.wrongOutputFile)
+
+class CoverageMap:
+    def __init__(self, opcodes, orders, ids, covered, runs):
+        self.opcodes = opcodes
+        self.orders = orders
+        self.ids = ids
+        self.covered = covered
+        self.runs = runs
+
+    def getOpcode(self, index) -> str:
+        return self.opcodes[self.ids[index]]
+
+    # Check if map was recorded for the same program
+    def isSameProgram(self, other) -> bool:
+        if self.orders != other.orders:
+            return False
+        if self.opcodes == other.opcodes:
+            return self.ids == other.ids
+        return all(self.getOpcode(index) == other.getOpcode(index) for index in range(len(self.ids)))
+
+    # Add coverage of other run of the same program
+    def merge(self, other):
+        size = len(self.covered)
+        mask = int.from_bytes(self.covered, "little") | int.from_bytes(other.covered, "little")
+        self.covered = bytearray(mask.to_bytes(size, "little"))
+        self.runs += other.runs
+
+    def coveredCount(self) -> int:
+        return len(self.covered) - self.covered.count(0)
+
+    def write(self, fileName):
+        with open(fileName, "wb") as file:
+            writeCoverage(file, self.opcodes, self.orders, self.ids, self.covered, self.runs)
+
+def writeCoverage(file, opcodes, orders:array, ids:array, covered, runs):
+    opcodeData = bytearray()
+    for opcode in opcodes:
+        name = opcode.encode("utf-8", "surrogatepass")[:255]
+        opcodeData += bytes([len(name)]) + name
+    file.write(headerFormat.pack(magic, version, len(opcodes), len(orders), runs))
+    file.write(opcodeData)
+    file.write(orders.tobytes())
+    file.write(ids.tobytes())
+    file.write(covered)
+
+# Read coverage file into CoverageMap
+def readCoverage(fileName) -> CoverageMap:
+    with open(fileName, "rb") as file:
+        data = file.read()
+    if len(data) < headerFormat.size:
+        raise ValueError(f"{fileName} is truncated")
+    fileMagic, fileVersion, opcodeCount, count, runs = headerFormat.unpack_from(data)
+    if fileMagic != magic or fileVersion != version:
+        raise ValueError(f"{fileName} is not a coverage file")
+
+    offset = headerFormat.size
+    opcodes = []
+    for _ in range(opcodeCount):
+        if offset >= len(data):
+            raise ValueError(f"{fileName} is truncated")
+        length = data[offset]
+        opcodes.append(data[offset + 1:offset + 1 + length].decode("utf-8", "surrogatepass"))
+        offset += 1 + length
+    if len(data) != offset + 11 * count:
+        raise ValueError(f"{fileName} is truncated")
+
+    orders = array("Q", data[offset:offset + 8 * count])
+    offset += 8 * count
+    ids = array("H", data[offset:offset + 2 * count])
+    if not validIds(data[offset:offset + 2 * count], opcodeCount):
+        raise ValueError(f"{fileName} refers to unknown opcode")
+    offset += 2 * count
+    return CoverageMap(opcodes, orders, ids, bytearray(data[offset:]), runs)
+
+# Check that all u16 opcode ids are lower than opcode count, usual case is checked without Python loop
+def validIds(data:bytes, opcodeCount) -> bool:
+    if opcodeCount > 256:
+        return len(data) == 0 or max(array("H", data)) < opcodeCount
+    return data[1::2].count(0) == len(data) // 2 and len(data[0::2].translate(None, bytes(range(opcodeCount)))) == 0
+
+# Merge coverage files of runs of one program into output file
+def mergeFiles(outputFile, fileNames):
+    result = readCoverage(fileNames[0])
+    for fileName in fileNames[1:]:
+        coverage = readCoverage(fileName)
+        if not result.isSameProgram(coverage):
+            raise ValueError(f"{fileName} was recorded for different program")
+        result.merge(coverage)
+    result.write(outputFile)
+
+# Print covered share of program and longest ranges of never executed instructions
+def summarize(fileName, top=10, file=sys.stdout):
+    coverage = readCoverage(fileName)
+    total = len(coverage.covered)
+    covered = coverage.coveredCount()
+    share = 100 * covered / total if total != 0 else 100
+    print(f"Runs: {coverage.runs}", file=file)
+    print(f"Covered instructions: {covered} of {total} ({share:.2f} %)", file=file)
+
+    executed = {}
+    for index in range(total):
+        counts = executed.setdefault(coverage.getOpcode(index), [0, 0])
+        counts[0 if coverage.covered[index] else 1] += 1
+    print("\nOpcodes (covered / never executed):", file=file)
+    for opcode, (hit, missed) in sorted(executed.items(), key=lambda item: -item[1][1]):
+        print(f"  {opcode:<12} {hit:>9} {missed:>9}", file=file)
+
+    ranges = []
+    start = None
+    for index in range(total + 1):
+        if index < total and not coverage.covered[index]:
+            if start is None:
+                start = index
+        elif start is not None:
+            ranges.append((start, index))
+            start = None
+    if len(ranges) != 0:
+        print(f"\nLongest never executed ranges (top {top}):", file=file)
+        for start, end in sorted(ranges, key=lambda bounds: bounds[0] - bounds[1])[:top]:
+            print(f"  order {coverage.orders[start]:>8} - {coverage.orders[end - 1]:<8} {end - start:>9} instructions "
+                  f"from {coverage.getOpcode(start)}", file=file)
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == "merge":
+        command = lambda: mergeFiles(sys.argv[2], sys.argv[3:])
+    elif len(sys.argv) in (3, 4) and sys.argv[1] == "report":
+        command = lambda: summarize(sys.argv[2], int(sys.argv[3]) if len(sys.argv) == 4 else 10)
+    else:
+        sys.stderr.write("Usage: covmap.py merge output.cov input.cov... | covmap.py report coverage.cov [top]")
+        exit(error.wrongArguments)
+    try:
+        command()
+    except (IOError, ValueError) as e:
+        sys.stderr.write(f"ERR: Cannot process coverage: {e}")
+        exit(error.wrongInputFile)
@@ -2,6 +2,9 @@ ok = 0
 wrongArguments = 10
 wrongInputFile = 11
 wrongOutputFile = 12 
+missingHeader = 21
+wrongOpcode = 22
+wrongSource = 23
 wrongXMLFormat = 31
 wrongXMLStructure = 32
 semantics = 52
@@ -11,4 +14,5 @@ notExistingFrame = 55
 missingValue = 56
 wrongOperandValue = 57
 invalidString = 58
+limitExceeded = 59
 internalError = 99
\ No newline at end of file
@@ -0,0 +1,1408 @@
+import parse
+import sys
+import error
+
+# Modules of optional features are imported only when they are used, short programs start faster then
+
+class Interpret:
+
+    def __init__(self):
+        self.sourceFile = None
+        self.inputFile = None
+        self.order = 0
+        self.orderList = list()
+        self.orderIndex = 0
+        self.orderIndexes = {}
+        self.tailCalls = {}
+        self.program = None
+        self.instructionCount = 0
+        self.jitThreshold = None
+        self.parseWorkers = None
+        self.pipeline = False
+        self.pipelined = False
+        self.optimize = False
+        self.observers = []
+        self.traceFile = None
+        self.traceEvery = 1
+        self.traceCalls = False
+        self.traceSize = None
+        self.coverageFile = None
+        self.coverage = None
+        self.memoryFile = None
+        self.memoryInterval = None
+        self.memoryReport = None
+        self.limits = None
+        self.maxInstructions = None
+        self.serveSocket = None
+        self.serveWorkers = None
+        self.lockstepFile = None
+        self.profileFile = None
+        self.profileUseFile = None
+        self.aotFile = None
+        self.shareName = None
+        self.attachName = None
+        self.releaseDead = False
+
+    def run(self):
+        self.processArguments()
+        if self.serveSocket is not None:
+            import server
+            server.Server(self, self.serveSocket, self.serveWorkers).run()
+            return
+        if self.lockstepFile is not None or self.aotFile is not None or self.shareName is not None or self.releaseDead:
+            # All instances run whole parsed program, translation, sharing and liveness analysis need it as well
+            self.pipeline = False
+        program = self.loadProgram()
+        if self.optimize:
+            program = self.optimizeProgram(program)
+        if self.shareName is not None:
+            import shared
+            shared.share(program, self.shareName)
+            return
+        if self.lockstepFile is not None:
+            import lockstep
+            lockstep.run(self, program, self.lockstepFile)
+            return
+        if self.aotFile is not None:
+            import aot
+            aot.run(self, program, self.aotFile)
+            return
+        self.createObservers()
+        try:
+            self.execute(program)
+        finally:
+            for observer in self.observers:
+                observer.close()
+        self.inputFile.close()
+
+    # Load program from binary, source or XML representation, data are parsed instead of source file if given
+    def loadProgram(self, data:bytes=None) -> parse.XMLElements:
+        if data is not None:
+            return self.loadData(data)
+        if self.attachName is not None:
+            import shared
+            return shared.attach(self.attachName)
+        sourceFormat = parse.sourceFormat(self.sourceFile)
+        if sourceFormat == "binary":
+            import binprog
+            return binprog.load(self.sourceFile)
+        if sourceFormat == "source":
+            import ippcode
+            return ippcode.SourceParser(self.sourceFile).run()
+        if self.pipeline:
+            import pipeline
+            program = pipeline.PipelinedElements(self.sourceFile)
+            program.start()
+            self.pipelined = True
+            return program
+        if self.parseWorkers is not None:
+            import parallel
+            return parallel.load(self.sourceFile, self.parseWorkers)
+        parser = parse.Parser(self.sourceFile)
+        return parser.run()
+
+    # Load program held in memory, such as one sent to server
+    def loadData(self, data:bytes) -> parse.XMLElements:
+        import io
+        sourceFormat = parse.dataFormat(data[:64])
+        if sourceFormat == "binary":
+            import binprog
+            return binprog.BinaryElements(data)
+        if sourceFormat == "source":
+            import ippcode
+            return ippcode.SourceParser(io.BytesIO(data)).run()
+        return parse.Parser(io.BytesIO(data)).run()
+
+    # Fold constants and propagate copies, report changes to stderr
+    def optimizeProgram(self, program:parse.XMLElements) -> parse.XMLElements:
+        import optimizer
+        programOptimizer = optimizer.Optimizer(program)
+        program = programOptimizer.run()
+        programOptimizer.report()
+        return program
+
+    # Process arguments from command line
+    def processArguments(self):
+        shortOpts = "hs:i:"
+        longOpts = ["help", "source=", "input=", "jit", "jit-threshold=",
+                    "trace=", "trace-every=", "trace-calls", "trace-size=", "parallel=", "pipeline", "optimize", "coverage=",
+                    "memory-report=", "memory-interval=",
+                    "max-memory=", "max-stack-depth=", "max-string-length=", "max-instructions=",
+                    "serve=", "serve-workers=", "lockstep=",
+                    "profile-save=", "profile-use=", "aot=", "share=", "attach=", "release-dead"]
+        args = self.parseOptions(sys.argv[1:], shortOpts, longOpts)
+        
+        for opt, arg in args:
+            if opt in ("-h", "--help"):
+                if len(sys.argv) != 2:
+                    sys.stderr.write(f"ERR: No arguments allowed while printing help.")
+                    exit(error.wrongArguments)
+                self.printHelp()
+                exit(error.ok)
+            elif opt in ("-s", "--source"):
+                self.sourceFile = arg
+            elif opt in ("-i", "--input"):
+                self.inputFile = arg
+            elif opt == "--jit":
+                if self.jitThreshold is None:
+                    import jit
+                    self.jitThreshold = jit.defaultThreshold
+            elif opt == "--jit-threshold":
+                self.jitThreshold = self.parsePositiveInt(opt, arg)
+            elif opt == "--optimize":
+                self.optimize = True
+            elif opt == "--pipeline":
+                self.pipeline = True
+            elif opt == "--parallel":
+                self.parseWorkers = self.parsePositiveInt(opt, arg)
+            elif opt == "--trace":
+                self.traceFile = arg
+            elif opt == "--trace-every":
+                self.traceEvery = self.parsePositiveInt(opt, arg)
+            elif opt == "--trace-calls":
+                self.traceCalls = True
+            elif opt == "--trace-size":
+                self.traceSize = self.parsePositiveInt(opt, arg)
+            elif opt == "--coverage":
+                self.coverageFile = arg
+            elif opt == "--memory-report":
+                self.memoryFile = arg
+            elif opt == "--memory-interval":
+                self.memoryInterval = self.parsePositiveInt(opt, arg)
+            elif opt == "--max-memory":
+                self.getLimits().maxMemory = self.parsePositiveInt(opt, arg)
+            elif opt == "--max-stack-depth":
+                self.getLimits().maxStackDepth = self.parsePositiveInt(opt, arg)
+            elif opt == "--max-string-length":
+                self.getLimits().maxStringLength = self.parsePositiveInt(opt, arg)
+            elif opt == "--max-instructions":
+                self.maxInstructions = self.parsePositiveInt(opt, arg)
+            elif opt == "--serve":
+                self.serveSocket = arg
+            elif opt == "--serve-workers":
+                self.serveWorkers = self.parsePositiveInt(opt, arg)
+            elif opt == "--lockstep":
+                self.lockstepFile = arg
+            elif opt == "--profile-save":
+                self.profileFile = arg
+            elif opt == "--profile-use":
+                self.profileUseFile = arg
+            elif opt == "--aot":
+                self.aotFile = arg
+            elif opt == "--share":
+                self.shareName = arg
+            elif opt == "--attach":
+                self.attachName = arg
+            elif opt == "--release-dead":
+                self.releaseDead = True
+        
+        # Pipelined program is executed while it is parsed, it can not be optimized before
+        if self.optimize and self.pipeline:
+            sys.stderr.write(f"ERR: Options --optimize and --pipeline can not be combined.")
+            exit(error.wrongArguments)
+
+        # Check if at least one file is given, served requests and attached workers bring their own program
+        if self.sourceFile is None and self.inputFile is None and self.serveSocket is None and self.attachName is None:
+            sys.stderr.write(f"ERR: At least one file must be given.")
+            exit(error.wrongInputFile)
+        
+        # Open input file
+        if self.inputFile is not None:
+            try:
+                self.inputFile = open(self.inputFile, "r")
+            except IOError:
+                sys.stderr.write("ERR: File does not appear to exist.")
+                exit(error.wrongInputFile)
+        else:
+            self.inputFile = sys.stdin
+
+
+    # Split arguments into (option, value) pairs like getopt.getopt, which costs more to import than short run takes
+    # Long options may be abbreviated to unique prefix, parsing stops at first argument which is not option
+    def parseOptions(self, argv, shortOpts, longOpts) -> list:
+        options = []
+        index = 0
+        while index < len(argv) and argv[index].startswith("-") and argv[index] != "-":
+            arg = argv[index]
+            index += 1
+            if arg == "--":
+                break
+
+            if arg.startswith("--"):
+                name, separator, value = arg[2:].partition("=")
+                matches = [opt for opt in longOpts if opt.rstrip("=") == name]
+                if len(matches) == 0:
+                    matches = [opt for opt in longOpts if opt.startswith(name)]
+                if len(matches) != 1:
+                    self.wrongOption(f"--{name}", "is not recognized" if len(matches) == 0 else "is ambiguous")
+                opt = matches[0]
+                if opt.endswith("="):
+                    if not separator:
+                        if index == len(argv):
+                            self.wrongOption(f"--{opt[:-1]}", "requires argument")
+                        value = argv[index]
+                        index += 1
+                elif separator:
+                    self.wrongOption(f"--{opt}", "must not have argument")
+                options.append((f"--{opt.rstrip('=')}", value))
+                continue
+
+            # Short options may be grouped, value is rest of argument or next argument
+            position = 1
+            while position < len(arg):
+                opt = arg[position]
+                position += 1
+                if opt == ":" or opt not in shortOpts:
+                    self.wrongOption(f"-{opt}", "is not recognized")
+                value = ""
+                if shortOpts[shortOpts.index(opt) + 1:].startswith(":"):
+                    if position < len(arg):
+                        value = arg[position:]
+                    elif index < len(argv):
+                        value = argv[index]
+                        index += 1
+                    else:
+                        self.wrongOption(f"-{opt}", "requires argument")
+                    position = len(arg)
+                options.append((f"-{opt}", value))
+        return options
+
+    def wrongOption(self, opt, problem):
+        sys.stderr.write(f"ERR: Option {opt} {problem}.")
+        exit(error.wrongArguments)
+
+    def printHelp(self):
+        print("IPP Interpret")
+        print("Interpretation of IPPcode23 or its XML representation.")
+        print("Author: Jakub Mašek (xmasek19)")
+        print("Usage: interpret.py [options]")
+        print("Options:")
+        print("  -h, --help\t\tPrint this help.")
+        print("  -s, --source=file\tRead XML, IPPcode23 or binary program from file.")
+        print("  -i, --input=file\tRead input from file.")
+        print("  --parallel=n\t\tParse large XML source in n processes.")
+        print("  --optimize\t\tFold constants and propagate copies before execution.")
+        print("  --release-dead\tRelease values of variables which are not read again (disables --jit).")
+        print("  --pipeline\t\tExecute XML program while it is parsed (disables --jit, not with --optimize).")
+        print("  --jit\t\t\tCompile hot basic blocks to Python code.")
+        print("  --jit-threshold=n\tCompile blocks after n executions (implies --jit).")
+        print("  --profile-save=file\tAdd execution profile of this run to file (disables --jit).")
+        print("  --profile-use=file\tCompile and specialize blocks hot in profile at once (implies --jit).")
+        print("  --trace=file\t\tWrite execution trace to file (disables --jit).")
+        print("  --trace-every=n\tTrace only every n-th instruction and all CALL/RETURN.")
+        print("  --trace-calls\t\tTrace only CALL and RETURN instructions.")
+        print("  --trace-size=n\tKeep last n trace records (default 65536).")
+        print("  --coverage=file\tWrite map of executed instructions to file (disables --jit).")
+        print("  --memory-report=file\tWrite memory used by frames and stacks to file (disables --jit).")
+        print("  --memory-interval=n\tSample memory every n instructions (default 10000).")
+        print("  --max-memory=n\t\tStop with code 59 when values and stacks use about n bytes.")
+        print("  --max-stack-depth=n\tStop with code 59 when data, call or frame stack is deeper than n.")
+        print("  --max-string-length=n\tStop with code 59 when string longer than n characters is created.")
+        print("  --max-instructions=n\tStop with code 59 after n instructions (disables --jit).")
+        print("  --serve=socket\t\tRun requested programs in persistent process listening on Unix socket.")
+        print("  --serve-workers=n\tRun at most n requests at once (default number of CPUs).")
+        print("  --lockstep=file\tRun program at once for every input listed in file, write outputs next to inputs.")
+        print("  --aot=file\t\tTranslate program to standalone Python module instead of running it.")
+        print("  --share=name\t\tKeep program in shared memory segment for --attach until interrupted.")
+        print("  --attach=name\t\tExecute program kept in shared memory by --share.")
+
+    def getLimits(self):
+        if self.limits is None:
+            import limits
+            self.limits = limits.Limits()
+        return self.limits
+
+    # Parse value of numeric option and exit if it is not positive integer
+    def parsePositiveInt(self, opt, arg) -> int:
+        try:
+            value = int(arg)
+        except ValueError:
+            value = 0
+        if value <= 0:
+            sys.stderr.write(f"ERR: Option {opt} expects positive integer.")
+            exit(error.wrongArguments)
+        return value
+
+    # Create observers notified before every executed instruction
+    def createObservers(self):
+        if self.traceFile is not None:
+            import tracer
+            traceSize = self.traceSize if self.traceSize is not None else tracer.defaultCapacity
+            self.observers.append(tracer.Tracer(self.traceFile, self.traceEvery, self.traceCalls, traceSize))
+        if self.coverageFile is not None:
+            import covmap
+            self.coverage = covmap.Coverage(self.coverageFile, self)
+            self.observers.append(self.coverage)
+        if self.maxInstructions is not None:
+            import limits
+            self.observers.append(limits.InstructionLimit(self.maxInstructions))
+        if self.profileFile is not None:
+            import pgo
+            self.observers.append(pgo.Profiler(self.profileFile, self))
+        if self.memoryFile is not None:
+            import memreport
+            interval = self.memoryInterval if self.memoryInterval is not None else memreport.defaultInterval
+            self.memoryReport = memreport.MemoryReport(self.memoryFile, interval)
+            self.observers.append(self.memoryReport)
+        if self.releaseDead:
+            import liveness
+            self.observers.append(liveness.Releaser())
+
+    # Jump to next instruction after given order
+    def jumpAfter(self, order):
+        index = self.orderIndexes.get(order)
+        if index is None:
+            # Orders are ascending, list of binary program is memoryview without index method
+            import bisect
+            index = bisect.bisect_left(self.orderList, order)
+            self.orderIndexes[order] = index
+        self.order = order
+        self.orderIndex = index + 1
+
+    # Check if CALL at given index is in tail position, return from it continues by RETURN
+    def isTailCall(self, index) -> bool:
+        tail = self.tailCalls.get(index)
+        if tail is None:
+            # Return continues after instruction following the call
+            if index + 2 >= len(self.orderList):
+                return False
+            instruction = self.program.getInstruction(self.orderList[index + 2])
+            tail = instruction.getOpcode() == "RETURN" and len(instruction.getArgumentsKeys()) == 0
+            self.tailCalls[index] = tail
+        return tail
+
+    def getOrder(self):
+        return self.order
+    
+    def getInstructionCount(self):
+        return self.instructionCount
+    
+    # Execute program
+    def execute(self, program:parse.XMLElements):
+        if self.pipelined:
+            self.executePipelined(program)
+            return
+
+        executor = Executor()
+        executor.limits = self.limits
+        self.program = program
+        instructions = program.getInstructions()
+        if len(instructions) == 0:
+            exit(error.ok)
+
+        self.orderList = program.getOrderList()
+        maxOrder = self.orderList[-1]
+
+        # Save all labels
+        for key, instruction in program.getLabelInstructions():
+            self.registerLabel(executor, key, instruction)
+
+        # Execute instructions, coverage or memory report alone are recorded without notifying observers
+        if self.coverage is not None and len(self.observers) == 1:
+            self.executeCovered(executor, program, maxOrder, self.coverage.prepare(len(self.orderList)))
+            return
+        if self.memoryReport is not None and len(self.observers) == 1:
+            self.executeSampled(executor, program, maxOrder, self.memoryReport)
+            return
+
+        if len(self.observers) != 0:
+            self.executeObserved(executor, program, maxOrder)
+            return
+
+        if self.jitThreshold is not None or self.profileUseFile is not None:
+            import jit
+            profile = None
+            if self.profileUseFile is not None:
+                import pgo
+                profile = pgo.load(self.profileUseFile, program, self.orderList)
+            threshold = self.jitThreshold if self.jitThreshold is not None else jit.defaultThreshold
+            jit.TieredExecutor(self, executor, program, threshold, profile).run(maxOrder)
+            return
+
+        self.executeFrom(executor, program, maxOrder)
+
+    # Execute instructions from current order index until program ends
+    def executeFrom(self, executor, program:parse.XMLElements, maxOrder):
+        while self.order != maxOrder:
+            self.order = self.orderList[self.orderIndex]
+            instruction = program.getInstruction(self.order)
+            opcode = instruction.getOpcode()
+
+            # Try to execute instruction
+            try:
+                getattr(executor, opcode)(instruction)
+            except AttributeError:
+                sys.stderr.write(f"ERR: Error while executing opcode {opcode}.")
+                exit(error.wrongXMLStructure)
+
+            self.orderIndex +=1
+            self.instructionCount += 1
+
+    # Execute instructions as soon as they are parsed
+    def executePipelined(self, program:parse.XMLElements):
+        executor = PipelinedExecutor(program)
+        executor.limits = self.limits
+        self.program = program
+        program.onLabel = lambda key, instruction: self.registerLabel(executor, key, instruction)
+        self.orderList = program.orderList
+        observers = self.observers
+        try:
+            while True:
+                # Program ends after its last instruction, it is known when whole program is parsed
+                if not program.ensureIndex(self.orderIndex) and (len(self.orderList) == 0 or self.order == self.orderList[-1]):
+                    break
+                self.order = self.orderList[self.orderIndex]
+                instruction = program.getInstruction(self.order)
+                opcode = instruction.getOpcode()
+                for observer in observers:
+                    observer.beforeInstruction(self, executor, instruction)
+
+                # Try to execute instruction
+                try:
+                    getattr(executor, opcode)(instruction)
+                except AttributeError:
+                    sys.stderr.write(f"ERR: Error while executing opcode {opcode}.")
+                    exit(error.wrongXMLStructure)
+
+                self.orderIndex +=1
+                self.instructionCount += 1
+        except (SystemExit, Exception):
+            # Errors found in rest of program take precedence as they would stop whole program
+            program.finish()
+            raise
+        program.finish()
+
+    # Save label of LABEL instruction
+    def registerLabel(self, executor, key, instruction:parse.XMLInstruction):
+        labelName = instruction.getArgument(1).getData().getValue()
+        self.ensureLabelIsUnique(labelName, executor.labels)
+        executor.labels[labelName] = key
+
+    # Execute instructions and notify observers before each of them
+    def executeObserved(self, executor, program:parse.XMLElements, maxOrder):
+        observers = self.observers
+        while self.order != maxOrder:
+            self.order = self.orderList[self.orderIndex]
+            instruction = program.getInstruction(self.order)
+            opcode = instruction.getOpcode()
+            for observer in observers:
+                observer.beforeInstruction(self, executor, instruction)
+
+            # Try to execute instruction
+            try:
+                getattr(executor, opcode)(instruction)
+            except AttributeError:
+                sys.stderr.write(f"ERR: Error while executing opcode {opcode}.")
+                exit(error.wrongXMLStructure)
+
+            self.orderIndex +=1
+            self.instructionCount += 1
+
+    # Execute instructions and mark index of each of them in coverage map
+    def executeCovered(self, executor, program:parse.XMLElements, maxOrder, covered:bytearray):
+        while self.order != maxOrder:
+            self.order = self.orderList[self.orderIndex]
+            covered[self.orderIndex] = 1
+            instruction = program.getInstruction(self.order)
+            opcode = instruction.getOpcode()
+
+            # Try to execute instruction
+            try:
+                getattr(executor, opcode)(instruction)
+            except AttributeError:
+                sys.stderr.write(f"ERR: Error while executing opcode {opcode}.")
+                exit(error.wrongXMLStructure)
+
+            self.orderIndex +=1
+            self.instructionCount += 1
+
+    # Execute instructions and take memory sample every interval instructions
+    def executeSampled(self, executor, program:parse.XMLElements, maxOrder, report):
+        interval = report.interval
+        nextSample = self.instructionCount
+        while self.order != maxOrder:
+            if self.instructionCount == nextSample:
+                report.sample(self, executor)
+                nextSample += interval
+            self.order = self.orderList[self.orderIndex]
+            instruction = program.getInstruction(self.order)
+            opcode = instruction.getOpcode()
+
+            # Try to execute instruction
+            try:
+                getattr(executor, opcode)(instruction)
+            except AttributeError:
+                sys.stderr.write(f"ERR: Error while executing opcode {opcode}.")
+                exit(error.wrongXMLStructure)
+
+            self.orderIndex +=1
+            self.instructionCount += 1
+
+    # Check if label is unique in labels dictionary
+    def ensureLabelIsUnique(self, labelName:str, labels:dict):
+        if labels.get(labelName) is not None:
+            sys.stderr.write(f"ERR: Label {labelName} already exists.")
+            exit(error.semantics)
+
+class Frame:
+    GF = 1
+    LF = 2
+    TF = 3
+
+    def __init__(self, frameType):
+        self.frameType = frameType
+        self.variables = {}
+
+    # Add variable to frame
+    def addVariable(self, variable:parse.Variable):
+        # Check if variable already exists
+        if self.variables.get(variable.getName()) is not None:
+            sys.stderr.write(f"ERR: Variable {variable.getName()} already exists.")
+            exit(error.semantics)
+
+        self.variables[variable.getName()] = variable
+
+    # Get variable from frame
+    def getVariable(self, variableName:str) -> parse.Variable:
+        # Check if variable exists
+        if self.variables.get(variableName) is None:
+            sys.stderr.write(f"ERR: Variable {variableName} does not exist.")
+            exit(error.notExistingVariable)
+    
+        return self.variables[variableName]
+
+class Stack:
+    def __init__(self):
+        self.stack = []    
+
+    def push(self, item):
+        self.stack.append(item)
+
+    def pop(self) -> parse.Symbol|parse.Variable:
+        return self.stack.pop()
+
+    def top(self):
+        return self.stack[-1]
+
+    def isEmpty(self):
+        return len(self.stack) == 0
+    
+class Executor:
+    symbolList = {"int", "bool", "string", "nil", "float", "var"}
+    labels = {}
+    callStack = Stack()
+    dataStack = Stack()
+
+    def __init__(self):
+        self.stack = Stack()
+        self.localFrameStack = Stack()
+        self.globalFrame = Frame(Frame.GF)
+        self.tempFrame = None
+        # Frames of callers replaced by tail calls as [call stack size, count] runs
+        self.tailFrames = []
+        self.tailFrameCount = 0
+        # Limits of memory checked on instructions which grow it, None if there are no limits
+        self.limits = None
+
+    # MOVE instruction
+    def MOVE(self, instruction:parse.XMLInstruction):
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        self.checkArgCount(instruction, 2)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        
+        variableElement = arg1.getData()
+        frame = self.getFrame(variableElement.getFrameName())
+        variable = frame.getVariable(variableElement.getName())
+        
+        valToAssign = self.getSymbolValue(arg2)
+        typeToAssign = self.getSymbolType(arg2)
+
+        variable.setValue(self.convertToType(valToAssign, typeToAssign))
+        variable.setType(typeToAssign)
+        if self.limits is not None:
+            self.limits.store(self, instruction, variable)
+
+    # CREATEFRAME instruction
+    def CREATEFRAME(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 0)
+        if self.limits is not None:
+            self.limits.dropFrame(self.tempFrame)
+        self.tempFrame = Frame(Frame.TF)
+
+    # PUSHFRAME instruction
+    def PUSHFRAME(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 0)
+        self.ensureFrameExists(self.tempFrame)
+        self.localFrameStack.push(self.tempFrame)
+        self.tempFrame = None
+        if self.limits is not None:
+            self.limits.pushFrame(self, instruction)
+
+    # POPFRAME instruction
+    def POPFRAME(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 0)
+        if self.localFrameStack.isEmpty():
+            sys.stderr.write(f"ERR: Local frame stack is empty.")
+            exit(error.notExistingFrame)
+
+        if self.limits is not None:
+            self.limits.dropFrame(self.tempFrame)
+        self.tempFrame = self.localFrameStack.pop()
+
+    # DEFVAR instruction
+    def DEFVAR(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 1)
+        arg = instruction.getArgument(1)
+        self.myAssert(arg.getXmlType() == "var", instruction, error.wrongType)
+
+        varElement = instruction.getArgument(1).getData()
+        frame = self.getFrame(varElement.getFrameName())
+        var = parse.Variable(varElement.getName(), None)
+        frame.addVariable(var)
+        if self.limits is not None:
+            self.limits.defineVariable(self, instruction)
+
+    # CALL instruction
+    def CALL(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 1)
+        arg = instruction.getArgument(1)
+        self.myAssert(arg.getXmlType() == "label", instruction, error.wrongType)
+
+        if interpret.isTailCall(interpret.orderIndex):
+            self.enterTailCall()
+        else:
+            self.callStack.push(interpret.getOrder())
+            if self.limits is not None:
+                self.limits.call(self, instruction)
+        self.JUMP(instruction)
+
+    # RETURN instruction
+    def RETURN(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 0)
+        if self.callStack.isEmpty():
+            sys.stderr.write(f"ERR: Call stack is empty.")
+            exit(error.missingValue)
+
+        interpret.jumpAfter(self.callStack.pop())
+        if self.tailFrames:
+            self.leaveTailCalls()
+        if self.limits is not None:
+            self.limits.leave()
+
+    # PUSHS instruction
+    def PUSHS(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 1)
+        arg = instruction.getArgument(1)
+
+        self.myAssert(self.getSymbolType(arg) in ["int", "string", "bool", "nil"], instruction, error.wrongType)
+        
+        if arg.getXmlType() == "var":
+            frame = self.getFrame(arg.getData().getFrameName())
+            var = frame.getVariable(arg.getData().getName())
+            # Copy keeps pushed value when variable changes later
+            copy = parse.Variable(var.getName(), var.getType())
+            copy.setValue(var.getValue())
+            self.dataStack.push(copy)
+        else:
+            self.dataStack.push(arg.getData())
+        if self.limits is not None:
+            self.limits.push(self, instruction, self.dataStack.top().getValue())
+
+    # POPS instruction
+    def POPS(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 1)
+        arg = instruction.getArgument(1)
+
+        self.myAssert(arg.getXmlType() == "var", instruction, error.wrongType)
+
+        if self.dataStack.isEmpty():
+            sys.stderr.write(f"ERR: Data stack is empty.")
+            exit(error.missingValue)
+
+        frame = self.getFrame(arg.getData().getFrameName())
+        var = frame.getVariable(arg.getData().getName())
+        data = self.dataStack.pop()
+        if self.limits is not None:
+            self.limits.pop(data.getValue())
+
+        var.setValue(data.getValue())
+        var.setType(data.getType())
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # ADD instruction
+    def ADD(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "int", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) == "int", instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(val1 + val2)
+        var.setType("int")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # SUB instruction
+    def SUB(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "int", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) == "int", instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(val1 - val2)
+        var.setType("int")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # MUL instruction
+    def MUL(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "int", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) == "int", instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(val1 * val2)
+        var.setType("int")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # IDIV instruction
+    def IDIV(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "int", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) == "int", instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+
+        if val2 == 0:
+            sys.stderr.write(f"ERR: Division by zero.")
+            exit(error.wrongOperandValue)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(val1 // val2)
+        var.setType("int")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # LT instruction
+    def LT(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == self.getSymbolType(arg3), instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) in ["int", "string", "bool"], instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) in ["int", "string", "bool"], instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(self.boolToInt(val1 < val2))
+        var.setType("bool")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # GT instruction
+    def GT(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == self.getSymbolType(arg3), instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) in ["int", "string", "bool"], instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) in ["int", "string", "bool"], instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+
+        var.setValue(self.boolToInt(val1 > val2))
+        var.setType("bool")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # EQ instruction
+    def EQ(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) in ["int", "string", "bool", "nil"], instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) in ["int", "string", "bool", "nil"], instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == self.getSymbolType(arg3) or self.getSymbolType(arg2) == "nil" or self.getSymbolType(arg3) == "nil" , instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(self.boolToInt(val1 == val2))
+        var.setType("bool")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # AND instruction
+    def AND(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "bool", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) == "bool", instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(self.boolToInt(val1 and val2))
+        var.setType("bool")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # OR instruction
+    def OR(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "bool", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) == "bool", instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(self.boolToInt(val1 or val2))
+        var.setType("bool")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # NOT instruction
+    def NOT(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 2)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "bool", instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(self.boolToInt(not val1))
+        var.setType("bool")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # INT2CHAR instruction
+    def INT2CHAR(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 2)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "int", instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+
+        try:
+            var.setValue(chr(val1))
+        except ValueError:
+            sys.stderr.write(f"ERR: Invalid value in {instruction.getOpcode()} instruction.")
+            exit(error.invalidString)
+        
+        var.setType("string")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # STRI2INT instruction
+    def STRI2INT(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "string", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) == "int", instruction, error.wrongType)
+
+        string = self.getSymbolValue(arg2)
+        index = self.getSymbolValue(arg3)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+
+        self.myAssert(index >= 0 and index < len(string), instruction, error.invalidString)
+
+        var.setValue(ord(string[index]))
+        var.setType("int")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+
+    # READ instruction
+    def READ(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 2)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(arg2.getXmlType() == "type", instruction, error.wrongType)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+
+        try:
+            val = interpret.inputFile.readline().strip()
+            if arg2.getData().getValue() == "bool":
+                val = val.lower()
+            val = self.convertToType(val, arg2.getData().getValue())
+        except:
+            var.setValue("nil")
+            var.setType("nil")
+        else:
+            var.setValue(val)
+            var.setType(arg2.getData().getValue())
+        if self.limits is not None:
+            self.limits.assign(self, instruction, var)
+
+    # WRITE instruction
+    def WRITE(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 1)
+        arg1 = instruction.getArgument(1)
+        string = self.getSymbolValue(arg1)
+        string = self.convertToWriteType(string, self.getSymbolType(arg1))
+        print(string, end="", flush=True)
+    
+    # CONCAT instruction
+    def CONCAT(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "string", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) == "string", instruction, error.wrongType)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(val1 + val2)
+        var.setType("string")
+        if self.limits is not None:
+            self.limits.assign(self, instruction, var)
+
+    # STRLEN instruction
+    def STRLEN(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 2)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "string", instruction, error.wrongType)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        var.setValue(len(self.getSymbolValue(arg2)))
+        var.setType("int")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # GETCHAR instruction
+    def GETCHAR(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "string", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) == "int", instruction, error.wrongType)
+
+        string = self.getSymbolValue(arg2)
+        index = self.getSymbolValue(arg3)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+
+        # Is index in range of string
+        self.myAssert(index >= 0 and index < len(string), instruction, error.invalidString)
+
+        var.setValue(string[index])
+        var.setType("string")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # SETCHAR instruction
+    def SETCHAR(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(self.getSymbolType(arg1) == "string", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == "int", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) == "string", instruction, error.wrongType)
+        
+        stringTo = self.getSymbolValue(arg1)
+        index = self.getSymbolValue(arg2)
+        stringFrom = self.getSymbolValue(arg3)
+
+        self.myAssert(len(stringTo) > index and len(stringFrom) != 0 and index >= 0, instruction, error.invalidString)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+        
+        stringTo = stringTo[:index] + stringFrom[0] + stringTo[index + 1:]
+        
+        var.setValue(stringTo)
+        var.setType("string")
+        if self.limits is not None:
+            self.limits.assign(self, instruction, var)
+
+    # TYPE instruction
+    def TYPE(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 2)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+
+        self.myAssert(arg1.getXmlType() == "var", instruction, error.wrongType)
+
+        frame = self.getFrame(arg1.getData().getFrameName())
+        var = frame.getVariable(arg1.getData().getName())
+
+        if arg2.getXmlType() == "var":
+            frame = self.getFrame(arg2.getData().getFrameName())
+            type = frame.getVariable(arg2.getData().getName()).getType()
+        else: 
+            type = arg2.getXmlType()
+    
+        if type is None:
+            var.setValue("")
+        else:
+            var.setValue(type)
+        var.setType("string")
+        if self.limits is not None:
+            self.limits.store(self, instruction, var)
+
+    # LABEL instruction
+    def LABEL(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 1)
+
+    # JUMP instruction
+    def JUMP(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 1)
+        arg = instruction.getArgument(1)
+        self.myAssert(arg.getXmlType() == "label", instruction, error.wrongType)
+        labelName = arg.getData().getValue()
+        self.checkLabelExistance(labelName)
+        
+        labelOrder = self.labels[labelName]
+        interpret.jumpAfter(labelOrder)
+
+    # JUMPIFEQ instruction
+    def JUMPIFEQ(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "label", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) in ["int", "string", "bool", "nil"], instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) in ["int", "string", "bool", "nil"], instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == self.getSymbolType(arg3) or self.getSymbolType(arg2) == "nil" or self.getSymbolType(arg3) == "nil" , instruction, error.wrongType)
+
+        labelName = arg1.getData().getValue()
+        self.checkLabelExistance(labelName)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+  
+        if val1 == val2:            
+            labelOrder = self.labels[labelName]
+            interpret.jumpAfter(labelOrder)
+        
+
+    # JUMPIFNEQ instruction
+    def JUMPIFNEQ(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 3)
+        arg1 = instruction.getArgument(1)
+        arg2 = instruction.getArgument(2)
+        arg3 = instruction.getArgument(3)
+
+        self.myAssert(arg1.getXmlType() == "label", instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) in ["int", "string", "bool", "nil"], instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg3) in ["int", "string", "bool", "nil"], instruction, error.wrongType)
+        self.myAssert(self.getSymbolType(arg2) == self.getSymbolType(arg3) or self.getSymbolType(arg2) == "nil" or self.getSymbolType(arg3) == "nil" , instruction, error.wrongType)
+
+        labelName = arg1.getData().getValue()
+        self.checkLabelExistance(labelName)
+
+        val1 = self.getSymbolValue(arg2)
+        val2 = self.getSymbolValue(arg3)
+  
+        if val1 != val2:            
+            labelOrder = self.labels[labelName]
+            interpret.jumpAfter(labelOrder)
+
+    # EXIT instruction
+    def EXIT(self, instruction:parse.XMLInstruction):
+        self.checkArgCount(instruction, 1)
+        arg1 = instruction.getArgument(1)
+
+        self.myAssert(self.getSymbolType(arg1) == "int", instruction, error.wrongType)
+        
+        exitCode = self.getSymbolValue(arg1)
+
+        self.myAssert(exitCode >= 0 and exitCode <= 49, instruction, error.wrongOperandValue)
+
+        exit(exitCode)
+
+    # DPRINT instruction
+    def DPRINT(self, instruction:parse.XMLInstruction):
+        arg = instruction.getArgument(1)
+        sys.stderr.write(self.getSymbolValue(arg))
+
+    # BREAK instruction
+    def BREAK(self, instruction:parse.XMLInstruction):
+        print("Current instruction order: ", interpret.getOrder(), file=sys.stderr)
+        print("Instruction count: ", interpret.getInstructionCount(), file=sys.stderr)
+        print("Call depth: ", self.getCallDepth(), file=sys.stderr)
+
+        # Global frame
+        print("Global frame: ", file=sys.stderr)
+        for key in self.getFrame("GF").variables.keys():
+            print(f"    {key} = {self.getFrame('GF').variables[key].getValue()}", file=sys.stderr)
+
+        # Temporary frame
+        if self.tempFrame is not None:
+            print("Temporary frame: ", file=sys.stderr)
+            for key in self.getFrame("TF").variables.keys():
+                print(f"    {key} = {self.getFrame('TF').variables[key].getValue()}", file=sys.stderr)
+        else:
+            print("Temporary frame: None", file=sys.stderr)
+
+        # Local frame
+        if self.localFrameStack.isEmpty() == 0:
+            print("Local frame: ", file=sys.stderr)
+            for key in self.getFrame("LF").variables.keys():
+                print(f"    {key} = {self.getFrame('LF').variables[key].getValue()}", file=sys.stderr)
+        else:
+            print("Local frame: None", file=sys.stderr)
+        
+        # Data stack
+        print("Data stack: ", file=sys.stderr) 
+        while self.dataStack.isEmpty() == 0:
+            data:parse.XMLArgument = self.dataStack.pop()
+            print(f"    {data.getData().getValue()}", file=sys.stderr)
+            
+    ## EXECUTOR HELPERS ##
+
+    # Caller of tail call would only return, so it is counted instead of pushed to call stack
+    def enterTailCall(self):
+        size = len(self.callStack.stack)
+        if len(self.tailFrames) != 0 and self.tailFrames[-1][0] == size:
+            self.tailFrames[-1][1] += 1
+        else:
+            self.tailFrames.append([size, 1])
+        self.tailFrameCount += 1
+
+    # Forget tail calls made inside function which returned
+    def leaveTailCalls(self):
+        size = len(self.callStack.stack)
+        while len(self.tailFrames) != 0 and self.tailFrames[-1][0] > size:
+            self.tailFrameCount -= self.tailFrames.pop()[1]
+
+    # Return depth of calls including callers replaced by tail calls
+    def getCallDepth(self) -> int:
+        return len(self.callStack.stack) + self.tailFrameCount
+
+    # Return frame by name
+    def getFrame(self, frameName:str) -> Frame:
+        if frameName == "GF":
+            self.ensureFrameExists(self.globalFrame)
+            return self.globalFrame
+        elif frameName == "LF":
+            if self.localFrameStack.isEmpty() == 1:
+                sys.stderr.write(f"ERR: Local frame is not defined.")
+                exit(error.notExistingFrame)
+            localFrame = self.localFrameStack.top()
+            return localFrame
+        elif frameName == "TF":
+            self.ensureFrameExists(self.tempFrame)
+            return self.tempFrame
+        else:
+            sys.stderr.write(f"ERR: Invalid frame name {frameName}.")
+            exit(error.notExistingFrame)
+
+    # Check if instruction has correct count of arguments
+    def checkArgCount(self, instruction:parse.XMLInstruction, count):
+        if not len(instruction.getArgumentsKeys()) == count:
+            sys.stderr.write(f"ERR: Invalid count of arguments in {instruction.getOpcode()} instruction.")
+            exit(error.wrongXMLStructure)
+
+    # Check if frame exists
+    def ensureFrameExists(self, frame):
+        if frame == None:
+            sys.stderr.write(f"ERR: Frame is not defined.")
+            exit(error.notExistingFrame)
+
+    # Get value of symbol (int, string, bool, nil)
+    def getSymbolValue(self, argument:parse.XMLArgument) -> str:
+        if argument.getXmlType() == "var":
+            frame = self.getFrame(argument.getData().getFrameName())
+            var = frame.getVariable(argument.getData().getName())
+            value = var.getValue()
+            self.convertToType(value, var.getType())
+            return value
+        else:
+            value = argument.getData().getValue()
+            return self.convertToType(value, argument.getData().getType())
+        
+    # Get type of symbol (int, string, bool, nil)
+    def getSymbolType(self, argument:parse.XMLArgument) -> str:
+        if argument.getXmlType() == "var":
+            frame = self.getFrame(argument.getData().getFrameName())
+            type = frame.getVariable(argument.getData().getName()).getType()
+            if type is None:
+                sys.stderr.write(f"ERR: Variable {argument.getData().getName()} is not set.")
+                exit(error.missingValue)
+            return type
+        else: 
+            return argument.getData().getType()
+    
+    def boolToInt(self, value:str) -> int:
+        if type(value) == int:
+            return value
+        if str(value).lower() == "true":
+            return 1
+        else:
+            return 0
+    
+    def intToBool(self, value:int) -> str:
+        if value == 1:
+            return "true"
+        else:
+            return "false"
+    
+    def convertToType(self, value, type):
+        try:
+            if type == "bool":
+                return self.boolToInt(value)
+            elif type == "int":
+                return int(value)
+            elif type == "nil":
+                return value
+            elif type == "string":
+                return value
+            elif type is None:
+                return None
+        except:
+            sys.stderr.write(f"ERR: Invalid value in instruction.")
+            exit(error.wrongXMLStructure)
+    
+    # Convert to writeable value
+    def convertToWriteType(self, value, type):
+        if type == "bool":
+            return self.intToBool(value)
+        elif type == "int":
+            return str(value)
+        elif type == "nil":
+            return ""
+        elif type == "string":
+            return value
+        elif type is None:
+            return ""
+        
+    # Check if variable is set
+    def checkIfSet(self, argument:parse.XMLArgument):
+        if self.getSymbolValue(argument) == None:
+            sys.stderr.write(f"ERR: Variable {argument.getData().getName()} is not set.")
+            exit(error.missingValue)
+
+    # Check if label exists
+    def checkLabelExistance(self, labelName):
+        if self.labels.get(labelName) is None:
+            sys.stderr.write(f"ERR: Label {labelName} does not exist.")
+            exit(error.semantics)
+
+    # If input is not 0, exit with error code
+    def myAssert(self, value, instruction:parse.XMLInstruction, errorCode):
+        if value == 0:
+            sys.stderr.write(f"ERR: Error in {instruction.getOpcode()} instruction with order {instruction.getOrder()}. Error code: {errorCode}.")
+            exit(errorCode)
+
+
+class PipelinedExecutor(Executor):
+    def __init__(self, program):
+        super().__init__()
+        self.program = program
+
+    # Label may be defined in part of program which is not parsed yet
+    def checkLabelExistance(self, labelName):
+        self.program.waitForLabel(self.labels, labelName)
+        super().checkLabelExistance(labelName)
+
+
+# Run interpreter, executor refers to it as global interpret
+def main():
+    global interpret
+    interpret = Interpret()
+    interpret.run()
\ No newline at end of file
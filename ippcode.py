@@ -0,0 +1,150 @@
+import re
+import sys
+import error
+import parse
+
+# Front end reading IPPcode23 source text directly, it accepts the same language as parse.php
+# and creates the same program as parsing of XML generated by parse.php would
+
+# Operands of instructions: var, symb (variable or constant), type and label
+operands = {
+    "MOVE": ("var", "symb"), "INT2CHAR": ("var", "symb"), "STRLEN": ("var", "symb"),
+    "TYPE": ("var", "symb"), "NOT": ("var", "symb"),
+    "CREATEFRAME": (), "PUSHFRAME": (), "POPFRAME": (), "RETURN": (), "BREAK": (),
+    "DEFVAR": ("var",), "POPS": ("var",),
+    "PUSHS": ("symb",), "WRITE": ("symb",), "EXIT": ("symb",), "DPRINT": ("symb",),
+    "ADD": ("var", "symb", "symb"), "SUB": ("var", "symb", "symb"), "MUL": ("var", "symb", "symb"),
+    "IDIV": ("var", "symb", "symb"), "LT": ("var", "symb", "symb"), "GT": ("var", "symb", "symb"),
+    "EQ": ("var", "symb", "symb"), "AND": ("var", "symb", "symb"), "OR": ("var", "symb", "symb"),
+    "STRI2INT": ("var", "symb", "symb"), "CONCAT": ("var", "symb", "symb"),
+    "GETCHAR": ("var", "symb", "symb"), "SETCHAR": ("var", "symb", "symb"),
+    "READ": ("var", "type"),
+    "LABEL": ("label",), "JUMP": ("label",), "CALL": ("label",),
+    "JUMPIFEQ": ("label", "symb", "symb"), "JUMPIFNEQ": ("label", "symb", "symb"),
+}
+jumps = {"JUMP", "CALL", "JUMPIFEQ", "JUMPIFNEQ"}
+
+identifier = r"(?:[^\W\d]|[-$&%*!?])[\w$&%*!?-]*"
+headerPattern = re.compile(r".IPPcode23", re.IGNORECASE)
+whitespacePattern = re.compile(r"[ \t\n\r\f\v]+")
+variablePattern = re.compile(rf"(?:TF|LF|GF)@{identifier}")
+labelPattern = re.compile(identifier, re.IGNORECASE)
+typePattern = re.compile(r"int|string|bool")
+constantPatterns = [
+    re.compile(r"int@[-+]?(?:[1-9][0-9]*(?:_[0-9]+)*|0)"),
+    re.compile(r"int@[-+]?0x[0-9a-f]+(?:_[0-9a-f]+)*", re.IGNORECASE),
+    re.compile(r"int@[-+]?0[0-7]+(?:_[0-7]+)*", re.IGNORECASE),
+    re.compile(r"nil@nil"),
+    re.compile(r"bool@(?:true|false)"),
+    re.compile(r"string@(?:[^\\]|\\[0-9]{3})*"),
+]
+
+class SourceParser(parse.Parser):
+    def __init__(self, sourceFile):
+        super().__init__(sourceFile)
+        self.order = 0
+        self.labels = set()
+        self.jumpTargets = []
+        # Checked operands, most of them repeat many times in program
+        self.operands = {}
+
+    # Parse source text and return program
+    def run(self) -> parse.XMLElements:
+        headerFound = False
+        for line in self.sourceFile:
+            words = self.splitLine(line)
+            if len(words) == 0:
+                continue
+            if not headerFound:
+                if headerPattern.fullmatch(words[0]) is None:
+                    sys.stderr.write("ERR: Missing header .IPPcode23.")
+                    exit(error.missingHeader)
+                if len(words) > 1:
+                    self.unexpectedOpcode(words[1])
+                headerFound = True
+                continue
+            self.parseInstruction(words)
+        self.sourceFile.close()
+
+        if not headerFound:
+            sys.stderr.write("ERR: Missing header .IPPcode23.")
+            exit(error.missingHeader)
+        for label in self.jumpTargets:
+            if label not in self.labels:
+                sys.stderr.write(f"ERR: Jump to undefined label {label}.")
+                exit(error.semantics)
+        return self.xmlElements
+
+    # Remove comment and split line into words
+    def splitLine(self, line:bytes) -> list:
+        try:
+            text = line.decode("utf-8")
+        except UnicodeDecodeError:
+            sys.stderr.write("ERR: Source is not valid UTF-8 text.")
+            exit(error.wrongSource)
+        text = text.split("#", 1)[0].strip(" \t\n\r\0\x0b")
+        if text == "":
+            return []
+        return whitespacePattern.split(text)
+
+    def parseInstruction(self, words:list):
+        opcode = words[0].upper()
+        expected = operands.get(opcode)
+        if expected is None:
+            self.unexpectedOpcode(words[0])
+
+        if opcode == "LABEL" and len(words) > 1:
+            if words[1] in self.labels:
+                sys.stderr.write(f"ERR: Label {words[1]} already exists.")
+                exit(error.wrongSource)
+            self.labels.add(words[1])
+        elif opcode in jumps and len(words) > 1:
+            self.jumpTargets.append(words[1])
+
+        if len(words) != len(expected) + 1:
+            sys.stderr.write(f"ERR: Wrong count of operands of {opcode} instruction.")
+            exit(error.wrongSource)
+
+        self.order += 1
+        instruction = parse.XMLInstruction({"opcode": opcode, "order": self.order})
+        argNumber = 1
+        for kind in expected:
+            word = words[argNumber]
+            key = (kind, word, argNumber, opcode == "LABEL")
+            argument = self.operands.get(key)
+            if argument is None:
+                type, data = self.parseOperand(kind, word, argNumber, opcode)
+                argument = self.sharedArgument(argNumber, type, data)
+                self.operands[key] = argument
+            instruction.appendArgument(argument)
+            argNumber += 1
+        self.xmlElements.appendInstruction(instruction)
+
+    # Check operand and return its XML type and text
+    def parseOperand(self, kind, word:str, argNumber, opcode) -> tuple:
+        if variablePattern.fullmatch(word) is not None:
+            if kind == "var" or kind == "symb":
+                return "var", word
+        elif any(pattern.fullmatch(word) is not None for pattern in constantPatterns):
+            if kind == "symb":
+                type, text = word.split("@", 1)
+                return type, self.elementText(text)
+        elif typePattern.fullmatch(word) is not None and opcode != "LABEL":
+            if kind == "type":
+                return "type", word
+        elif labelPattern.fullmatch(word) is not None and argNumber == 1:
+            if kind == "label":
+                return "label", word
+
+        sys.stderr.write(f"ERR: Unexpected operand {word} of {opcode} instruction.")
+        exit(error.wrongSource)
+
+    # Text of constant as XML parser would read it from argument element
+    def elementText(self, text:str) -> str:
+        if text.isspace():
+            return ""
+        return text.strip()
+
+    def unexpectedOpcode(self, word):
+        sys.stderr.write(f"ERR: Unexpected token {word}, expected opcode.")
+        exit(error.wrongOpcode)
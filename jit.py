@@ -0,0 +1,665 @@
+import sys
+import error
+import limits
+import parse
+
+# Executions of block before it is compiled
+defaultThreshold = 50
+
+# Opcodes which end a basic block (they may transfer control)
+blockEnds = {"JUMP", "JUMPIFEQ", "JUMPIFNEQ", "CALL", "RETURN", "EXIT"}
+
+# Profiled block continues through conditional jump which went the same way at least this share of executions
+biasShare = 0.9
+
+# Most instructions compiled together when block continues through jumps
+maxTrace = 256
+
+# Python type of a canonical value stored in a variable of given type
+canonicalTypes = {"int": int, "bool": int, "string": str, "nil": str}
+
+# Expected argument counts of opcodes with a compiled fast path
+argCounts = {
+    "MOVE": 2, "CREATEFRAME": 0, "PUSHFRAME": 0, "POPFRAME": 0, "DEFVAR": 1,
+    "CALL": 1, "RETURN": 0, "PUSHS": 1, "POPS": 1,
+    "ADD": 3, "SUB": 3, "MUL": 3, "IDIV": 3, "LT": 3, "GT": 3, "EQ": 3,
+    "AND": 3, "OR": 3, "NOT": 2, "INT2CHAR": 2, "STRI2INT": 3,
+    "WRITE": 1, "CONCAT": 3, "STRLEN": 2, "GETCHAR": 3, "SETCHAR": 3,
+    "TYPE": 2, "LABEL": 1, "JUMP": 1, "JUMPIFEQ": 3, "JUMPIFNEQ": 3,
+}
+
+# Binary operations over two operands of one fixed type
+arithmetic = {"ADD": "+", "SUB": "-", "MUL": "*"}
+logic = {"AND": "and", "OR": "or"}
+
+class TieredExecutor:
+    def __init__(self, interpret, executor, program:parse.XMLElements, threshold:int, profile=None):
+        self.interpret = interpret
+        self.executor = executor
+        self.program = program
+        self.threshold = threshold
+        self.counters = {}
+        self.blocks = {}
+        self.profile = profile
+        self.compiler = BlockCompiler(interpret, executor, program, profile)
+        if profile is not None:
+            # Blocks hot in profiled runs are compiled when they are entered first
+            for index in profile.hotIndexes(threshold):
+                self.counters[index] = threshold - 1
+
+    # Run program block by block, compiling blocks once they are hot
+    def run(self, maxOrder):
+        interpret = self.interpret
+        blocks = self.blocks
+        counters = self.counters
+        while interpret.order != maxOrder:
+            start = interpret.orderIndex
+            block = blocks.get(start)
+            if block is not None:
+                block()
+                continue
+
+            count = counters.get(start, 0) + 1
+            counters[start] = count
+            if count >= self.threshold and start < len(interpret.orderList):
+                block = self.compiler.compile(self.findTrace(start))
+                blocks[start] = block
+                block()
+                continue
+            self.runCold(start)
+
+    # Return index of last instruction of block starting at given index
+    def findBlockEnd(self, start) -> int:
+        orderList = self.interpret.orderList
+        index = start
+        while index < len(orderList) - 1:
+            opcode = self.program.getInstruction(orderList[index]).getOpcode()
+            if opcode in blockEnds:
+                break
+            if self.program.getInstruction(orderList[index + 1]).getOpcode() == "LABEL":
+                break
+            index += 1
+        return index
+
+    # Return indexes of instructions compiled together from given start
+    # Profiled block continues through jumps to the instructions most runs executed next
+    def findTrace(self, start) -> list:
+        trace = list(range(start, self.findBlockEnd(start) + 1))
+        if self.profile is None:
+            return trace
+        visited = set(trace)
+        while True:
+            successor = self.traceSuccessor(trace[-1])
+            if successor is None or successor in visited:
+                break
+            block = range(successor, self.findBlockEnd(successor) + 1)
+            if len(trace) + len(block) > maxTrace or not visited.isdisjoint(block):
+                break
+            trace += block
+            visited.update(block)
+        return trace
+
+    # Return index executed after instruction ending block in most profiled runs, None if it is not known
+    def traceSuccessor(self, index):
+        instruction = self.program.getInstruction(self.interpret.orderList[index])
+        opcode = instruction.getOpcode()
+        if not self.compiler.hasArguments(instruction):
+            return None
+        if opcode == "JUMP":
+            return self.jumpTarget(instruction)
+        if opcode in ("JUMPIFEQ", "JUMPIFNEQ"):
+            share = self.profile.getTakenShare(index)
+            if share is None or self.profile.getCount(index) < self.threshold:
+                return None
+            if share >= biasShare:
+                return self.jumpTarget(instruction)
+            if share <= 1 - biasShare and index + 1 < len(self.interpret.orderList):
+                return index + 1
+            return None
+        if opcode in blockEnds or index + 1 >= len(self.interpret.orderList):
+            return None
+        # Block ended before label
+        return index + 1
+
+    # Return index execution continues at after jump, None if program ends or label does not exist
+    def jumpTarget(self, instruction:parse.XMLInstruction):
+        label = instruction.getArgument(1)
+        if label.getXmlType() != "label":
+            return None
+        labelOrder = self.executor.labels.get(label.getData().getValue())
+        orderList = self.interpret.orderList
+        if labelOrder is None or labelOrder == orderList[-1]:
+            return None
+        target = self.compiler.indexes[labelOrder] + 2
+        return target if target < len(orderList) else None
+
+    # Interpret block instruction by instruction with generic handlers
+    def runCold(self, start):
+        interpret = self.interpret
+        orderList = interpret.orderList
+        while True:
+            interpret.order = orderList[interpret.orderIndex]
+            instruction = self.program.getInstruction(interpret.order)
+            opcode = instruction.getOpcode()
+
+            try:
+                getattr(self.executor, opcode)(instruction)
+            except AttributeError:
+                sys.stderr.write(f"ERR: Error while executing opcode {opcode}.")
+                exit(error.wrongXMLStructure)
+
+            interpret.orderIndex += 1
+            interpret.instructionCount += 1
+            if opcode in blockEnds or interpret.orderIndex >= len(orderList):
+                return
+            if self.program.getInstruction(orderList[interpret.orderIndex]).getOpcode() == "LABEL":
+                return
+
+class BlockCompiler:
+    def __init__(self, interpret, executor, program:parse.XMLElements, profile=None):
+        self.interpret = interpret
+        self.executor = executor
+        self.program = program
+        self.profile = profile
+        self.index = None
+        self.indexes = {order: index for index, order in enumerate(interpret.orderList)}
+
+    # Compile instructions at given indexes into Python closure, jumps between them are taken inside it
+    def compile(self, indexes):
+        start = indexes[0]
+        end = indexes[-1]
+        self.constants = {}
+        self.tempCount = 0
+        lines = ["def make(interp, ex, _slow, _slowEnd, _text, Variable, Frame, C, IDX, E):",
+                 "    G = ex.globalFrame.variables",
+                 "    LS = ex.localFrameStack.stack",
+                 "    CS = ex.callStack.stack",
+                 "    TC = ex.tailFrames",
+                 "    DS = ex.dataStack.stack"]
+        body = ["    def run():",
+                "        n = interp.instructionCount"]
+
+        for count, index in enumerate(indexes):
+            order = self.interpret.orderList[index]
+            instruction = self.program.getInstruction(order)
+            opcode = instruction.getOpcode()
+            self.index = index
+            body.append(f"        # {order}: {opcode}")
+            if count == len(indexes) - 1:
+                body += self.indent(self.compileLast(instruction, index, count), 2)
+            elif opcode in ("JUMPIFEQ", "JUMPIFNEQ"):
+                body += self.indent(self.compileBranch(instruction, index, count, indexes[count + 1] != index + 1), 2)
+            elif opcode != "JUMP":
+                body += self.indent(self.compileInstruction(instruction, index, count), 2)
+
+        for name, value in self.constants.items():
+            lines.append(f"    {name} = _K[{name!r}]")
+        lines += body
+        lines.append("    return run")
+
+        namespace = {"_K": self.constants}
+        exec(compile("\n".join(lines), f"<block {start}-{end}>", "exec"), namespace)
+        return namespace["make"](self.interpret, self.executor, self.slowCall, self.slowEnd,
+                                 writeText, parse.Variable, type(self.executor.globalFrame),
+                                 canonicalTypes, self.indexes, {})
+
+    # Call generic handler for instruction inside block
+    def slowCall(self, instruction, order, count):
+        self.interpret.order = order
+        self.interpret.instructionCount = count
+        self.dispatch(instruction)
+
+    # Call generic handler for instruction ending block
+    def slowEnd(self, instruction, order, index, count):
+        interpret = self.interpret
+        interpret.order = order
+        interpret.orderIndex = index
+        interpret.instructionCount = count
+        self.dispatch(instruction)
+        interpret.orderIndex += 1
+        interpret.instructionCount += 1
+
+    def dispatch(self, instruction:parse.XMLInstruction):
+        opcode = instruction.getOpcode()
+        try:
+            getattr(self.executor, opcode)(instruction)
+        except AttributeError:
+            sys.stderr.write(f"ERR: Error while executing opcode {opcode}.")
+            exit(error.wrongXMLStructure)
+
+    def indent(self, lines, level):
+        return ["    " * level + line for line in lines]
+
+    # Store object used by generated code and return its name
+    def constant(self, value):
+        name = f"K{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def temp(self):
+        self.tempCount += 1
+        return f"t{self.tempCount}"
+
+    ## CODE GENERATION ##
+
+    # Compile instruction which does not end block
+    def compileInstruction(self, instruction:parse.XMLInstruction, index, count):
+        order = instruction.getOrder()
+        slow = [f"_slow({self.constant(instruction)}, {order}, n + {count})"]
+        if not self.hasArguments(instruction):
+            return slow
+
+        fast = self.compileFast(instruction)
+        if fast is None:
+            return slow
+        guards, actions, lookups = fast
+        if len(guards) == 0:
+            return lookups + actions
+        return lookups + [f"if {' and '.join(guards)}:"] + self.indent(actions, 1) + ["else:"] + self.indent(slow, 1)
+
+    # Compile instruction ending block, it leaves interpreter state as after plain loop
+    def compileLast(self, instruction:parse.XMLInstruction, index, count):
+        order = instruction.getOrder()
+        opcode = instruction.getOpcode()
+        slow = [f"_slowEnd({self.constant(instruction)}, {order}, {index}, n + {count})", "return"]
+        fallThrough = [f"interp.order = {order}",
+                       f"interp.orderIndex = {index + 1}",
+                       f"interp.instructionCount = n + {count + 1}"]
+        if not self.hasArguments(instruction) or self.isAccounted(opcode):
+            return slow
+
+        if opcode in ("JUMP", "CALL", "JUMPIFEQ", "JUMPIFNEQ"):
+            return self.compileJump(instruction, index, count, slow, fallThrough)
+        if opcode == "RETURN":
+            return ["if CS:"] + self.indent([
+                "r = CS.pop()",
+                "if TC: ex.leaveTailCalls()",
+                "interp.order = r",
+                "interp.orderIndex = IDX[r] + 2",
+                f"interp.instructionCount = n + {count + 1}",
+                "return"], 1) + slow
+        if opcode in blockEnds:
+            return slow
+
+        fast = self.compileFast(instruction)
+        if fast is None:
+            return slow
+        guards, actions, lookups = fast
+        if len(guards) == 0:
+            return lookups + actions + fallThrough
+        return lookups + [f"if {' and '.join(guards)}:"] + self.indent(actions + fallThrough + ["return"], 1) + slow
+
+    def compileJump(self, instruction:parse.XMLInstruction, index, count, slow, fallThrough):
+        opcode = instruction.getOpcode()
+        label = instruction.getArgument(1)
+        if label.getXmlType() != "label":
+            return slow
+        labelOrder = self.executor.labels.get(label.getData().getValue())
+        if labelOrder is None:
+            return slow
+        jump = [f"interp.order = {labelOrder}",
+                f"interp.orderIndex = {self.indexes[labelOrder] + 2}",
+                f"interp.instructionCount = n + {count + 1}",
+                "return"]
+
+        if opcode == "JUMP":
+            return jump
+        if opcode == "CALL":
+            if self.interpret.isTailCall(index):
+                return ["ex.enterTailCall()"] + jump
+            return [f"CS.append({instruction.getOrder()})"] + jump
+
+        lookups = []
+        guards = []
+        value1 = self.symbol(instruction.getArgument(2), lookups, guards)
+        value2 = self.symbol(instruction.getArgument(3), lookups, guards)
+        if value1 is None or value2 is None or not self.equalityGuards(value1, value2, guards):
+            return slow
+        compare = "==" if opcode == "JUMPIFEQ" else "!="
+        test = [f"if {value1[0]} {compare} {value2[0]}:"] + self.indent(jump, 1) + fallThrough + ["return"]
+        if len(guards) == 0:
+            return lookups + test
+        return lookups + [f"if {' and '.join(guards)}:"] + self.indent(test, 1) + slow
+
+    # Compile conditional jump inside block, block continues in direction given by taken and leaves in other one
+    def compileBranch(self, instruction:parse.XMLInstruction, index, count, taken):
+        opcode = instruction.getOpcode()
+        order = instruction.getOrder()
+        slow = [f"_slowEnd({self.constant(instruction)}, {order}, {index}, n + {count})", "return"]
+        label = instruction.getArgument(1)
+        if label.getXmlType() != "label" or label.getData().getValue() not in self.executor.labels:
+            return slow
+        lookups = []
+        guards = []
+        value1 = self.symbol(instruction.getArgument(2), lookups, guards)
+        value2 = self.symbol(instruction.getArgument(3), lookups, guards)
+        if value1 is None or value2 is None or not self.equalityGuards(value1, value2, guards):
+            return slow
+
+        compare = "==" if opcode == "JUMPIFEQ" else "!="
+        if taken:
+            test = f"if not {value1[0]} {compare} {value2[0]}:"
+            leave = [f"interp.order = {order}", f"interp.orderIndex = {index + 1}"]
+        else:
+            labelOrder = self.executor.labels[label.getData().getValue()]
+            test = f"if {value1[0]} {compare} {value2[0]}:"
+            leave = [f"interp.order = {labelOrder}", f"interp.orderIndex = {self.indexes[labelOrder] + 2}"]
+        leave += [f"interp.instructionCount = n + {count + 1}", "return"]
+        if len(guards) == 0:
+            return lookups + [test] + self.indent(leave, 1)
+        return lookups + [f"if not ({' and '.join(guards)}):"] + self.indent(slow, 1) + [test] + self.indent(leave, 1)
+
+    # Instructions checked against memory limits are executed by executor
+    def isAccounted(self, opcode) -> bool:
+        return self.executor.limits is not None and opcode in limits.accountedOps
+
+    # Generate guarded fast path as (guards, actions, lookups), None if instruction is not supported
+    def compileFast(self, instruction:parse.XMLInstruction):
+        opcode = instruction.getOpcode()
+        lookups = []
+        guards = []
+        if self.isAccounted(opcode):
+            return None
+
+        if opcode == "LABEL":
+            return guards, ["pass"], lookups
+
+        if opcode == "CREATEFRAME":
+            return guards, ["ex.tempFrame = Frame(Frame.TF)"], lookups
+
+        if opcode == "PUSHFRAME":
+            guards.append("ex.tempFrame is not None")
+            return guards, ["LS.append(ex.tempFrame)", "ex.tempFrame = None"], lookups
+
+        if opcode == "POPFRAME":
+            guards.append("LS")
+            return guards, ["ex.tempFrame = LS.pop()"], lookups
+
+        if opcode == "DEFVAR":
+            variable = self.variable(instruction.getArgument(1))
+            if variable is None:
+                return None
+            frame, name = variable
+            frameVar = self.temp()
+            if frame == "G":
+                lookups.append(f"{frameVar} = G")
+            else:
+                lookups.append(f"{frameVar} = {frame}")
+                guards.append(f"{frameVar} is not E")
+            guards.append(f"{name!r} not in {frameVar}")
+            return guards, [f"{frameVar}[{name!r}] = Variable({name!r}, None)"], lookups
+
+        if opcode == "WRITE":
+            value = self.symbol(instruction.getArgument(1), lookups, guards, ("int", "bool", "string", "nil"))
+            if value is None:
+                return None
+            if value[1] is None:
+                return guards, [f"print(_text({value[2]}.type, {value[0]}), end=\"\", flush=True)"], lookups
+            if value[2] is not None:
+                return guards, [f"print(_text({value[1]!r}, {value[0]}), end=\"\", flush=True)"], lookups
+            text = writeText(value[1], value[3])
+            return guards, [f"print({text!r}, end=\"\", flush=True)"], lookups
+
+        if opcode == "PUSHS":
+            arg = instruction.getArgument(1)
+            if arg.getXmlType() != "var":
+                if arg.getXmlType() not in ("int", "string", "bool", "nil"):
+                    return None
+                return guards, [f"DS.append({self.constant(arg.getData())})"], lookups
+            source = self.lookup(arg, lookups, guards)
+            if source is None:
+                return None
+            guards.append(f"{source}.type in ('int', 'string', 'bool', 'nil')")
+            return guards, [f"c = Variable({source}.name, {source}.type)",
+                            f"c.value = {source}.value",
+                            "DS.append(c)"], lookups
+
+        if opcode == "POPS":
+            guards.append("DS")
+            target = self.lookup(instruction.getArgument(1), lookups, guards)
+            if target is None:
+                return None
+            return guards, ["d = DS.pop()",
+                            f"{target}.value = d.value",
+                            f"{target}.type = d.type"], lookups
+
+        # Remaining opcodes write result into variable in first argument
+        targetArg = instruction.getArgument(1)
+        if targetArg.getXmlType() != "var":
+            return None
+
+        if opcode == "MOVE":
+            value = self.symbol(instruction.getArgument(2), lookups, guards, ("int", "bool", "string", "nil"))
+            target = self.lookup(targetArg, lookups, guards)
+            if value is None or target is None:
+                return None
+            resultType = f"{value[2]}.type" if value[1] is None else repr(value[1])
+            return guards, [f"{target}.value = {value[0]}", f"{target}.type = {resultType}"], lookups
+
+        if opcode == "TYPE":
+            arg = instruction.getArgument(2)
+            target = self.lookup(targetArg, lookups, guards)
+            if target is None:
+                return None
+            if arg.getXmlType() == "var":
+                source = self.lookup(arg, lookups, guards)
+                if source is None:
+                    return None
+                result = f"'' if {source}.type is None else {source}.type"
+            else:
+                result = repr(arg.getXmlType())
+            return guards, [f"{target}.value = {result}", f"{target}.type = 'string'"], lookups
+
+        if opcode == "SETCHAR":
+            string = self.symbol(targetArg, lookups, guards, ("string",))
+            index = self.symbol(instruction.getArgument(2), lookups, guards, ("int",))
+            source = self.symbol(instruction.getArgument(3), lookups, guards, ("string",))
+            if string is None or index is None or source is None:
+                return None
+            guards.append(f"len({string[0]}) > {index[0]} and len({source[0]}) != 0 and {index[0]} >= 0")
+            return guards, [f"{string[2]}.value = {string[0]}[:{index[0]}] + {source[0]}[0] + {string[0]}[{index[0]} + 1:]",
+                            f"{string[2]}.type = 'string'"], lookups
+
+        result = self.compileResult(instruction, lookups, guards)
+        if result is None:
+            return None
+        target = self.lookup(targetArg, lookups, guards)
+        if target is None:
+            return None
+        expression, resultType = result
+        return guards, [f"{target}.value = {expression}", f"{target}.type = {resultType!r}"], lookups
+
+    # Generate expression computing result of instruction as (expression, type)
+    def compileResult(self, instruction:parse.XMLInstruction, lookups, guards):
+        opcode = instruction.getOpcode()
+
+        if opcode in arithmetic or opcode == "IDIV":
+            value1 = self.symbol(instruction.getArgument(2), lookups, guards, ("int",))
+            value2 = self.symbol(instruction.getArgument(3), lookups, guards, ("int",))
+            if value1 is None or value2 is None:
+                return None
+            if opcode == "IDIV":
+                guards.append(f"{value2[0]} != 0")
+                return f"{value1[0]} // {value2[0]}", "int"
+            return f"{value1[0]} {arithmetic[opcode]} {value2[0]}", "int"
+
+        if opcode in ("LT", "GT"):
+            value1 = self.symbol(instruction.getArgument(2), lookups, guards, ("int", "string", "bool"))
+            value2 = self.symbol(instruction.getArgument(3), lookups, guards, ("int", "string", "bool"))
+            if value1 is None or value2 is None:
+                return None
+            if value1[1] is not None and value2[1] is not None:
+                if value1[1] != value2[1]:
+                    return None
+            else:
+                guards.append(f"{self.typeOf(value1)} == {self.typeOf(value2)}")
+            compare = "<" if opcode == "LT" else ">"
+            return f"1 if {value1[0]} {compare} {value2[0]} else 0", "bool"
+
+        if opcode == "EQ":
+            value1 = self.symbol(instruction.getArgument(2), lookups, guards)
+            value2 = self.symbol(instruction.getArgument(3), lookups, guards)
+            if value1 is None or value2 is None or not self.equalityGuards(value1, value2, guards):
+                return None
+            return f"1 if {value1[0]} == {value2[0]} else 0", "bool"
+
+        if opcode in logic:
+            value1 = self.symbol(instruction.getArgument(2), lookups, guards, ("bool",))
+            value2 = self.symbol(instruction.getArgument(3), lookups, guards, ("bool",))
+            if value1 is None or value2 is None:
+                return None
+            return f"{value1[0]} {logic[opcode]} {value2[0]}", "bool"
+
+        if opcode == "NOT":
+            value = self.symbol(instruction.getArgument(2), lookups, guards, ("bool",))
+            if value is None:
+                return None
+            return f"1 if not {value[0]} else 0", "bool"
+
+        if opcode == "INT2CHAR":
+            value = self.symbol(instruction.getArgument(2), lookups, guards, ("int",))
+            if value is None:
+                return None
+            guards.append(f"0 <= {value[0]} <= 0x10FFFF")
+            return f"chr({value[0]})", "string"
+
+        if opcode in ("STRI2INT", "GETCHAR"):
+            string = self.symbol(instruction.getArgument(2), lookups, guards, ("string",))
+            index = self.symbol(instruction.getArgument(3), lookups, guards, ("int",))
+            if string is None or index is None:
+                return None
+            guards.append(f"{index[0]} >= 0 and {index[0]} < len({string[0]})")
+            if opcode == "STRI2INT":
+                return f"ord({string[0]}[{index[0]}])", "int"
+            return f"{string[0]}[{index[0]}]", "string"
+
+        if opcode == "CONCAT":
+            value1 = self.symbol(instruction.getArgument(2), lookups, guards, ("string",))
+            value2 = self.symbol(instruction.getArgument(3), lookups, guards, ("string",))
+            if value1 is None or value2 is None:
+                return None
+            return f"{value1[0]} + {value2[0]}", "string"
+
+        if opcode == "STRLEN":
+            value = self.symbol(instruction.getArgument(2), lookups, guards, ("string",))
+            if value is None:
+                return None
+            return f"len({value[0]})", "int"
+
+        return None
+
+    # Add guards of EQ like comparison, False if it always fails
+    def equalityGuards(self, value1, value2, guards) -> bool:
+        allowed = ("int", "string", "bool", "nil")
+        for value in (value1, value2):
+            if value[1] is None:
+                guards.append(f"{value[2]}.type in {allowed}")
+            elif value[1] not in allowed:
+                return False
+        if value1[1] is not None and value2[1] is not None:
+            return value1[1] == value2[1] or "nil" in (value1[1], value2[1])
+        type1 = self.typeOf(value1)
+        type2 = self.typeOf(value2)
+        guards.append(f"({type1} == {type2} or {type1} == 'nil' or {type2} == 'nil')")
+        return True
+
+    # Return the only allowed type variable argument had in profiled runs, None if it is not known
+    def observedType(self, argument:parse.XMLArgument, types):
+        if self.profile is None or (types is not None and len(types) == 1):
+            return None
+        observed = self.profile.getType(self.index, argument.getArgNumber())
+        allowed = types if types is not None else ("int", "string", "bool", "nil")
+        return observed if observed in allowed else None
+
+    def typeOf(self, value) -> str:
+        if value[1] is None:
+            return f"{value[2]}.type"
+        return repr(value[1])
+
+    # Check that instruction has exactly the arguments its handler expects
+    def hasArguments(self, instruction:parse.XMLInstruction) -> bool:
+        count = argCounts.get(instruction.getOpcode())
+        if count is None:
+            return False
+        return sorted(instruction.getArgumentsKeys()) == list(range(1, count + 1))
+
+    # Return (frame expression, name) of variable argument
+    def variable(self, argument:parse.XMLArgument):
+        if argument.getXmlType() != "var":
+            return None
+        variable = argument.getData()
+        frameName = variable.getFrameName()
+        if frameName == "GF":
+            frame = "G"
+        elif frameName == "LF":
+            frame = "(LS[-1].variables if LS else E)"
+        elif frameName == "TF":
+            frame = "(ex.tempFrame.variables if ex.tempFrame is not None else E)"
+        else:
+            return None
+        return frame, variable.getName()
+
+    # Generate lookup of variable, return name of local holding it
+    def lookup(self, argument:parse.XMLArgument, lookups, guards):
+        variable = self.variable(argument)
+        if variable is None:
+            return None
+        frame, name = variable
+        local = self.temp()
+        lookups.append(f"{local} = {frame}.get({name!r})")
+        guards.append(f"{local} is not None")
+        return local
+
+    # Generate access to symbol value as (expression, static type, variable local, constant value)
+    # Static type is None for variables, their type is checked by guards, unless profile saw only one type
+    def symbol(self, argument:parse.XMLArgument, lookups, guards, types=None):
+        if argument.getXmlType() == "var":
+            local = self.lookup(argument, lookups, guards)
+            if local is None:
+                return None
+            observed = self.observedType(argument, types)
+            if observed is not None:
+                guards.append(f"{local}.type == {observed!r}")
+                guards.append(f"type({local}.value) is {canonicalTypes[observed].__name__}")
+                return f"{local}.value", observed, local, None
+            if types is not None and len(types) == 1:
+                guards.append(f"{local}.type == {types[0]!r}")
+                guards.append(f"type({local}.value) is {canonicalTypes[types[0]].__name__}")
+            else:
+                allowed = types if types is not None else ("int", "string", "bool", "nil")
+                guards.append(f"{local}.type in {tuple(allowed)}")
+                guards.append(f"type({local}.value) is C[{local}.type]")
+            return f"{local}.value", None, local, None
+
+        symbolType = argument.getXmlType()
+        if symbolType not in canonicalTypes or (types is not None and symbolType not in types):
+            return None
+        converted, value = constantValue(argument.getData())
+        if not converted:
+            return None
+        return repr(value), symbolType, None, value
+
+# Convert constant like Executor.convertToType, return (success, value)
+def constantValue(symbol:parse.Symbol):
+    value = symbol.getValue()
+    symbolType = symbol.getType()
+    if symbolType == "int":
+        try:
+            return True, int(value)
+        except (ValueError, TypeError):
+            return False, None
+    if symbolType == "bool":
+        if type(value) == int:
+            return True, value
+        return True, 1 if str(value).lower() == "true" else 0
+    return True, value
+
+# Convert canonical value to text printed by WRITE
+def writeText(type, value) -> str:
+    if type == "bool":
+        return "true" if value == 1 else "false"
+    if type == "int":
+        return str(value)
+    if type == "nil":
+        return ""
+    return value
@@ -0,0 +1,109 @@
+import sys
+import error
+import memreport
+import parse
+
+# Approximate size of variable, stack entry or return address besides its value
+entrySize = 64
+
+# Opcodes changing accounted state, compiled blocks call executor for them when limits are set
+accountedOps = {"MOVE", "ADD", "SUB", "MUL", "IDIV", "LT", "GT", "EQ", "AND", "OR", "NOT", "INT2CHAR", "STRI2INT",
+                "CONCAT", "STRLEN", "GETCHAR", "SETCHAR", "TYPE", "READ", "PUSHS", "POPS", "CALL", "RETURN",
+                "CREATEFRAME", "PUSHFRAME", "POPFRAME", "DEFVAR"}
+
+# Limits of memory used by program, checked on instructions which grow it
+#
+# Memory is estimated incrementally: variables, stack entries and return addresses cost entrySize, every value
+# written into variable is charged to the variable and values on data stack to the stack. Value held by more
+# variables is charged to each of them, also in frames hidden by PUSHFRAME, so estimate errs on the larger side.
+# Dropped temporary frames release their charges.
+class Limits:
+    def __init__(self, maxMemory=None, maxStackDepth=None, maxStringLength=None):
+        self.maxMemory = maxMemory
+        self.maxStackDepth = maxStackDepth
+        self.maxStringLength = maxStringLength
+        self.used = 0
+        self.charges = {}
+
+    # Account string created by instruction and stored into variable
+    def assign(self, executor, instruction:parse.XMLInstruction, variable:parse.Variable):
+        value = variable.getValue()
+        if self.maxStringLength is not None and type(value) == str and len(value) > self.maxStringLength:
+            self.exceeded(executor, instruction, f"String length limit {self.maxStringLength}")
+        self.store(executor, instruction, variable)
+
+    # Account value stored into variable, charge of its previous value is released
+    def store(self, executor, instruction:parse.XMLInstruction, variable:parse.Variable):
+        self.release(variable)
+        self.checkMemory(executor, instruction)
+
+    # Charge variable for its current value, it only shrinks when value was released
+    def release(self, variable:parse.Variable):
+        size = memreport.valueSize(variable.getValue())
+        self.used += size - self.charges.get(variable, 0)
+        self.charges[variable] = size
+
+    def defineVariable(self, executor, instruction:parse.XMLInstruction):
+        self.used += entrySize
+        self.checkMemory(executor, instruction)
+
+    # Release variables of dropped frame
+    def dropFrame(self, frame):
+        if frame is None:
+            return
+        for variable in frame.variables.values():
+            self.used -= entrySize + self.charges.pop(variable, 0)
+
+    def push(self, executor, instruction:parse.XMLInstruction, value):
+        self.checkDepth(executor, instruction, len(executor.dataStack.stack), "Data stack")
+        self.used += entrySize + memreport.valueSize(value)
+        self.checkMemory(executor, instruction)
+
+    def pop(self, value):
+        self.used -= entrySize + memreport.valueSize(value)
+
+    def call(self, executor, instruction:parse.XMLInstruction):
+        self.checkDepth(executor, instruction, len(executor.callStack.stack), "Call stack")
+        self.used += entrySize
+        self.checkMemory(executor, instruction)
+
+    def leave(self):
+        self.used -= entrySize
+
+    def pushFrame(self, executor, instruction:parse.XMLInstruction):
+        self.checkDepth(executor, instruction, len(executor.localFrameStack.stack), "Local frame stack")
+
+    def checkDepth(self, executor, instruction:parse.XMLInstruction, depth, name):
+        if self.maxStackDepth is not None and depth > self.maxStackDepth:
+            self.exceeded(executor, instruction, f"{name} depth limit {self.maxStackDepth}")
+
+    def checkMemory(self, executor, instruction:parse.XMLInstruction):
+        if self.maxMemory is not None and self.used > self.maxMemory:
+            self.exceeded(executor, instruction, f"Memory limit {self.maxMemory} B")
+
+    # Report limit breach with largest consumers and exit
+    def exceeded(self, executor, instruction:parse.XMLInstruction, limit):
+        sys.stderr.write(f"ERR: {limit} exceeded in {instruction.getOpcode()} instruction with order "
+                         f"{instruction.getOrder()}. Estimated memory: {self.used} B.\n")
+        sample = memreport.MemorySample(0, 0, executor)
+        sys.stderr.write(f"Values: GF {sample.globalSize} B, LF {sample.localSize} B in {sample.localDepth} frames, "
+                         f"TF {sample.tempSize} B, data stack {sample.dataSize} B in {sample.dataCount} values, "
+                         f"call depth {sample.callDepth}.\n")
+        sys.stderr.write("Largest variables:\n")
+        for size, name in sample.largest:
+            sys.stderr.write(f"    {name} {size} B\n")
+        exit(error.limitExceeded)
+
+# Stop program after given number of instructions, notified before every instruction
+class InstructionLimit:
+    def __init__(self, maxInstructions):
+        self.maxInstructions = maxInstructions
+
+    def beforeInstruction(self, interpret, executor, instruction:parse.XMLInstruction):
+        if interpret.getInstructionCount() >= self.maxInstructions:
+            sys.stderr.write(f"ERR: Instruction limit {self.maxInstructions} exceeded in {instruction.getOpcode()} "
+                             f"instruction with order {instruction.getOrder()}.")
+            exit(error.limitExceeded)
+
+    def close(self):
+        pass
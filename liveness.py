@@ -0,0 +1,193 @@
+import collections
+import optimizer
+import parse
+import pgo
+
+# Release of values which are not read again
+#
+# Backward liveness analysis over control flow graph of whole program finds variables whose value is dead before
+# each instruction: no path from there reads it before it is overwritten. Jumps continue after instruction
+# following label and every RETURN may continue after instruction following any CALL, as in executor. Variables
+# are keys (frame, name), PUSHFRAME and POPFRAME rename temporary and local frame and local frame hidden by
+# PUSHFRAME is kept live. BREAK reads every variable. TYPE reads only type, released variable keeps it, so
+# types, unset variables and error messages stay the same.
+
+# Types whose value is replaced when it is dead, values of other types are small
+releasedValues = {"string": "", "int": 0}
+
+class Liveness:
+    def __init__(self, program:parse.XMLElements, orderList):
+        self.instructions = [program.getInstruction(order) for order in orderList]
+        # Every variable of program has bit in masks of live variables
+        self.bits = {}
+        self.keys = []
+        self.frameMasks = {"GF": 0, "LF": 0, "TF": 0}
+        # Bits of local and temporary variable with the same name
+        self.framePairs = []
+
+    # Return {index: keys of variables to release before instruction at index}
+    def run(self) -> dict:
+        count = len(self.instructions)
+        reads = [self.readMask(instruction) for instruction in self.instructions]
+        writes = [self.writeMask(instruction) for instruction in self.instructions]
+        self.pairFrames()
+        successors = self.findSuccessors()
+        predecessors = [[] for _ in range(count)]
+        for index, targets in enumerate(successors):
+            for target in targets:
+                predecessors[target].append(index)
+
+        # Masks of variables live before instruction, iterated backwards until they stop changing
+        live = [0] * count
+        pending = collections.deque(range(count - 1, -1, -1))
+        queued = [True] * count
+        while len(pending) != 0:
+            index = pending.popleft()
+            queued[index] = False
+            liveOut = 0
+            for target in successors[index]:
+                liveOut |= live[target]
+            liveIn = self.transfer(self.instructions[index].getOpcode(), liveOut, reads[index], writes[index])
+            if liveIn != live[index]:
+                live[index] = liveIn
+                for source in predecessors[index]:
+                    if not queued[source]:
+                        queued[source] = True
+                        pending.append(source)
+
+        # Values live after predecessor which are dead before instruction
+        releases = {}
+        for index in range(count):
+            previous = 0
+            for source in predecessors[index]:
+                previous |= live[source] | writes[source]
+            dead = previous & ~live[index]
+            if dead != 0:
+                keys = []
+                while dead != 0:
+                    lowest = dead & -dead
+                    keys.append(self.keys[lowest.bit_length() - 1])
+                    dead ^= lowest
+                releases[index] = tuple(keys)
+        return releases
+
+    # Return live variables before instruction from those live after it
+    def transfer(self, opcode, liveOut, reads, writes) -> int:
+        globalMask = liveOut & ~self.frameMasks["LF"] & ~self.frameMasks["TF"]
+        if opcode == "CREATEFRAME":
+            return liveOut & ~self.frameMasks["TF"]
+        if opcode == "PUSHFRAME":
+            # Variables of local frame come back after POPFRAME
+            return globalMask | self.frameMasks["LF"] | self.rename(liveOut, 0, 1)
+        if opcode == "POPFRAME":
+            return globalMask | self.rename(liveOut, 1, 0)
+        if opcode == "BREAK":
+            return (1 << len(self.keys)) - 1
+        return reads | liveOut & ~writes
+
+    # Variables live after frame operation under other frame name, pairs are (local bit, temporary bit)
+    def rename(self, liveOut, after, before) -> int:
+        mask = 0
+        for pair in self.framePairs:
+            if liveOut >> pair[after] & 1:
+                mask |= 1 << pair[before]
+        return mask
+
+    # Return indexes of instructions which may be executed after each instruction
+    def findSuccessors(self) -> list:
+        count = len(self.instructions)
+        labels = {}
+        returns = []
+        for index, instruction in enumerate(self.instructions):
+            opcode = instruction.getOpcode()
+            if opcode == "LABEL" and len(instruction.getArgumentsKeys()) != 0:
+                labels.setdefault(instruction.getArgument(instruction.getArgumentsKeys()[0]).getData().getValue(), []).append(index)
+            elif opcode == "CALL" and index + 2 < count:
+                returns.append(index + 2)
+
+        successors = []
+        for index, instruction in enumerate(self.instructions):
+            opcode = instruction.getOpcode()
+            targets = []
+            if opcode not in ("JUMP", "CALL", "RETURN", "EXIT") and index + 1 < count:
+                targets.append(index + 1)
+            if opcode in ("JUMP", "JUMPIFEQ", "JUMPIFNEQ", "CALL"):
+                for key in instruction.getArgumentsKeys():
+                    data = instruction.getArgument(key).getData()
+                    if instruction.getArgument(key).getXmlType() == "label" and data is not None:
+                        targets += [label + 2 for label in labels.get(data.getValue(), []) if label + 2 < count]
+            elif opcode == "RETURN":
+                targets += returns
+            successors.append(targets)
+        return successors
+
+    # Variables whose value instruction reads, TYPE reads only type
+    def readMask(self, instruction:parse.XMLInstruction) -> int:
+        mask = 0
+        keys = instruction.getArgumentsKeys()
+        opcode = instruction.getOpcode()
+        for key in keys:
+            argument = instruction.getArgument(key)
+            if argument.getXmlType() != "var":
+                continue
+            bit = self.bit(argument)
+            if opcode == "TYPE" and key != keys[0]:
+                continue
+            if (opcode in optimizer.writers or opcode == "DEFVAR") and key == 1 == keys[0]:
+                continue
+            mask |= 1 << bit
+        return mask
+
+    # Variables overwritten by instruction, their previous value is dead
+    def writeMask(self, instruction:parse.XMLInstruction) -> int:
+        keys = instruction.getArgumentsKeys()
+        opcode = instruction.getOpcode()
+        if (opcode in optimizer.writers or opcode == "DEFVAR") and len(keys) != 0 and keys[0] == 1:
+            argument = instruction.getArgument(1)
+            if argument.getXmlType() == "var":
+                return 1 << self.bit(argument)
+        return 0
+
+    def bit(self, argument:parse.XMLArgument) -> int:
+        return self.keyBit(optimizer.variableKey(argument))
+
+    def keyBit(self, key) -> int:
+        bit = self.bits.get(key)
+        if bit is None:
+            bit = len(self.keys)
+            self.bits[key] = bit
+            self.keys.append(key)
+            if key[0] in self.frameMasks:
+                self.frameMasks[key[0]] |= 1 << bit
+        return bit
+
+    # Every local and temporary variable gets bit under other frame name, even if program never names it so,
+    # value of temporary variable after PUSHFRAME and POPFRAME is the same
+    def pairFrames(self):
+        for frameName, name in list(self.keys):
+            if frameName == "LF":
+                self.framePairs.append((self.bits["LF", name], self.keyBit(("TF", name))))
+            elif frameName == "TF" and ("LF", name) not in self.bits:
+                self.framePairs.append((self.keyBit(("LF", name)), self.bits["TF", name]))
+
+# Observer releasing dead values before instructions, variables stay defined with their type
+class Releaser:
+    def __init__(self):
+        self.releases = None
+
+    def beforeInstruction(self, interpret, executor, instruction:parse.XMLInstruction):
+        releases = self.releases
+        if releases is None:
+            # Program is known once execution starts
+            releases = self.releases = Liveness(interpret.program, interpret.orderList).run()
+        keys = releases.get(interpret.orderIndex)
+        if keys is not None:
+            for frameName, name in keys:
+                variable = pgo.findVariable(executor, frameName, name)
+                if variable is not None and variable.getType() in releasedValues:
+                    variable.setValue(releasedValues[variable.getType()])
+                    if executor.limits is not None:
+                        executor.limits.release(variable)
+
+    def close(self):
+        pass
@@ -0,0 +1,732 @@
+import contextlib
+import io
+import sys
+import traceback
+import error
+import interpreter
+import jit
+import parse
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Lockstep execution of one program over many inputs
+#
+# Instances which went the same way through program form group. Every variable of group is column holding value
+# of each instance in NumPy array, so one instruction is executed for whole group at once. Group splits when its
+# instances take different branch of conditional jump or read values of different types, and groups which meet
+# again at the same conditional jump with the same frames and stacks are merged back. Instruction which is not
+# supported, has operands of unexpected type or would fail is executed by scalar Executor for affected instances,
+# which then run to the end on their own, so output, errors and exit codes stay the same as when run one by one.
+
+# Opcodes before which group waits for others, so groups which went different ways can be merged
+branchOps = {"JUMPIFEQ", "JUMPIFNEQ"}
+
+# Integers whose operations can not overflow int64, larger ones are kept as Python ints in object arrays
+smallInt = 2 ** 62
+smallFactor = 2 ** 31
+
+# Argument numbers of instruction with given count of arguments
+argumentNumbers = [(), (1,), (1, 2), (1, 2, 3)]
+
+# Instances in group have to continue in scalar Executor, all of them if mask is None
+class Scalar(Exception):
+    def __init__(self, mask=None):
+        self.mask = mask
+
+class Column:
+    __slots__ = ("type", "values", "canonical")
+
+    # Values are None for variable which is not set, canonical is False for raw constants pushed to data stack
+    def __init__(self, type, values, canonical=True):
+        self.type = type
+        self.values = values
+        self.canonical = canonical
+
+    def select(self, mask):
+        return Column(self.type, self.values[mask] if self.values is not None else None, self.canonical)
+
+class Group:
+    def __init__(self, instances, counts):
+        self.instances = instances
+        # Instruction count of each instance when group was created, executed is added to it
+        self.counts = counts
+        self.executed = 0
+        self.order = 0
+        self.orderIndex = 0
+        self.globalFrame = {}
+        self.localFrames = []
+        self.tempFrame = None
+        self.callStack = []
+        self.tailFrames = []
+        self.tailFrameCount = 0
+        self.dataStack = []
+
+    def size(self) -> int:
+        return len(self.instances)
+
+    # Return group of instances selected by mask, columns are shared as they are never changed in place
+    def select(self, mask):
+        group = Group(self.instances[mask], self.counts[mask] + self.executed)
+        group.copyControl(self)
+        group.globalFrame = selectFrame(self.globalFrame, mask)
+        group.localFrames = [selectFrame(frame, mask) for frame in self.localFrames]
+        group.tempFrame = selectFrame(self.tempFrame, mask)
+        group.dataStack = [column.select(mask) for column in self.dataStack]
+        return group
+
+    def copyControl(self, other):
+        self.order = other.order
+        self.orderIndex = other.orderIndex
+        self.callStack = list(other.callStack)
+        self.tailFrames = [list(run) for run in other.tailFrames]
+        self.tailFrameCount = other.tailFrameCount
+
+    # Groups with equal signature are at the same place with the same variables, so they can be merged
+    def signature(self) -> tuple:
+        return (self.orderIndex, self.order, frameSignature(self.globalFrame),
+                tuple(frameSignature(frame) for frame in self.localFrames), frameSignature(self.tempFrame),
+                tuple(self.callStack), tuple(tuple(run) for run in self.tailFrames),
+                tuple((column.type, column.canonical) for column in self.dataStack))
+
+    # Jump to next instruction after given order, same as Interpret.jumpAfter
+    def jumpAfter(self, order, orderIndexes):
+        self.order = order
+        self.orderIndex = orderIndexes[order] + 1
+
+    def enterTailCall(self):
+        size = len(self.callStack)
+        if len(self.tailFrames) != 0 and self.tailFrames[-1][0] == size:
+            self.tailFrames[-1][1] += 1
+        else:
+            self.tailFrames.append([size, 1])
+        self.tailFrameCount += 1
+
+    def leaveTailCalls(self):
+        size = len(self.callStack)
+        while len(self.tailFrames) != 0 and self.tailFrames[-1][0] > size:
+            self.tailFrameCount -= self.tailFrames.pop()[1]
+
+def selectFrame(frame, mask):
+    if frame is None:
+        return None
+    return {name: column.select(mask) for name, column in frame.items()}
+
+def frameSignature(frame):
+    if frame is None:
+        return None
+    return tuple((name, column.type, column.canonical) for name, column in frame.items())
+
+# Merge groups with equal signature into one group
+def mergeGroups(groups) -> Group:
+    first = groups[0]
+    if len(groups) == 1:
+        return first
+    group = Group(numpy.concatenate([part.instances for part in groups]),
+                  numpy.concatenate([part.counts + part.executed for part in groups]))
+    group.copyControl(first)
+    group.globalFrame = mergeFrames([part.globalFrame for part in groups])
+    group.localFrames = [mergeFrames([part.localFrames[level] for part in groups]) for level in range(len(first.localFrames))]
+    group.tempFrame = mergeFrames([part.tempFrame for part in groups])
+    group.dataStack = [mergeColumns([part.dataStack[level] for part in groups]) for level in range(len(first.dataStack))]
+    return group
+
+def mergeFrames(frames):
+    if frames[0] is None:
+        return None
+    return {name: mergeColumns([frame[name] for frame in frames]) for name in frames[0]}
+
+def mergeColumns(columns) -> Column:
+    first = columns[0]
+    if first.values is None:
+        return first
+    return Column(first.type, numpy.concatenate([column.values for column in columns]), first.canonical)
+
+# Array of integers, Python ints are kept in object array if some of them does not fit int64
+def intArray(values):
+    try:
+        return numpy.array(values, dtype=numpy.int64)
+    except OverflowError:
+        return objectArray(values)
+
+def objectArray(values):
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+# Return operand as object array, constants are repeated for every instance
+def asObject(value, size):
+    if isinstance(value, numpy.ndarray):
+        return value if value.dtype == object else value.astype(object)
+    array = numpy.empty(size, dtype=object)
+    array.fill(value)
+    return array
+
+def isSmall(value, bound) -> bool:
+    if isinstance(value, numpy.ndarray):
+        return value.dtype != object and (len(value) == 0 or (value.max() < bound and value.min() > -bound))
+    return -bound < value < bound
+
+# Return values of column of given type, constants are repeated for every instance
+def columnValues(type, value, size):
+    if isinstance(value, numpy.ndarray):
+        return value
+    if type in ("int", "bool") and isSmall(value, smallInt):
+        return numpy.full(size, value, dtype=numpy.int64)
+    return asObject(value, size)
+
+def boolValues(result, size):
+    if isinstance(result, numpy.ndarray):
+        return result.astype(numpy.int64)
+    return numpy.full(size, 1 if result else 0, dtype=numpy.int64)
+
+# Executes instructions for whole group, raises Scalar before any change if it can not
+class VectorExecutor:
+    def __init__(self, runner):
+        self.runner = runner
+        self.labels = runner.labels
+        self.orderIndexes = runner.orderIndexes
+
+    # Executor reports missing arguments, they are looked up only when all of them exist
+    def expect(self, instruction:parse.XMLInstruction, count):
+        if tuple(sorted(instruction.getArgumentsKeys())) != argumentNumbers[count]:
+            raise Scalar()
+
+    def getFrame(self, group, frameName) -> dict:
+        if frameName == "GF":
+            return group.globalFrame
+        if frameName == "LF" and len(group.localFrames) != 0:
+            return group.localFrames[-1]
+        if frameName == "TF" and group.tempFrame is not None:
+            return group.tempFrame
+        raise Scalar()
+
+    # Return frame and name of existing variable
+    def getTarget(self, group, argument:parse.XMLArgument):
+        if argument.getXmlType() != "var":
+            raise Scalar()
+        data = argument.getData()
+        frame = self.getFrame(group, data.getFrameName())
+        if data.getName() not in frame:
+            raise Scalar()
+        return frame, data.getName()
+
+    # Return (type, values) of set variable or constant, values of constant are single value
+    def getOperand(self, group, argument:parse.XMLArgument, types):
+        if argument.getXmlType() == "var":
+            frame, name = self.getTarget(group, argument)
+            column = frame[name]
+            if column.type not in types or not column.canonical:
+                raise Scalar()
+            return column.type, column.values
+        symbolType = argument.getXmlType()
+        if symbolType not in types:
+            raise Scalar()
+        converted, value = jit.constantValue(argument.getData())
+        if not converted:
+            raise Scalar()
+        return symbolType, value
+
+    def getLabel(self, argument:parse.XMLArgument):
+        if argument.getXmlType() != "label" or argument.getData().getValue() not in self.labels:
+            raise Scalar()
+        return self.labels[argument.getData().getValue()]
+
+    # Return target and two integer operands, operands are object arrays if they may overflow
+    def getIntegers(self, group, instruction:parse.XMLInstruction, bound):
+        self.expect(instruction, 3)
+        frame, name = self.getTarget(group, instruction.getArgument(1))
+        value1 = self.getOperand(group, instruction.getArgument(2), ("int",))[1]
+        value2 = self.getOperand(group, instruction.getArgument(3), ("int",))[1]
+        if not isSmall(value1, bound) or not isSmall(value2, bound):
+            value1 = asObject(value1, group.size())
+            value2 = asObject(value2, group.size())
+        return frame, name, value1, value2
+
+    def MOVE(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 2)
+        frame, name = self.getTarget(group, instruction.getArgument(1))
+        type, value = self.getOperand(group, instruction.getArgument(2), jit.canonicalTypes)
+        frame[name] = Column(type, columnValues(type, value, group.size()))
+
+    def CREATEFRAME(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 0)
+        group.tempFrame = {}
+
+    def PUSHFRAME(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 0)
+        if group.tempFrame is None:
+            raise Scalar()
+        group.localFrames.append(group.tempFrame)
+        group.tempFrame = None
+
+    def POPFRAME(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 0)
+        if len(group.localFrames) == 0:
+            raise Scalar()
+        group.tempFrame = group.localFrames.pop()
+
+    def DEFVAR(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 1)
+        argument = instruction.getArgument(1)
+        if argument.getXmlType() != "var":
+            raise Scalar()
+        frame = self.getFrame(group, argument.getData().getFrameName())
+        if argument.getData().getName() in frame:
+            raise Scalar()
+        frame[argument.getData().getName()] = Column(None, None)
+
+    def CALL(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 1)
+        labelOrder = self.getLabel(instruction.getArgument(1))
+        if self.runner.interpret.isTailCall(group.orderIndex):
+            group.enterTailCall()
+        else:
+            group.callStack.append(group.order)
+        group.jumpAfter(labelOrder, self.orderIndexes)
+
+    def RETURN(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 0)
+        if len(group.callStack) == 0:
+            raise Scalar()
+        group.jumpAfter(group.callStack.pop(), self.orderIndexes)
+        if group.tailFrames:
+            group.leaveTailCalls()
+
+    def PUSHS(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 1)
+        argument = instruction.getArgument(1)
+        if argument.getXmlType() == "var":
+            frame, name = self.getTarget(group, argument)
+            column = frame[name]
+            if column.type not in jit.canonicalTypes:
+                raise Scalar()
+            group.dataStack.append(column)
+            return
+        # Constant is pushed as it was parsed, its value does not have to be converted yet
+        symbol = argument.getData()
+        if symbol.getType() not in jit.canonicalTypes:
+            raise Scalar()
+        value = symbol.getValue()
+        canonical = type(value) is jit.canonicalTypes[symbol.getType()]
+        values = columnValues(symbol.getType(), value, group.size()) if canonical else asObject(value, group.size())
+        group.dataStack.append(Column(symbol.getType(), values, canonical))
+
+    def POPS(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 1)
+        if len(group.dataStack) == 0:
+            raise Scalar()
+        frame, name = self.getTarget(group, instruction.getArgument(1))
+        frame[name] = group.dataStack.pop()
+
+    def ADD(self, group, instruction:parse.XMLInstruction):
+        frame, name, value1, value2 = self.getIntegers(group, instruction, smallInt)
+        frame[name] = Column("int", columnValues("int", value1 + value2, group.size()))
+
+    def SUB(self, group, instruction:parse.XMLInstruction):
+        frame, name, value1, value2 = self.getIntegers(group, instruction, smallInt)
+        frame[name] = Column("int", columnValues("int", value1 - value2, group.size()))
+
+    def MUL(self, group, instruction:parse.XMLInstruction):
+        frame, name, value1, value2 = self.getIntegers(group, instruction, smallFactor)
+        frame[name] = Column("int", columnValues("int", value1 * value2, group.size()))
+
+    def IDIV(self, group, instruction:parse.XMLInstruction):
+        frame, name, value1, value2 = self.getIntegers(group, instruction, smallInt)
+        zero = value2 == 0
+        if isinstance(zero, numpy.ndarray) and zero.any() or zero is True:
+            raise Scalar(zero if isinstance(zero, numpy.ndarray) else None)
+        frame[name] = Column("int", columnValues("int", value1 // value2, group.size()))
+
+    # Return label order or target and operands of comparison, types are checked as by Executor
+    def getCompared(self, group, instruction:parse.XMLInstruction, types, mixNil, jump=False):
+        self.expect(instruction, 3)
+        first = instruction.getArgument(1)
+        target = self.getLabel(first) if jump else self.getTarget(group, first)
+        type1, value1 = self.getOperand(group, instruction.getArgument(2), types)
+        type2, value2 = self.getOperand(group, instruction.getArgument(3), types)
+        if type1 != type2 and not (mixNil and "nil" in (type1, type2)):
+            raise Scalar()
+        if type1 != type2 or type1 in ("string", "nil") or not isSmall(value1, smallInt) or not isSmall(value2, smallInt):
+            value1 = asObject(value1, group.size())
+            value2 = asObject(value2, group.size())
+        return target, value1, value2
+
+    def LT(self, group, instruction:parse.XMLInstruction):
+        (frame, name), value1, value2 = self.getCompared(group, instruction, ("int", "string", "bool"), False)
+        frame[name] = Column("bool", boolValues(value1 < value2, group.size()))
+
+    def GT(self, group, instruction:parse.XMLInstruction):
+        (frame, name), value1, value2 = self.getCompared(group, instruction, ("int", "string", "bool"), False)
+        frame[name] = Column("bool", boolValues(value1 > value2, group.size()))
+
+    def EQ(self, group, instruction:parse.XMLInstruction):
+        (frame, name), value1, value2 = self.getCompared(group, instruction, jit.canonicalTypes, True)
+        frame[name] = Column("bool", boolValues(value1 == value2, group.size()))
+
+    def AND(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 3)
+        frame, name = self.getTarget(group, instruction.getArgument(1))
+        value1 = self.getOperand(group, instruction.getArgument(2), ("bool",))[1]
+        value2 = self.getOperand(group, instruction.getArgument(3), ("bool",))[1]
+        frame[name] = Column("bool", columnValues("bool", value1 & value2, group.size()))
+
+    def OR(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 3)
+        frame, name = self.getTarget(group, instruction.getArgument(1))
+        value1 = self.getOperand(group, instruction.getArgument(2), ("bool",))[1]
+        value2 = self.getOperand(group, instruction.getArgument(3), ("bool",))[1]
+        frame[name] = Column("bool", columnValues("bool", value1 | value2, group.size()))
+
+    def NOT(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 2)
+        frame, name = self.getTarget(group, instruction.getArgument(1))
+        value = self.getOperand(group, instruction.getArgument(2), ("bool",))[1]
+        frame[name] = Column("bool", columnValues("bool", 1 - value, group.size()))
+
+    def CONCAT(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 3)
+        frame, name = self.getTarget(group, instruction.getArgument(1))
+        value1 = self.getOperand(group, instruction.getArgument(2), ("string",))[1]
+        value2 = self.getOperand(group, instruction.getArgument(3), ("string",))[1]
+        frame[name] = Column("string", asObject(value1, group.size()) + asObject(value2, group.size()))
+
+    def STRLEN(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 2)
+        frame, name = self.getTarget(group, instruction.getArgument(1))
+        value = asObject(self.getOperand(group, instruction.getArgument(2), ("string",))[1], group.size())
+        frame[name] = Column("int", numpy.fromiter(map(len, value), dtype=numpy.int64, count=len(value)))
+
+    def TYPE(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 2)
+        frame, name = self.getTarget(group, instruction.getArgument(1))
+        argument = instruction.getArgument(2)
+        if argument.getXmlType() == "var":
+            sourceFrame, sourceName = self.getTarget(group, argument)
+            type = sourceFrame[sourceName].type
+        else:
+            type = argument.getXmlType()
+        frame[name] = Column("string", asObject(type if type is not None else "", group.size()))
+
+    # Read line of input of every instance, group is split if some values can not be converted
+    def READ(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 2)
+        self.getTarget(group, instruction.getArgument(1))
+        argument = instruction.getArgument(2)
+        if argument.getXmlType() != "type" or argument.getData().getValue() not in ("int", "string", "bool"):
+            raise Scalar()
+        type = argument.getData().getValue()
+
+        values = []
+        valid = numpy.ones(group.size(), dtype=bool)
+        for position, instance in enumerate(group.instances.tolist()):
+            value = self.runner.inputs[instance].readline().strip()
+            if type == "bool":
+                value = 1 if value.lower() == "true" else 0
+            elif type == "int":
+                try:
+                    value = int(value)
+                except ValueError:
+                    # Executor reports failed conversion even though it reads nil
+                    self.runner.errors[instance].append("ERR: Invalid value in instruction.")
+                    valid[position] = False
+                    value = 0
+            values.append(value)
+
+        values = intArray(values) if type != "string" else objectArray(values)
+        if valid.all():
+            self.assign(group, instruction.getArgument(1), Column(type, values))
+            return None
+        parts = []
+        if valid.any():
+            parts.append(group.select(valid))
+            self.assign(parts[-1], instruction.getArgument(1), Column(type, values[valid]))
+        parts.append(group.select(~valid))
+        self.assign(parts[-1], instruction.getArgument(1), Column("nil", asObject("nil", parts[-1].size())))
+        return parts
+
+    def assign(self, group, argument:parse.XMLArgument, column:Column):
+        frame, name = self.getTarget(group, argument)
+        frame[name] = column
+
+    def WRITE(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 1)
+        type, value = self.getOperand(group, instruction.getArgument(1), jit.canonicalTypes)
+        outputs = self.runner.outputs
+        if not isinstance(value, numpy.ndarray):
+            text = self.runner.converter.convertToWriteType(value, type)
+            if len(text) != 0:
+                for instance in group.instances.tolist():
+                    outputs[instance].append(text)
+            return
+        if type == "nil":
+            return
+        if type == "bool":
+            texts = numpy.where(value == 1, "true", "false").tolist()
+        elif type == "int":
+            texts = map(str, value.tolist())
+        else:
+            texts = value.tolist()
+        for instance, text in zip(group.instances.tolist(), texts):
+            outputs[instance].append(text)
+
+    def LABEL(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 1)
+
+    def JUMP(self, group, instruction:parse.XMLInstruction):
+        self.expect(instruction, 1)
+        group.jumpAfter(self.getLabel(instruction.getArgument(1)), self.orderIndexes)
+
+    def JUMPIFEQ(self, group, instruction:parse.XMLInstruction):
+        labelOrder, value1, value2 = self.getCompared(group, instruction, jit.canonicalTypes, True, True)
+        return self.branch(group, labelOrder, value1 == value2)
+
+    def JUMPIFNEQ(self, group, instruction:parse.XMLInstruction):
+        labelOrder, value1, value2 = self.getCompared(group, instruction, jit.canonicalTypes, True, True)
+        return self.branch(group, labelOrder, value1 != value2)
+
+    # Jump with instances selected by mask, group is split if they do not agree
+    def branch(self, group, labelOrder, taken):
+        if not isinstance(taken, numpy.ndarray):
+            taken = numpy.full(group.size(), bool(taken))
+        if taken.all():
+            group.jumpAfter(labelOrder, self.orderIndexes)
+            return None
+        if not taken.any():
+            return None
+        jumped = group.select(taken)
+        jumped.jumpAfter(labelOrder, self.orderIndexes)
+        return [jumped, group.select(~taken)]
+
+class LockstepRunner:
+    def __init__(self, interpret, program:parse.XMLElements):
+        self.interpret = interpret
+        self.program = program
+        self.inputs = []
+        self.outputs = []
+        self.errors = []
+        self.codes = []
+        self.labels = {}
+        self.orderList = []
+        self.orderIndexes = {}
+        self.maxOrder = None
+        # Converts values for output the same way as scalar execution
+        self.converter = interpreter.Executor()
+        self.vector = None
+
+    # Run program for every input file listed in file, write outputs next to inputs and print exit codes
+    def run(self, listFile):
+        try:
+            with open(listFile, "r", encoding="utf-8") as file:
+                paths = [line.rstrip("\n") for line in file if line.strip() != ""]
+        except IOError:
+            sys.stderr.write("ERR: Cannot read list of input files.")
+            exit(error.wrongInputFile)
+        self.execute(self.openInputs(paths))
+
+        for path, code, output, errors in zip(paths, self.codes, self.outputs, self.errors):
+            try:
+                with open(path + ".out", "w", encoding="utf-8") as file:
+                    file.write("".join(output))
+                with open(path + ".err", "w", encoding="utf-8") as file:
+                    file.write("".join(errors))
+            except IOError:
+                sys.stderr.write(f"ERR: Cannot write output of {path}.")
+                exit(error.wrongOutputFile)
+            print(code, path)
+
+    # Read inputs, return instances which can run
+    def openInputs(self, paths) -> list:
+        instances = []
+        for path in paths:
+            self.outputs.append([])
+            self.errors.append([])
+            self.codes.append(None)
+            try:
+                with open(path, "r") as file:
+                    self.inputs.append(io.StringIO(file.read(), newline="\n"))
+                instances.append(len(self.inputs) - 1)
+            except IOError:
+                self.inputs.append(None)
+                self.errors[-1].append("ERR: File does not appear to exist.")
+                self.codes[-1] = error.wrongInputFile
+        return instances
+
+    # Execute program for given instances, vectorized unless scalar execution is requested
+    def execute(self, instances, vectorize=True):
+        instructions = self.program.getInstructions()
+        if len(instructions) == 0:
+            for instance in instances:
+                self.codes[instance] = error.ok
+            return
+        self.maxOrder = max(instructions)
+        self.orderList = sorted(instructions.keys())
+        self.orderIndexes = {order: index for index, order in enumerate(self.orderList)}
+        self.interpret.program = self.program
+        self.interpret.orderList = self.orderList
+        self.interpret.orderIndexes = self.orderIndexes
+
+        # Label errors end every instance before it starts
+        executor = interpreter.Executor()
+        executor.labels = self.labels
+        messages = io.StringIO()
+        try:
+            with contextlib.redirect_stderr(messages):
+                for key, instruction in self.program.getLabelInstructions():
+                    self.interpret.registerLabel(executor, key, instruction)
+        except SystemExit as e:
+            for instance in instances:
+                self.errors[instance].append(messages.getvalue())
+                self.codes[instance] = exitCode(e)
+            return
+
+        if len(instances) == 0:
+            return
+        group = Group(numpy.array(instances, dtype=numpy.int64), numpy.zeros(len(instances), dtype=numpy.int64))
+        if not vectorize:
+            self.runScalar(group)
+            return
+        self.vector = VectorExecutor(self)
+        running = [group]
+        waiting = []
+        while len(running) != 0 or len(waiting) != 0:
+            if len(running) == 0:
+                running = self.mergeWaiting(waiting)
+                waiting = []
+            self.advance(running.pop(), len(running) + len(waiting) != 0, running, waiting)
+
+    # Merge waiting groups which are at the same place with the same variables
+    def mergeWaiting(self, waiting) -> list:
+        similar = {}
+        for group in waiting:
+            similar.setdefault(group.signature(), []).append(group)
+        return [mergeGroups(groups) for groups in similar.values()]
+
+    # Execute group until it ends, splits or waits before conditional jump while other groups exist
+    def advance(self, group, others, running, waiting):
+        orderList = self.orderList
+        program = self.program
+        maxOrder = self.maxOrder
+        vector = self.vector
+        resumed = True
+        while group.order != maxOrder:
+            if group.orderIndex >= len(orderList):
+                # Jump past end of program fails in Executor
+                self.runScalar(group)
+                return
+            order = orderList[group.orderIndex]
+            instruction = program.getInstruction(order)
+            opcode = instruction.getOpcode()
+            if opcode in branchOps and others and not resumed:
+                waiting.append(group)
+                return
+            resumed = False
+
+            previous = group.order
+            group.order = order
+            try:
+                handler = getattr(vector, opcode, None)
+                if handler is None or not opcode.isupper():
+                    raise Scalar()
+                parts = handler(group, instruction)
+            except Scalar as e:
+                group.order = previous
+                if e.mask is None or e.mask.all():
+                    self.runScalar(group)
+                    return
+                self.runScalar(group.select(e.mask))
+                group = group.select(~e.mask)
+                resumed = True
+                continue
+
+            if parts is not None:
+                for part in parts:
+                    part.orderIndex += 1
+                    part.executed += 1
+                    if part.order == maxOrder:
+                        self.finish(part)
+                    else:
+                        running.append(part)
+                return
+            group.orderIndex += 1
+            group.executed += 1
+        self.finish(group)
+
+    def finish(self, group):
+        for instance in group.instances.tolist():
+            self.codes[instance] = error.ok
+
+    # Continue every instance of group by scalar Executor until it ends
+    def runScalar(self, group):
+        for position, instance in enumerate(group.instances.tolist()):
+            interpret = interpreter.Interpret()
+            interpret.program = self.program
+            interpret.orderList = self.orderList
+            interpret.orderIndexes = self.orderIndexes
+            interpret.tailCalls = self.interpret.tailCalls
+            interpret.order = group.order
+            interpret.orderIndex = group.orderIndex
+            interpret.instructionCount = int(group.counts[position]) + group.executed
+            interpret.inputFile = self.inputs[instance]
+            executor = self.createExecutor(group, position)
+
+            stdout = io.StringIO()
+            stderr = io.StringIO()
+            code = error.ok
+            interpreter.interpret = interpret
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    interpret.executeFrom(executor, self.program, self.maxOrder)
+                except SystemExit as e:
+                    code = exitCode(e)
+                except Exception:
+                    traceback.print_exc()
+                    code = 1
+            self.outputs[instance].append(stdout.getvalue())
+            self.errors[instance].append(stderr.getvalue())
+            self.codes[instance] = code
+
+    # Create executor with state of instance at given position in group
+    def createExecutor(self, group, position) -> interpreter.Executor:
+        executor = interpreter.Executor()
+        executor.labels = self.labels
+        executor.callStack = interpreter.Stack()
+        executor.callStack.stack = list(group.callStack)
+        executor.tailFrames = [list(run) for run in group.tailFrames]
+        executor.tailFrameCount = group.tailFrameCount
+        executor.dataStack = interpreter.Stack()
+        for column in group.dataStack:
+            executor.dataStack.push(createVariable("", column, position))
+        executor.globalFrame = createFrame(interpreter.Frame.GF, group.globalFrame, position)
+        for frame in group.localFrames:
+            executor.localFrameStack.push(createFrame(interpreter.Frame.LF, frame, position))
+        if group.tempFrame is not None:
+            executor.tempFrame = createFrame(interpreter.Frame.TF, group.tempFrame, position)
+        return executor
+
+def createFrame(frameType, columns, position) -> interpreter.Frame:
+    frame = interpreter.Frame(frameType)
+    for name, column in columns.items():
+        frame.variables[name] = createVariable(name, column, position)
+    return frame
+
+def createVariable(name, column, position) -> parse.Variable:
+    variable = parse.Variable(name, column.type)
+    if column.values is not None:
+        value = column.values[position]
+        variable.setValue(value.item() if isinstance(value, numpy.generic) else value)
+    return variable
+
+def exitCode(e:SystemExit) -> int:
+    if e.code is None:
+        return error.ok
+    return e.code if isinstance(e.code, int) else 1
+
+# Run program for every input listed in file, tracing, limits and JIT are not used
+def run(interpret, program:parse.XMLElements, listFile):
+    if numpy is None:
+        sys.stderr.write("ERR: Option --lockstep requires NumPy.")
+        exit(error.wrongArguments)
+    LockstepRunner(interpret, program).run(listFile)
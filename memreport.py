@@ -0,0 +1,133 @@
+import heapq
+import sys
+import time
+import error
+import parse
+
+# Instructions between samples
+defaultInterval = 10000
+
+# Timeline keeps at most this many samples, older ones are thinned out
+maxSamples = 1000
+
+# Largest variables kept in each sample
+topVariables = 5
+
+# Approximate memory of values, sampled every interval instructions
+class MemoryReport:
+    def __init__(self, fileName, interval=defaultInterval):
+        self.fileName = fileName
+        self.interval = interval
+        # First instruction is sampled, so there is a sample to compare the end with
+        self.countdown = 1
+        self.samples = []
+        self.sampleCount = 0
+        self.keepEvery = 1
+        self.peak = None
+        self.interpret = None
+        self.executor = None
+        self.start = time.perf_counter()
+
+    # Count instructions when executed together with other observers
+    def beforeInstruction(self, interpret, executor, instruction:parse.XMLInstruction):
+        self.countdown -= 1
+        if self.countdown == 0:
+            self.countdown = self.interval
+            self.sample(interpret, executor)
+
+    # Record sizes of frames and stacks
+    def sample(self, interpret, executor):
+        self.interpret = interpret
+        self.executor = executor
+        sample = MemorySample(interpret.getInstructionCount(), time.perf_counter() - self.start, executor)
+        # Sizes of every local frame are kept only for peak
+        if self.peak is None or sample.total >= self.peak.total:
+            if self.peak is not None:
+                self.peak.levels = None
+            self.peak = sample
+        else:
+            sample.levels = None
+
+        # Thin out timeline by half when it is full, every sample still counts for peak
+        if self.sampleCount % self.keepEvery == 0:
+            self.samples.append(sample)
+            if len(self.samples) > maxSamples:
+                self.samples = self.samples[::2]
+                self.keepEvery *= 2
+        self.sampleCount += 1
+
+    # Take last sample and write report
+    def close(self):
+        if self.executor is not None:
+            self.sample(self.interpret, self.executor)
+        try:
+            with open(self.fileName, "w", encoding="utf-8") as file:
+                self.write(file)
+        except IOError:
+            sys.stderr.write("ERR: Cannot write memory report.")
+            exit(error.wrongOutputFile)
+
+    def write(self, file):
+        print(f"Memory report: sample every {self.interval} instructions, {self.sampleCount} samples, "
+              f"timeline keeps every {self.keepEvery}. sample", file=file)
+        print("Sizes are approximate bytes of values, names and containers are not counted, shared values are counted "
+              "in every variable.", file=file)
+        print("\nTimeline:", file=file)
+        print(f"{'instructions':>14} {'seconds':>9} {'GF':>12} {'LF':>12} {'LF depth':>9} {'TF':>12} "
+              f"{'data stack':>12} {'call stack':>12} {'total':>12}  largest variable", file=file)
+        for sample in self.samples:
+            print(f"{sample.instructions:>14} {sample.seconds:>9.3f} {sample.globalSize:>12} {sample.localSize:>12} "
+                  f"{sample.localDepth:>9} {sample.tempSize:>12} {sample.dataSize:>12} {sample.callSize:>12} "
+                  f"{sample.total:>12}  {sample.largest[0][1] if len(sample.largest) != 0 else '-'}", file=file)
+
+        peak = self.peak
+        if peak is None:
+            return
+        print(f"\nPeak at instruction {peak.instructions} ({peak.seconds:.3f} s): {peak.total} bytes", file=file)
+        print(f"  GF          {peak.globalSize:>12}", file=file)
+        print(f"  TF          {peak.tempSize:>12}", file=file)
+        print(f"  LF          {peak.localSize:>12} in {peak.localDepth} frames", file=file)
+        for level, size in sorted(enumerate(peak.levels), key=lambda item: -item[1])[:topVariables]:
+            print(f"    level {level:<6}{size:>12}", file=file)
+        print(f"  data stack  {peak.dataSize:>12} in {peak.dataCount} values", file=file)
+        print(f"  call stack  {peak.callSize:>12} in {peak.callDepth} calls", file=file)
+        print("  Largest variables:", file=file)
+        for size, name in peak.largest:
+            print(f"    {name:<30}{size:>12}", file=file)
+
+class MemorySample:
+    def __init__(self, instructions, seconds, executor):
+        self.instructions = instructions
+        self.seconds = seconds
+        variables = []
+
+        self.globalSize = frameSize(executor.globalFrame, "GF", variables)
+        self.tempSize = frameSize(executor.tempFrame, "TF", variables)
+        frames = executor.localFrameStack.stack
+        self.levels = [frameSize(frame, f"LF[{level}]", variables) for level, frame in enumerate(frames)]
+        self.localSize = sum(self.levels)
+        self.localDepth = len(frames)
+
+        data = executor.dataStack.stack
+        self.dataSize = sum(valueSize(item.getValue()) for item in data)
+        self.dataCount = len(data)
+        calls = executor.callStack.stack
+        self.callSize = sum(map(sys.getsizeof, calls))
+        self.callDepth = executor.getCallDepth()
+
+        self.total = self.globalSize + self.tempSize + self.localSize + self.dataSize + self.callSize
+        self.largest = heapq.nlargest(topVariables, variables)
+
+# Sum of value sizes in frame, (size, name) of each variable is added to variables
+def frameSize(frame, prefix, variables) -> int:
+    if frame is None:
+        return 0
+    total = 0
+    for name, variable in frame.variables.items():
+        size = valueSize(variable.getValue())
+        variables.append((size, f"{prefix}@{name}"))
+        total += size
+    return total
+
+def valueSize(value) -> int:
+    return 0 if value is None else sys.getsizeof(value)
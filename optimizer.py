@@ -0,0 +1,280 @@
+import sys
+import ippcode
+import jit
+import parse
+
+# Optimization pass over loaded program
+#
+# Within basic blocks variables with known constant values are replaced by constants, copies made by MOVE
+# are replaced by their sources and instructions with constant operands are folded into MOVE. Assignments
+# which are never read are removed. Instruction is changed only if it can not fail, or if it would fail
+# the same way after the change, so error codes and messages stay the same.
+
+# Opcodes which write result into variable in first argument without reading it
+writers = {"MOVE", "ADD", "SUB", "MUL", "IDIV", "LT", "GT", "EQ", "AND", "OR", "NOT", "INT2CHAR",
+           "STRI2INT", "CONCAT", "STRLEN", "GETCHAR", "TYPE", "READ", "POPS"}
+
+# Opcodes changing local or temporary frame
+frameOps = {"CREATEFRAME", "PUSHFRAME", "POPFRAME"}
+
+# Opcodes after which execution may continue elsewhere
+controlOps = {"JUMP", "JUMPIFEQ", "JUMPIFNEQ", "CALL", "RETURN", "EXIT", "LABEL", "BREAK"}
+
+class Optimizer:
+    def __init__(self, program:parse.XMLElements):
+        self.program = program
+        self.folded = 0
+        self.propagated = 0
+        self.removed = 0
+        self.blocks = []
+        self.candidates = set()
+        # Knowledge about variables valid at current instruction, keys are (frame, name)
+        self.knownValues = {}
+        self.copySources = {}
+        self.defined = set()
+        # Global variables defined in first block, it is executed before any other block
+        self.globals = set()
+
+    # Return optimized copy of program
+    def run(self) -> parse.XMLElements:
+        instructions = self.program.getInstructions()
+        orders = sorted(instructions.keys())
+        program = [self.program.getInstruction(order) for order in orders]
+        opcodes = {instruction.getOpcode() for instruction in program}
+        # Values taken from data stack may be stored in other form than in variables, copies are not safe then
+        self.copies = "POPS" not in opcodes
+
+        self.findBlocks(program)
+        program = [self.rewrite(index, instruction) for index, instruction in enumerate(program)]
+        # BREAK prints instruction count, instructions can not be removed then
+        if "BREAK" not in opcodes:
+            program = self.removeDead(program)
+
+        result = parse.XMLElements()
+        for instruction in program:
+            result.appendInstruction(instruction)
+        return result
+
+    # Number basic blocks, jumps continue after instruction following label and returns after instruction following call
+    def findBlocks(self, program):
+        block = 0
+        opcodes = [instruction.getOpcode() if self.isWellFormed(instruction) else None for instruction in program]
+        for index, opcode in enumerate(opcodes):
+            previous = opcodes[index - 1] if index > 0 else "LABEL"
+            beforePrevious = opcodes[index - 2] if index > 1 else None
+            if opcode in ("LABEL", None) or previous in controlOps or previous is None or beforePrevious in ("LABEL", "CALL"):
+                block += 1
+            self.blocks.append(block)
+
+    # Check if instruction has expected operands, other instructions are left as they are
+    def isWellFormed(self, instruction:parse.XMLInstruction) -> bool:
+        expected = ippcode.operands.get(instruction.getOpcode())
+        if expected is None or instruction.getArgumentsKeys() != tuple(range(1, len(expected) + 1)):
+            return False
+        for kind, key in zip(expected, instruction.getArgumentsKeys()):
+            xmlType = instruction.getArgument(key).getXmlType()
+            if kind == "var" and xmlType != "var" or kind == "label" and xmlType != "label":
+                return False
+        return True
+
+    def forget(self):
+        self.knownValues.clear()
+        self.copySources.clear()
+        self.defined.clear()
+
+    # Forget variables of local and temporary frame
+    def forgetFrames(self):
+        self.knownValues = {key: value for key, value in self.knownValues.items() if key[0] == "GF"}
+        self.copySources = {key: source for key, source in self.copySources.items() if key[0] == "GF" and source[0] == "GF"}
+        self.defined = {key for key in self.defined if key[0] == "GF"}
+
+    # Variable got unknown value
+    def forgetVariable(self, key):
+        self.knownValues.pop(key, None)
+        self.copySources.pop(key, None)
+        for copy in [copy for copy, source in self.copySources.items() if source == key]:
+            del self.copySources[copy]
+
+    def rewrite(self, index, instruction:parse.XMLInstruction) -> parse.XMLInstruction:
+        if index == 0 or self.blocks[index] != self.blocks[index - 1]:
+            self.forget()
+        if not self.isWellFormed(instruction):
+            return instruction
+
+        opcode = instruction.getOpcode()
+        arguments = [instruction.getArgument(key) for key in instruction.getArgumentsKeys()]
+        changed = False
+        for position, kind in enumerate(ippcode.operands[opcode]):
+            if kind == "symb":
+                argument = self.propagate(arguments[position])
+                changed = changed or argument is not arguments[position]
+                arguments[position] = argument
+        if changed:
+            instruction = makeInstruction(opcode, instruction.getOrder(), arguments)
+
+        result = self.fold(opcode, arguments)
+        if result is not None:
+            self.folded += 1
+            arguments = [arguments[0], parse.makeSymbolArgument(2, result[0], result[1])]
+            instruction = makeInstruction("MOVE", instruction.getOrder(), arguments)
+            opcode = "MOVE"
+
+        self.update(index, opcode, arguments)
+        return instruction
+
+    # Replace read of variable by its known value or by source of its copy
+    def propagate(self, argument:parse.XMLArgument) -> parse.XMLArgument:
+        if argument.getXmlType() != "var":
+            return argument
+        key = variableKey(argument)
+        if key in self.knownValues:
+            self.propagated += 1
+            type, value = self.knownValues[key]
+            return parse.makeSymbolArgument(argument.getArgNumber(), type, value)
+        if key in self.copySources:
+            self.propagated += 1
+            frameName, name = self.copySources[key]
+            return parse.makeVariableArgument(argument.getArgNumber(), frameName, name)
+        return argument
+
+    # Evaluate instruction with constant operands, return (type, value) or None if it can not be folded
+    def fold(self, opcode, arguments):
+        if opcode not in writers or opcode in ("MOVE", "READ", "POPS"):
+            return None
+        operands = []
+        for argument in arguments[1:]:
+            value = constantOperand(argument)
+            if value is None:
+                return None
+            operands.append(value)
+
+        if opcode == "TYPE":
+            return "string", operands[0][0]
+        if opcode == "NOT":
+            return ("bool", 1 if not operands[0][1] else 0) if operands[0][0] == "bool" else None
+        if opcode == "STRLEN":
+            return ("int", len(operands[0][1])) if operands[0][0] == "string" else None
+        if opcode == "INT2CHAR":
+            if operands[0][0] != "int" or not 0 <= operands[0][1] <= sys.maxunicode:
+                return None
+            return "string", chr(operands[0][1])
+
+        (type1, value1), (type2, value2) = operands
+        if opcode in ("ADD", "SUB", "MUL", "IDIV"):
+            if type1 != "int" or type2 != "int" or opcode == "IDIV" and value2 == 0:
+                return None
+            if opcode == "ADD":
+                return "int", value1 + value2
+            if opcode == "SUB":
+                return "int", value1 - value2
+            if opcode == "MUL":
+                return "int", value1 * value2
+            return "int", value1 // value2
+        if opcode in ("LT", "GT"):
+            if type1 != type2 or type1 not in ("int", "string", "bool"):
+                return None
+            return "bool", 1 if (value1 < value2 if opcode == "LT" else value1 > value2) else 0
+        if opcode == "EQ":
+            if type1 != type2 and type1 != "nil" and type2 != "nil":
+                return None
+            return "bool", 1 if value1 == value2 else 0
+        if opcode in ("AND", "OR"):
+            if type1 != "bool" or type2 != "bool":
+                return None
+            return "bool", 1 if (value1 and value2 if opcode == "AND" else value1 or value2) else 0
+        if opcode == "CONCAT":
+            return ("string", value1 + value2) if type1 == "string" and type2 == "string" else None
+        if opcode in ("STRI2INT", "GETCHAR"):
+            if type1 != "string" or type2 != "int" or not 0 <= value2 < len(value1):
+                return None
+            return ("int", ord(value1[value2])) if opcode == "STRI2INT" else ("string", value1[value2])
+        return None
+
+    # Update knowledge about variables after instruction
+    def update(self, index, opcode, arguments):
+        if opcode in frameOps:
+            self.forgetFrames()
+            return
+        if opcode not in writers and opcode not in ("DEFVAR", "SETCHAR"):
+            return
+
+        key = variableKey(arguments[0])
+        value = constantOperand(arguments[1]) if opcode == "MOVE" else None
+        # Removing assignment is safe only if target surely exists and value can not fail
+        inFirstBlock = self.blocks[index] == self.blocks[0]
+        if opcode == "MOVE" and value is not None and (key in self.defined or not inFirstBlock and key in self.globals):
+            self.candidates.add(index)
+        if opcode == "DEFVAR" and inFirstBlock and key[0] == "GF":
+            self.globals.add(key)
+        self.forgetVariable(key)
+        self.defined.add(key)
+        if value is not None:
+            self.knownValues[key] = value
+        elif opcode == "MOVE" and self.copies and arguments[1].getXmlType() == "var":
+            source = variableKey(arguments[1])
+            if source != key:
+                self.copySources[key] = source
+
+    # Remove candidate assignments whose value is never read
+    def removeDead(self, program) -> list:
+        readNames = set()
+        for instruction in program:
+            readNames.update(key[1] for key in readVariables(instruction))
+
+        kept = []
+        for index, instruction in enumerate(program):
+            if index in self.candidates and self.isRemovable(program, index, readNames):
+                self.removed += 1
+                continue
+            kept.append(instruction)
+        return kept
+
+    def isRemovable(self, program, index, readNames) -> bool:
+        # Instructions following label or call are skipped after jump or return, last one ends program
+        if index == len(program) - 1 or index > 0 and program[index - 1].getOpcode() in ("LABEL", "CALL"):
+            return False
+        key = variableKey(program[index].getArgument(1))
+        if key[1] not in readNames:
+            return True
+
+        # Value is overwritten in the same block before it is read
+        for next in range(index + 1, len(program)):
+            instruction = program[next]
+            if self.blocks[next] != self.blocks[index] or instruction.getOpcode() in frameOps:
+                return False
+            if key[1] in (read[1] for read in readVariables(instruction)):
+                return False
+            if instruction.getOpcode() in writers and variableKey(instruction.getArgument(1)) == key:
+                return True
+        return False
+
+    def report(self):
+        sys.stderr.write(f"Optimizer: {self.folded} instructions folded, {self.propagated} operands propagated, "
+                         f"{self.removed} instructions removed.\n")
+
+def variableKey(argument:parse.XMLArgument) -> tuple:
+    data = argument.getData()
+    return data.getFrameName(), data.getName()
+
+# Return (type, value) of constant argument converted as by executor, None if it is not valid constant
+def constantOperand(argument:parse.XMLArgument):
+    if argument.getXmlType() not in jit.canonicalTypes:
+        return None
+    converted, value = jit.constantValue(argument.getData())
+    if not converted:
+        return None
+    return argument.getXmlType(), value
+
+# Variables read by instruction, every variable operand of unknown instruction is considered read
+def readVariables(instruction:parse.XMLInstruction) -> list:
+    keys = instruction.getArgumentsKeys()
+    opcode = instruction.getOpcode()
+    skipTarget = (opcode in writers or opcode == "DEFVAR") and len(keys) != 0 and keys[0] == 1
+    return [variableKey(instruction.getArgument(key)) for key in keys
+            if instruction.getArgument(key).getXmlType() == "var" and not (skipTarget and key == 1)]
+
+def makeInstruction(opcode, order, arguments) -> parse.XMLInstruction:
+    instruction = parse.XMLInstruction({"opcode": opcode, "order": order})
+    for argument in arguments:
+        instruction.appendArgument(argument)
+    return instruction
@@ -0,0 +1,157 @@
+import io
+import itertools
+import mmap
+import os
+import re
+import sys
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+import binprog
+import error
+import parse
+
+# Smaller sources are parsed sequentially, starting worker processes would cost more
+minimumSize = 1 << 20
+
+# Chunks per worker, more chunks balance the load better
+chunksPerWorker = 4
+
+instructionStart = b"<instruction"
+instructionEnd = b"</instruction>"
+chunkHeader = b'<program language="IPPcode23">'
+chunkFooter = b"</program>"
+encodingPattern = re.compile(rb"""encoding\s*=\s*["']([A-Za-z0-9._-]+)["']""")
+
+# Load XML program (stdin if fileName is None) parsing parts of it in worker processes
+# Workers return chunks in binary program format, instructions are decoded on first use
+# Any problem in parallel parsing falls back to sequential parser, so errors are the same
+def load(fileName, workers) -> parse.XMLElements:
+    source = openSource(fileName)
+    bounds = splitSource(source, workers * chunksPerWorker)
+    if bounds is None or workers == 1:
+        return parseSequential(fileName, source)
+
+    with ProcessPoolExecutor(workers) as pool:
+        if fileName is not None:
+            futures = [pool.submit(parseFileChunk, fileName, start, end) for start, end in bounds]
+        else:
+            futures = [pool.submit(parseChunk, bytes(source[start:end])) for start, end in bounds]
+        chunks = [future.result() for future in futures]
+
+    if any(chunk is None for chunk in chunks):
+        return parseSequential(fileName, source)
+    return ChunkedElements(chunks)
+
+# Return memory mapped source file or bytes read from stdin
+def openSource(fileName):
+    if fileName is None:
+        return sys.stdin.buffer.read()
+    try:
+        with open(fileName, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except IOError:
+        sys.stderr.write("ERR: File does not appear to exist.")
+        exit(error.wrongInputFile)
+
+def parseSequential(fileName, source) -> parse.XMLElements:
+    if fileName is None:
+        parser = parse.Parser(None)
+        parser.sourceFile = io.BytesIO(source)
+        return parser.run()
+    return parse.Parser(fileName).run()
+
+# Split instructions of source into chunks ending at instruction boundaries
+# Return list of (start, end) or None if source should be parsed sequentially
+def splitSource(source, count):
+    if len(source) < minimumSize:
+        return None
+    first = source.find(instructionStart)
+    last = source.rfind(instructionEnd)
+    if first == -1 or last == -1 or last < first:
+        return None
+
+    # Document header and footer have to form valid program on their own
+    last += len(instructionEnd)
+    header = bytes(source[:first])
+    footer = bytes(source[last:])
+    if not isUtf8(header) or parseChunk(header + footer, False) is None:
+        return None
+
+    bounds = []
+    size = max(1, (last - first) // count)
+    start = first
+    while start < last:
+        end = source.find(instructionEnd, min(start + size, last - len(instructionEnd)))
+        end = last if end == -1 else end + len(instructionEnd)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+# Check that declared encoding of document is compatible with UTF-8 chunks
+def isUtf8(header:bytes) -> bool:
+    if header.startswith((b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")):
+        return False
+    match = encodingPattern.search(header)
+    return match is None or match.group(1).lower() in (b"utf-8", b"utf8", b"us-ascii", b"ascii")
+
+def parseFileChunk(fileName, start, end):
+    with open(fileName, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as source:
+            return parseChunk(source[start:end])
+
+# Parse chunk of instructions into binary program, None if parser reports any error
+def parseChunk(chunk:bytes, wrap=True):
+    parser = parse.Parser(None)
+    parser.sourceFile = io.BytesIO(chunkHeader + chunk + chunkFooter if wrap else chunk)
+    stderr = sys.stderr
+    sys.stderr = io.StringIO()
+    try:
+        program = parser.run()
+    except (SystemExit, Exception):
+        return None
+    finally:
+        sys.stderr = stderr
+    return binprog.Encoder().encode(program)
+
+class ChunkInstructions(Mapping):
+    def __init__(self, program):
+        self.program = program
+
+    def __getitem__(self, order):
+        return self.program.getInstruction(order)
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(chunk.orders for chunk in self.program.chunks)
+
+    def __len__(self):
+        return len(self.program.chunkOf)
+
+class ChunkedElements(parse.XMLElements):
+    def __init__(self, chunks):
+        self.elements = {}
+        self.chunks = [binprog.BinaryElements(chunk) for chunk in chunks]
+        self.chunkOf = {}
+        for index, chunk in enumerate(self.chunks):
+            self.chunkOf.update(dict.fromkeys(chunk.orders, index))
+        if len(self.chunkOf) != sum(len(chunk.orders) for chunk in self.chunks):
+            self.duplicateOrder()
+
+    def getInstructions(self) -> Mapping:
+        return ChunkInstructions(self)
+
+    def getInstruction(self, order) -> parse.XMLInstruction:
+        instruction = self.elements.get(order)
+        if instruction is None:
+            chunk = self.chunks[self.chunkOf[order]]
+            instruction = chunk.decodeInstruction(chunk.findPosition(order))
+            self.elements[order] = instruction
+        return instruction
+
+    def getLabelInstructions(self) -> list:
+        labels = []
+        for chunk in self.chunks:
+            for position in chunk.labels:
+                labels.append((chunk.orders[position], self.getInstruction(chunk.orders[position])))
+        return labels
@@ -9,6 +9,8 @@ class Parser:
         self.currentInstruction = None
         self.currentArgument = None
         self.xmlElements = XMLElements()
+        # Arguments with same number, type and text are shared by all instructions
+        self.arguments = {}
 
     # Parse XML file and return list of instructions
     def run(self):
@@ -30,12 +32,14 @@ class Parser:
         expatParser.buffer_text = True
         return expatParser
 
-    # Open source file or use stdin
+    # Open source file, use stdin or binary file object given instead of name
     def openSource(self, fileName):
-        if fileName is not None:
+        if fileName is None:
+            file = sys.stdin.buffer
+        elif isinstance(fileName, str):
             file = self.tryOpenFile(fileName)
         else:
-            file = sys.stdin.buffer
+            file = fileName
         return file
 
     # Try to open source file and exits if it fails
@@ -80,8 +84,7 @@ class Parser:
         # Handle instruction element
         if name.startswith("arg") and self.currentArgument is not None:
             if self.currentArgument.getData() is None:
-                self.currentArgument._setValue("")
-                self.currentInstruction.appendArgument(self.currentArgument)
+                self.setArgumentValue("")
                 self.currentArgument = None
 
         # Handle instruction element
@@ -104,8 +107,22 @@ class Parser:
             sys.stderr.write(f"ERR: Argument element not found.")
             exit(error.wrongXMLFormat)
 
-        self.currentArgument._setValue(data)
-        self.currentInstruction.appendArgument(self.currentArgument)
+        self.setArgumentValue(data)
+
+    # Set value of current argument, identical arguments are created only once
+    def setArgumentValue(self, data:str):
+        argument = self.sharedArgument(self.currentArgument.getArgNumber(), self.currentArgument.getXmlType(), data)
+        self.currentArgument = argument
+        self.currentInstruction.appendArgument(argument)
+
+    def sharedArgument(self, argNumber, type, data:str) -> "XMLArgument":
+        key = (argNumber, type, data)
+        argument = self.arguments.get(key)
+        if argument is None:
+            argument = XMLArgument(argNumber, type)
+            argument._setValue(data)
+            self.arguments[key] = argument
+        return argument
 
     # Checks validity of XML header
     def checkProgramAttributes(self, attrs) -> bool:
@@ -115,6 +132,8 @@ class Parser:
         return 1
 
 class Symbol:
+    __slots__ = ("value", "type")
+
     def __init__(self, value, type):
         if type == "string":
             value = self.replaceEscSeq(value)
@@ -153,6 +172,8 @@ class Symbol:
         return string
  
 class Variable(Symbol):
+    __slots__ = ("name",)
+
     def __init__(self, name, type):
         self.name = name
         self.type = type
@@ -162,15 +183,19 @@ class Variable(Symbol):
         return self.name
     
 class XMLVariable(Variable):
+    __slots__ = ("frameName",)
+
     def __init__(self, name, frameName, type):
-        self.name = name
-        self.frameName = frameName
+        self.name = sys.intern(name)
+        self.frameName = sys.intern(frameName)
         self.type = type
 
     def getFrameName(self)->str:
         return self.frameName
     
 class XMLArgument:
+    __slots__ = ("argNumber", "type", "value")
+
     def __init__(self, argNumber, type):
         self.argNumber = argNumber
         self.type = type
@@ -182,6 +207,8 @@ class XMLArgument:
             self.value = XMLVariable(varName, frameName, self.type)
         else:
             self.value = Symbol(value, self.type)
+            if type(self.value.getValue()) == str:
+                self.value.setValue(sys.intern(self.value.getValue()))
             
     def getArgNumber(self) -> int:
         return self.argNumber
@@ -191,11 +218,16 @@ class XMLArgument:
 
     def getData(self) -> XMLVariable|Symbol:
         return self.value
+
+    def setData(self, value:XMLVariable|Symbol):
+        self.value = value
     
 class XMLInstruction():  
+    __slots__ = ("opcode", "order", "arguments", "keys")
+
     def __init__(self, attrs): 
         try:
-            self.opcode = str(attrs["opcode"]).upper()
+            self.opcode = upperOpcode(attrs["opcode"])
             self.order = int(attrs["order"])
             if int(self.order) <= 0:
                 sys.stderr.write(f"ERR: Wrong instruction element order.")
@@ -204,20 +236,25 @@ class XMLInstruction():
             sys.stderr.write(f"ERR: Wrong instruction element structure.")
             exit(error.wrongXMLStructure)
 
-        self.arguments = {}
+        # Arguments are kept in order of appending, instruction has only few of them
+        self.arguments = ()
+        self.keys = ()
 
     def getOpcode(self) -> str:
         return self.opcode
     
     def getArgument(self, name) -> XMLArgument:
-        try:
-            return self.arguments[name]
-        except KeyError:
-            sys.stderr.write(f"ERR: Argument {name} not found.")
-            exit(error.wrongXMLStructure)
+        # Arguments are usually appended in order of their numbers
+        if 0 < name <= len(self.arguments) and self.keys[name - 1] == name:
+            return self.arguments[name - 1]
+        for argument in self.arguments:
+            if argument.argNumber == name:
+                return argument
+        sys.stderr.write(f"ERR: Argument {name} not found.")
+        exit(error.wrongXMLStructure)
     
-    def getArgumentsKeys(self) -> list:
-        return self.arguments.keys()
+    def getArgumentsKeys(self) -> tuple:
+        return self.keys
     
     def getOrder(self) -> int:
         return self.order
@@ -230,9 +267,45 @@ class XMLInstruction():
             exit(error.wrongXMLStructure)
         return xmlArgument
     
+    # Append argument, argument with same number is replaced
     def appendArgument(self, argument:XMLArgument):
         argNumber = argument.getArgNumber()
-        self.arguments[argNumber] = argument
+        for index, appended in enumerate(self.arguments):
+            if appended.argNumber == argNumber:
+                self.arguments = self.arguments[:index] + (argument,) + self.arguments[index + 1:]
+                return
+        self.arguments += (argument,)
+        keys = self.keys + (argNumber,)
+        self.keys = argumentKeys.setdefault(keys, keys)
+
+# Tuples of argument numbers are shared by all instructions
+argumentKeys = {}
+
+# Upper-cased opcodes are shared by all instructions
+opcodes = {}
+
+def upperOpcode(opcode) -> str:
+    upper = opcodes.get(opcode)
+    if upper is None:
+        upper = sys.intern(str(opcode).upper())
+        if len(opcodes) < 1024:
+            opcodes[opcode] = upper
+    return upper
+
+# Create variable argument from already split frame and variable name
+def makeVariableArgument(argNumber, frameName, name) -> XMLArgument:
+    argument = XMLArgument(argNumber, "var")
+    argument.setData(XMLVariable(name, frameName, "var"))
+    return argument
+
+# Create constant argument from already converted value
+def makeSymbolArgument(argNumber, type, value) -> XMLArgument:
+    symbol = Symbol("", "nil")
+    symbol.setValue(value)
+    symbol.setType(type)
+    argument = XMLArgument(argNumber, type)
+    argument.setData(symbol)
+    return argument
 
 class XMLElements:
     def __init__(self):
@@ -241,13 +314,50 @@ class XMLElements:
     def appendInstruction(self, element:XMLInstruction):
         order = element.getOrder()
         if self.elements.get(order) != None:
-            sys.stderr.write(f"ERR: Duplicit order of some instructions.")	
-            exit(error.wrongXMLStructure)
+            self.duplicateOrder()
             
         self.elements[element.order] = element
 
+    def duplicateOrder(self):
+        sys.stderr.write(f"ERR: Duplicit order of some instructions.")	
+        exit(error.wrongXMLStructure)
+
     def getInstructions(self) -> dict:
         return self.elements
     
     def getInstruction(self, order) -> XMLInstruction:
-        return self.elements[order]
\ No newline at end of file
+        return self.elements[order]
+
+    # Return (order, instruction) pairs of LABEL instructions in document order
+    def getLabelInstructions(self) -> list:
+        return [(order, instruction) for order, instruction in self.elements.items() if instruction.getOpcode() == "LABEL"]
+
+    # Return orders of instructions in ascending order
+    def getOrderList(self):
+        return sorted(self.getInstructions())
+
+# Magic number of binary program, see binprog.py
+binaryMagic = b"IPPB"
+
+# Detect representation of source file (stdin if None) from its start: "binary", "source" or "xml"
+# Loader of other representations is then not imported at all
+def sourceFormat(fileName) -> str:
+    if fileName is None:
+        start = sys.stdin.buffer.peek(64)
+    else:
+        try:
+            with open(fileName, "rb") as file:
+                start = file.read(64)
+        except IOError:
+            # Missing file is reported by XML parser
+            return "xml"
+    return dataFormat(start)
+
+# Detect representation of program from start of its data
+def dataFormat(start:bytes) -> str:
+    if start[:len(binaryMagic)] == binaryMagic:
+        return "binary"
+    start = start.removeprefix(b"\xef\xbb\xbf").lstrip()
+    if len(start) != 0 and not start.startswith(b"<"):
+        return "source"
+    return "xml"
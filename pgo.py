@@ -0,0 +1,193 @@
+import hashlib
+import struct
+import sys
+from array import array
+import error
+import parse
+
+# Profile file layout (little endian):
+#   header - magic, version, instruction count, number of merged runs, SHA-256 of program
+#   counts - instructionCount x u32 executions of instruction
+#   types  - instructionCount x u16 types of variable operands, typeBits for each argument shifted by 5 * (number - 1)
+#   taken  - instructionCount x u32 executions of conditional jump which jumped
+# Counts saturate at the largest u32 value.
+
+magic = b"IPPF"
+version = 1
+
+headerFormat = struct.Struct("<4sHII32s")
+
+maxCount = 0xFFFFFFFF
+
+# Bit of each type a variable operand was seen with, unset variable included
+typeBits = {"int": 1, "bool": 2, "string": 4, "nil": 8, None: 16}
+bitTypes = {bit: type for type, bit in typeBits.items()}
+
+branchOps = {"JUMPIFEQ", "JUMPIFNEQ"}
+
+class Profile:
+    def __init__(self, digest, counts:array, types:array, taken:array, runs):
+        self.digest = digest
+        self.counts = counts
+        self.types = types
+        self.taken = taken
+        self.runs = runs
+
+    def getCount(self, index) -> int:
+        return self.counts[index]
+
+    # Return the only type variable argument had, None if it had more types or was not executed
+    def getType(self, index, argNumber):
+        bits = (self.types[index] >> 5 * (argNumber - 1)) & 31
+        return bitTypes.get(bits)
+
+    # Return share of executions in which conditional jump jumped, None if it was not executed
+    def getTakenShare(self, index):
+        if self.counts[index] == 0:
+            return None
+        return self.taken[index] / self.counts[index]
+
+    # Return indexes of instructions executed at least given times
+    def hotIndexes(self, threshold) -> list:
+        return [index for index, count in enumerate(self.counts) if count >= threshold]
+
+    # Add profile of other run of the same program
+    def merge(self, other):
+        self.counts = array("I", [min(a + b, maxCount) for a, b in zip(self.counts, other.counts)])
+        self.types = array("H", [a | b for a, b in zip(self.types, other.types)])
+        self.taken = array("I", [min(a + b, maxCount) for a, b in zip(self.taken, other.taken)])
+        self.runs += other.runs
+
+    def write(self, fileName):
+        with open(fileName, "wb") as file:
+            file.write(headerFormat.pack(magic, version, len(self.counts), self.runs, self.digest))
+            file.write(self.counts.tobytes())
+            file.write(self.types.tobytes())
+            file.write(self.taken.tobytes())
+
+# Observer recording profile of executed program
+class Profiler:
+    def __init__(self, fileName, interpret):
+        self.fileName = fileName
+        self.interpret = interpret
+        self.counts = []
+        self.types = []
+        self.taken = []
+        # Variable operands of instruction at index as (shift, frame name, variable name)
+        self.operands = {}
+        # Index of conditional jump executed last, its direction is known from next instruction
+        self.branch = None
+
+    def prepare(self, size):
+        missing = size - len(self.counts)
+        if missing > 0:
+            self.counts += [0] * missing
+            self.types += [0] * missing
+            self.taken += [0] * missing
+
+    def beforeInstruction(self, interpret, executor, instruction:parse.XMLInstruction):
+        index = interpret.orderIndex
+        if self.branch is not None:
+            if index != self.branch + 1:
+                self.taken[self.branch] += 1
+            self.branch = None
+        if index >= len(self.counts):
+            self.prepare(len(interpret.orderList))
+        self.counts[index] += 1
+
+        operands = self.operands.get(index)
+        if operands is None:
+            operands = variableOperands(instruction)
+            self.operands[index] = operands
+        if len(operands) != 0:
+            mask = self.types[index]
+            for shift, frameName, name in operands:
+                variable = findVariable(executor, frameName, name)
+                if variable is not None:
+                    mask |= typeBits.get(variable.getType(), 0) << shift
+            self.types[index] = mask
+        if instruction.getOpcode() in branchOps:
+            self.branch = index
+
+    # Write profile, earlier runs of the same program in file are added to it
+    def close(self):
+        orderList = self.interpret.orderList
+        size = len(orderList)
+        self.prepare(size)
+        profile = Profile(programDigest(self.interpret.program, orderList),
+                          array("I", [min(count, maxCount) for count in self.counts[:size]]),
+                          array("H", self.types[:size]),
+                          array("I", [min(count, maxCount) for count in self.taken[:size]]), 1)
+        previous = readProfile(self.fileName)
+        if previous is not None and previous.digest == profile.digest:
+            profile.merge(previous)
+        try:
+            profile.write(self.fileName)
+        except IOError:
+            sys.stderr.write("ERR: Cannot write profile file.")
+            exit(error.wrongOutputFile)
+
+# Return (shift, frame name, variable name) of variable arguments of instruction
+def variableOperands(instruction:parse.XMLInstruction) -> tuple:
+    operands = []
+    for key in instruction.getArgumentsKeys():
+        argument = instruction.getArgument(key)
+        if argument.getXmlType() == "var" and 1 <= key <= 3 and isinstance(argument.getData(), parse.XMLVariable):
+            operands.append((5 * (key - 1), argument.getData().getFrameName(), argument.getData().getName()))
+    return tuple(operands)
+
+# Return variable without reporting errors, None if it does not exist
+def findVariable(executor, frameName, name):
+    if frameName == "GF":
+        frame = executor.globalFrame
+    elif frameName == "LF":
+        frame = None if executor.localFrameStack.isEmpty() else executor.localFrameStack.top()
+    elif frameName == "TF":
+        frame = executor.tempFrame
+    else:
+        frame = None
+    if frame is None:
+        return None
+    return frame.variables.get(name)
+
+# Hash of instructions in execution order, profile of other program must not be used
+def programDigest(program:parse.XMLElements, orderList) -> bytes:
+    digest = hashlib.sha256()
+    for order in orderList:
+        instruction = program.getInstruction(order)
+        parts = [str(order), instruction.getOpcode()]
+        for key in instruction.getArgumentsKeys():
+            argument = instruction.getArgument(key)
+            data = argument.getData()
+            if isinstance(data, parse.XMLVariable):
+                parts += [str(key), "var", str(data.getFrameName()), str(data.getName())]
+            else:
+                parts += [str(key), str(argument.getXmlType()), repr(None if data is None else data.getValue())]
+        digest.update("\0".join(parts).encode("utf-8", "surrogatepass") + b"\1")
+    return digest.digest()
+
+# Read profile file, None if it does not exist or is not valid
+def readProfile(fileName):
+    try:
+        with open(fileName, "rb") as file:
+            data = file.read()
+    except IOError:
+        return None
+    if len(data) < headerFormat.size:
+        return None
+    fileMagic, fileVersion, count, runs, digest = headerFormat.unpack_from(data)
+    if fileMagic != magic or fileVersion != version or len(data) != headerFormat.size + 10 * count:
+        return None
+    offset = headerFormat.size
+    counts = array("I", data[offset:offset + 4 * count])
+    types = array("H", data[offset + 4 * count:offset + 6 * count])
+    taken = array("I", data[offset + 6 * count:])
+    return Profile(digest, counts, types, taken, runs)
+
+# Return profile recorded for program, None if it is missing or belongs to other program
+def load(fileName, program:parse.XMLElements, orderList):
+    profile = readProfile(fileName)
+    if profile is None or len(profile.counts) != len(orderList) or profile.digest != programDigest(program, orderList):
+        sys.stderr.write("Profile: profile does not match program, it is ignored.\n")
+        return None
+    return profile
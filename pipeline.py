@@ -0,0 +1,113 @@
+import queue
+import sys
+import threading
+import error
+import parse
+
+# Batches of instructions parsed ahead of execution
+defaultQueueSize = 16
+
+# Batches grow up to this size, small first batches let execution start early
+maxBatchSize = 256
+
+# XML program parsed in producer thread while it is executed
+# Instructions must come in ascending order, they are handed to executing thread in batches through bounded queue
+class PipelinedElements(parse.XMLElements):
+    def __init__(self, fileName, queueSize=defaultQueueSize):
+        super().__init__()
+        self.queue = queue.Queue(queueSize)
+        self.parser = parse.Parser(fileName)
+        self.parser.xmlElements = self
+        self.lastOrder = 0
+        self.batch = []
+        self.batchSize = 1
+        # Following attributes are used only by executing thread
+        self.orderList = []
+        self.instructions = {}
+        self.pendingLabels = []
+        self.onLabel = None
+        self.done = False
+
+    def start(self):
+        threading.Thread(target=self.produce, daemon=True).start()
+
+    # Parse program, last item in queue is exit code of parser or exception raised by it
+    def produce(self):
+        try:
+            self.parser.run()
+            result = error.ok
+        except SystemExit as e:
+            result = e.code
+        except Exception as e:
+            result = e
+        self.queue.put(self.batch)
+        self.queue.put(result)
+
+    # Called by parser, checks order and passes instruction to executing thread
+    def appendInstruction(self, element:parse.XMLInstruction):
+        super().appendInstruction(element)
+        order = element.getOrder()
+        if order < self.lastOrder:
+            sys.stderr.write(f"ERR: Pipelined execution needs instructions in ascending order.")
+            exit(error.wrongXMLStructure)
+        self.lastOrder = order
+        self.batch.append(element)
+        if len(self.batch) >= self.batchSize:
+            self.queue.put(self.batch)
+            self.batch = []
+            self.batchSize = min(2 * self.batchSize, maxBatchSize)
+
+    # Take next batch of parsed instructions, return False if parsing is finished
+    def fetch(self) -> bool:
+        if self.done:
+            return False
+        batch = self.queue.get()
+        if type(batch) != list:
+            self.done = True
+            if isinstance(batch, Exception):
+                raise batch
+            if batch != error.ok:
+                exit(batch)
+            return False
+
+        for instruction in batch:
+            order = instruction.getOrder()
+            self.orderList.append(order)
+            self.instructions[order] = instruction
+            if instruction.getOpcode() == "LABEL":
+                self.pendingLabels.append((order, instruction))
+        return True
+
+    def registerLabels(self):
+        labels = self.pendingLabels
+        self.pendingLabels = []
+        for order, instruction in labels:
+            self.onLabel(order, instruction)
+
+    # Wait until instruction at index is parsed, return False if there is no such instruction
+    def ensureIndex(self, index) -> bool:
+        while len(self.orderList) <= index:
+            if not self.fetch():
+                return False
+            self.registerLabels()
+        return True
+
+    # Wait until label is parsed or whole program is parsed
+    def waitForLabel(self, labels:dict, labelName):
+        while labels.get(labelName) is None and self.fetch():
+            self.registerLabels()
+
+    # Parse rest of program, parser errors and labels are reported before any error of execution
+    def finish(self):
+        while self.fetch():
+            pass
+        self.registerLabels()
+
+    def getInstructions(self) -> dict:
+        return self.instructions
+
+    def getInstruction(self, order) -> parse.XMLInstruction:
+        return self.instructions[order]
+
+    def getLabelInstructions(self) -> list:
+        return [(order, instruction) for order, instruction in self.instructions.items() if instruction.getOpcode() == "LABEL"]
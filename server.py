@@ -0,0 +1,343 @@
+import asyncio
+import codecs
+import collections
+import contextlib
+import hashlib
+import io
+import json
+import os
+import signal
+import stat
+import sys
+import threading
+import traceback
+import error
+import interpreter
+
+# Parsed programs kept in memory, least recently used one is dropped first
+maxCached = 256
+
+# Seconds request may run when it does not give its own limit
+defaultTimeout = 10.0
+
+# Longest request line, it may carry whole program
+maxRequestSize = 64 * 1024 * 1024
+
+# Persistent interpreter serving requests on Unix socket
+#
+# Request is line of JSON: {"source": path} or {"program": XML or IPPcode23 text}, optionally with "input" text,
+# "maxInstructions" and "timeout" in seconds. Response is streamed as lines of JSON: {"stdout": text} and
+# {"stderr": text} as program writes them and {"exit": code} at the end. Connection may carry more requests.
+#
+# Programs are parsed once for each content hash. Every request is executed in forked process, so it starts with
+# clean Executor state, and its errors, exits and crashes do not affect server or other requests.
+class Server:
+    def __init__(self, interpret, socketPath, workers=None):
+        self.interpret = interpret
+        self.socketPath = socketPath
+        self.workerCount = workers if workers is not None else os.cpu_count() or 1
+        self.workers = None
+        self.programs = collections.OrderedDict()
+        # Programs are read from requests, not from options
+        interpret.sourceFile = None
+        interpret.pipeline = False
+        interpret.parseWorkers = None
+
+    def run(self):
+        self.stderr = ThreadStderr(sys.stderr)
+        sys.stderr = self.stderr
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.removeSocket()
+
+    async def serve(self):
+        self.workers = asyncio.Semaphore(self.workerCount)
+        self.removeSocket()
+        try:
+            listener = await asyncio.start_unix_server(self.handle, self.socketPath, limit=maxRequestSize)
+        except OSError as e:
+            sys.stderr.write(f"ERR: Cannot listen on socket {self.socketPath}: {e}")
+            exit(error.wrongOutputFile)
+
+        stopped = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+        async with listener:
+            await stopped.wait()
+
+    # Remove socket left by previous server, other files are kept
+    def removeSocket(self):
+        try:
+            if stat.S_ISSOCK(os.stat(self.socketPath).st_mode):
+                os.unlink(self.socketPath)
+        except OSError:
+            pass
+
+    # Answer requests of one connection
+    async def handle(self, reader, writer):
+        connection = Connection(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if len(line) == 0:
+                    break
+                await self.respond(line, connection)
+        except (ConnectionError, ValueError):
+            # Client disconnected or sent line longer than limit
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, line, connection):
+        try:
+            request = Request(json.loads(line), self.interpret.maxInstructions)
+        except (ValueError, TypeError) as e:
+            await connection.send({"stderr": f"ERR: Invalid request: {e}"})
+            await connection.send({"exit": error.wrongArguments})
+            return
+
+        data = request.readProgram()
+        if data is None:
+            await connection.send({"stderr": "ERR: File does not appear to exist."})
+            await connection.send({"exit": error.wrongInputFile})
+            return
+        program, messages, code = await self.loadProgram(data)
+        if len(messages) != 0:
+            await connection.send({"stderr": messages})
+        if code is None:
+            async with self.workers:
+                code = await self.execute(program, request, connection)
+        await connection.send({"exit": code})
+
+    # Return (program, messages, exit code) of parsed program, code is None if it was parsed
+    async def loadProgram(self, data:bytes):
+        key = hashlib.sha256(data).digest()
+        entry = self.programs.get(key)
+        if entry is not None:
+            self.programs.move_to_end(key)
+            return entry
+
+        # Parsing runs in thread, output of running requests and other connections are served meanwhile
+        entry = await asyncio.get_running_loop().run_in_executor(None, self.parseProgram, data)
+        self.programs[key] = entry
+        if len(self.programs) > maxCached:
+            self.programs.popitem(last=False)
+        return entry
+
+    # Parse program and keep its error output, runs outside of event loop
+    def parseProgram(self, data:bytes):
+        messages = io.StringIO()
+        program = None
+        code = None
+        try:
+            with self.stderr.redirect(messages):
+                program = self.interpret.loadProgram(data)
+                if self.interpret.optimize:
+                    program = self.interpret.optimizeProgram(program)
+        except SystemExit as e:
+            code = exitCode(e)
+        except Exception:
+            # Crash of parser is reported as by interpreter started for the program
+            traceback.print_exc(file=messages)
+            code = 1
+        return program, messages.getvalue(), code
+
+    # Run program in forked process and stream its output, return its exit code
+    async def execute(self, program, request, connection) -> int:
+        stdoutRead, stdoutWrite = os.pipe()
+        stderrRead, stderrWrite = os.pipe()
+        # Buffered output would be written by both processes
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            os.close(stdoutRead)
+            os.close(stderrRead)
+            self.runChild(program, request, stdoutWrite, stderrWrite)
+        os.close(stdoutWrite)
+        os.close(stderrWrite)
+
+        finished = False
+        try:
+            output = asyncio.gather(connection.forward(stdoutRead, "stdout"), connection.forward(stderrRead, "stderr"))
+            try:
+                await asyncio.wait_for(output, request.timeout)
+            except asyncio.TimeoutError:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                finished = True
+                await connection.send({"stderr": f"ERR: Time limit {request.timeout} s exceeded."})
+                return error.limitExceeded
+            # Output is closed when process ends
+            status = os.waitpid(pid, 0)[1]
+            finished = True
+            return os.waitstatus_to_exitcode(status)
+        finally:
+            if not finished:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+
+    # Execute program in forked process, never returns
+    def runChild(self, program, request, stdout, stderr):
+        code = error.ok
+        try:
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            os.dup2(stdout, 1)
+            os.dup2(stderr, 2)
+            os.close(stdout)
+            os.close(stderr)
+
+            interpret = self.interpret
+            interpret.inputFile = io.StringIO(request.input)
+            interpret.maxInstructions = request.maxInstructions
+            interpreter.interpret = interpret
+            interpret.createObservers()
+            try:
+                interpret.execute(program)
+            finally:
+                for observer in interpret.observers:
+                    observer.close()
+        except SystemExit as e:
+            code = exitCode(e)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            except OSError:
+                pass
+            os._exit(code)
+
+# Standard error output which may be redirected for one thread, other threads write to original stream
+class ThreadStderr:
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    @contextlib.contextmanager
+    def redirect(self, target):
+        self.local.target = target
+        try:
+            yield target
+        finally:
+            del self.local.target
+
+    def write(self, text):
+        return getattr(self.local, "target", self.stream).write(text)
+
+    def flush(self):
+        getattr(self.local, "target", self.stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+class Request:
+    def __init__(self, request, maxInstructions):
+        if not isinstance(request, dict):
+            raise TypeError("request must be object")
+        self.source = request.get("source")
+        self.program = request.get("program")
+        if (self.source is None) == (self.program is None):
+            raise ValueError("exactly one of source and program must be given")
+        if not isinstance(self.source if self.source is not None else self.program, str):
+            raise TypeError("source and program must be strings")
+        self.input = request.get("input", "")
+        if not isinstance(self.input, str):
+            raise TypeError("input must be string")
+        self.maxInstructions = positiveNumber(request, "maxInstructions", maxInstructions, int)
+        self.timeout = positiveNumber(request, "timeout", defaultTimeout, (int, float))
+
+    # Return program data, None if source file can not be read
+    def readProgram(self):
+        if self.program is not None:
+            return self.program.encode("utf-8", "surrogatepass")
+        try:
+            with open(self.source, "rb") as file:
+                return file.read()
+        except IOError:
+            return None
+
+class Connection:
+    def __init__(self, writer):
+        self.writer = writer
+        # Output of program is forwarded from two pipes at once
+        self.lock = asyncio.Lock()
+
+    async def send(self, message):
+        async with self.lock:
+            self.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+            await self.writer.drain()
+
+    # Send everything written to pipe as messages with given key
+    async def forward(self, fd, key):
+        reader = asyncio.StreamReader()
+        transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(fd, "rb", 0))
+        # Multibyte characters may be split between reads
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        try:
+            while True:
+                data = await reader.read(65536)
+                text = decoder.decode(data, final=len(data) == 0)
+                if len(text) != 0:
+                    await self.send({key: text})
+                if len(data) == 0:
+                    break
+        finally:
+            transport.close()
+
+def positiveNumber(request, key, default, types):
+    value = request.get(key, default)
+    if value is not None and (not isinstance(value, types) or isinstance(value, bool) or value <= 0):
+        raise ValueError(f"{key} must be positive number")
+    return value
+
+def exitCode(e:SystemExit) -> int:
+    if e.code is None:
+        return error.ok
+    return e.code if isinstance(e.code, int) else 1
+
+# Send request and return (stdout, stderr, exit code) of program
+async def request(reader, writer, message):
+    writer.write(json.dumps(message).encode("utf-8") + b"\n")
+    await writer.drain()
+    output = {"stdout": [], "stderr": []}
+    while True:
+        line = await reader.readline()
+        if len(line) == 0:
+            raise ConnectionError("server closed connection")
+        response = json.loads(line)
+        if "exit" in response:
+            return "".join(output["stdout"]), "".join(output["stderr"]), response["exit"]
+        for key, text in response.items():
+            output[key].append(text)
+
+async def runClient(socketPath, sourceFile, inputFile):
+    reader, writer = await asyncio.open_unix_connection(socketPath, limit=maxRequestSize)
+    message = {"source": os.path.abspath(sourceFile)}
+    if inputFile is not None:
+        with open(inputFile, "r", encoding="utf-8") as file:
+            message["input"] = file.read()
+    try:
+        return await request(reader, writer, message)
+    finally:
+        writer.close()
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        sys.stderr.write("Usage: server.py socket source [input]")
+        exit(error.wrongArguments)
+    try:
+        stdout, stderr, code = asyncio.run(runClient(sys.argv[1], sys.argv[2], sys.argv[3] if len(sys.argv) == 4 else None))
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"ERR: Request failed: {e}")
+        exit(error.internalError)
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    exit(code)
@@ -0,0 +1,75 @@
+import signal
+import sys
+from multiprocessing import resource_tracker, shared_memory
+import binprog
+import error
+
+# Program shared by processes running it
+#
+# Loader process (--share=name) encodes parsed program into binary representation of binprog.py, which is flat
+# and needs no pointers: instruction table, constant pool with strings and index of labels. It is placed into
+# shared memory segment kept until loader is interrupted. Workers (--attach=name) map the segment read only and
+# execute it in place, only instructions executed recently are decoded into objects of their own.
+
+# Decoded instructions kept by worker, cache is emptied when it is full
+cacheSize = 4096
+
+class SharedElements(binprog.BinaryElements):
+    def __init__(self, memory):
+        self.memory = memory
+        super().__init__(memory.buf.toreadonly())
+
+    def getInstruction(self, order):
+        instruction = self.elements.get(order)
+        if instruction is None:
+            if len(self.elements) >= cacheSize:
+                self.elements.clear()
+            instruction = self.decodeInstruction(self.findPosition(order))
+            self.elements[order] = instruction
+        return instruction
+
+class AttachedMemory(shared_memory.SharedMemory):
+    # Views of program live until exit, mapping is released together with process
+    def __del__(self):
+        pass
+
+# Place program into new shared memory segment and keep it there until SIGINT or SIGTERM
+def share(program, name):
+    data = binprog.Encoder().encode(program)
+    try:
+        memory = shared_memory.SharedMemory(name, create=True, size=len(data))
+    except FileExistsError:
+        sys.stderr.write(f"ERR: Shared memory {name} already exists.")
+        exit(error.wrongOutputFile)
+    except (OSError, ValueError):
+        sys.stderr.write(f"ERR: Cannot create shared memory {name}.")
+        exit(error.wrongOutputFile)
+
+    signals = {signal.SIGINT, signal.SIGTERM}
+    signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+    try:
+        memory.buf[:len(data)] = data
+        # Workers may attach once name is printed
+        print(name, flush=True)
+        signal.sigwait(signals)
+    finally:
+        memory.close()
+        memory.unlink()
+
+# Return program shared by loader process
+def attach(name) -> SharedElements:
+    try:
+        if sys.version_info >= (3, 13):
+            memory = AttachedMemory(name, track=False)
+        else:
+            # Resource tracker would remove segment when worker ends, it can not be disabled before Python 3.13
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                memory = AttachedMemory(name)
+            finally:
+                resource_tracker.register = register
+    except (OSError, ValueError):
+        sys.stderr.write(f"ERR: Shared program {name} does not exist.")
+        exit(error.wrongInputFile)
+    return SharedElements(memory)
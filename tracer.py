@@ -0,0 +1,240 @@
+import struct
+import sys
+import time
+import error
+import parse
+
+# Trace file layout (little endian):
+#   header   - magic, version, record size, ring capacity, recorded count, sampling period, opcode count
+#   opcodes  - opcodeCount x (u8 length, UTF-8 name)
+#   records  - min(count, capacity) records from oldest to newest
+# Record is (u64 sequence, i64 nanoseconds since start, u64 order, u16 opcode, u64 call depth, operands text)
+
+magic = b"IPPT"
+version = 2
+
+headerFormat = struct.Struct("<4sHHIQII")
+recordFormat = struct.Struct("<QqQHQ36s")
+
+defaultCapacity = 65536
+
+class Tracer:
+    def __init__(self, fileName, every=1, callsOnly=False, capacity=defaultCapacity):
+        self.fileName = fileName
+        self.every = every
+        self.callsOnly = callsOnly
+        self.capacity = capacity
+        self.ring = bytearray(capacity * recordFormat.size)
+        self.count = 0
+        self.executed = 0
+        self.opcodes = {}
+        self.start = time.perf_counter_ns()
+
+    # Record instruction before it is executed if it is sampled
+    def beforeInstruction(self, interpret, executor, instruction:parse.XMLInstruction):
+        self.executed += 1
+        opcode = instruction.getOpcode()
+        if opcode != "CALL" and opcode != "RETURN":
+            if self.callsOnly or self.executed % self.every != 0:
+                return
+        self.record(executor, instruction, opcode)
+
+    def record(self, executor, instruction:parse.XMLInstruction, opcode):
+        opcodeId = self.opcodes.get(opcode)
+        if opcodeId is None:
+            opcodeId = len(self.opcodes)
+            self.opcodes[opcode] = opcodeId
+
+        operands = " ".join(self.describeArgument(executor, instruction.getArgument(key))
+                            for key in sorted(instruction.getArgumentsKeys()))
+        offset = (self.count % self.capacity) * recordFormat.size
+        recordFormat.pack_into(self.ring, offset, self.count, time.perf_counter_ns() - self.start,
+                               instruction.getOrder(), opcodeId, executor.getCallDepth(),
+                               operands.encode("utf-8", "replace")[:36])
+        self.count += 1
+
+    # Describe argument with resolved value, never fails on undefined frames or variables
+    def describeArgument(self, executor, argument:parse.XMLArgument) -> str:
+        data = argument.getData()
+        if argument.getXmlType() == "label":
+            return f"label@{data.getValue()}"
+        if argument.getXmlType() != "var":
+            return f"{argument.getXmlType()}@{shorten(data.getValue())}"
+
+        frame = None
+        frameName = data.getFrameName()
+        if frameName == "GF":
+            frame = executor.globalFrame
+        elif frameName == "LF" and not executor.localFrameStack.isEmpty():
+            frame = executor.localFrameStack.top()
+        elif frameName == "TF":
+            frame = executor.tempFrame
+
+        variable = frame.variables.get(data.getName()) if frame is not None else None
+        if variable is None:
+            return f"{frameName}@{data.getName()}=?"
+        return f"{frameName}@{data.getName()}={shorten(variable.getValue())}"
+
+    # Write ring buffer to trace file
+    def close(self):
+        opcodeData = bytearray()
+        for opcode in self.opcodes:
+            name = opcode.encode("utf-8")[:255]
+            opcodeData += bytes([len(name)]) + name
+
+        stored = min(self.count, self.capacity)
+        split = (self.count % self.capacity) * recordFormat.size
+        if self.count > self.capacity:
+            records = self.ring[split:] + self.ring[:split]
+        else:
+            records = self.ring[:split]
+
+        try:
+            with open(self.fileName, "wb") as file:
+                file.write(headerFormat.pack(magic, version, recordFormat.size, self.capacity,
+                                             self.count, 0 if self.callsOnly else self.every, len(self.opcodes)))
+                file.write(opcodeData)
+                file.write(records[:stored * recordFormat.size])
+        except IOError:
+            sys.stderr.write("ERR: Cannot write trace file.")
+            exit(error.wrongOutputFile)
+
+def shorten(value) -> str:
+    text = str(value)
+    if len(text) > 12:
+        return text[:11] + "~"
+    return text
+
+class TraceRecord:
+    def __init__(self, sequence, time, order, opcode, depth, operands):
+        self.sequence = sequence
+        self.time = time
+        self.order = order
+        self.opcode = opcode
+        self.depth = depth
+        self.operands = operands
+
+# Read trace file, return (header dict, list of records)
+def readTrace(fileName):
+    with open(fileName, "rb") as file:
+        data = file.read()
+    if len(data) < headerFormat.size:
+        raise ValueError("trace file is truncated")
+    fileMagic, fileVersion, recordSize, capacity, count, every, opcodeCount = headerFormat.unpack_from(data)
+    if fileMagic != magic or fileVersion != version or recordSize != recordFormat.size:
+        raise ValueError("not a trace file")
+
+    offset = headerFormat.size
+    opcodes = []
+    for _ in range(opcodeCount):
+        length = data[offset]
+        opcodes.append(data[offset + 1:offset + 1 + length].decode("utf-8"))
+        offset += 1 + length
+
+    records = []
+    for sequence, nanoseconds, order, opcode, depth, operands in recordFormat.iter_unpack(data[offset:]):
+        text = operands.rstrip(b"\0").decode("utf-8", "replace")
+        records.append(TraceRecord(sequence, nanoseconds, order, opcodes[opcode], depth, text))
+    header = {"capacity": capacity, "count": count, "every": every}
+    return header, records
+
+class CallNode:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total = 0
+        self.children = {}
+
+    def child(self, name):
+        node = self.children.get(name)
+        if node is None:
+            node = CallNode(name)
+            self.children[name] = node
+        return node
+
+    def selfTime(self) -> int:
+        return self.total - sum(child.total for child in self.children.values())
+
+# Build call tree with inclusive times from CALL and RETURN records
+def buildCallTree(records) -> CallNode:
+    root = CallNode("<program>")
+    if len(records) == 0:
+        return root
+    root.calls = 1
+    root.total = records[-1].time - records[0].time
+    stack = [(root, records[0].time)]
+    for record in records:
+        # Calls replaced by tail calls end together with function which returned
+        while len(stack) - 1 > record.depth:
+            node, start = stack.pop()
+            node.total += record.time - start
+        if record.opcode == "CALL":
+            label = record.operands.split(" ")[0].split("@", 1)[-1]
+            node = stack[-1][0].child(label)
+            node.calls += 1
+            stack.append((node, record.time))
+        elif record.opcode == "RETURN" and len(stack) > 1:
+            node, start = stack.pop()
+            node.total += record.time - start
+    # Close calls still running when trace ended
+    while len(stack) > 1:
+        node, start = stack.pop()
+        node.total += records[-1].time - start
+    return root
+
+# Print call tree, deeper levels of recursion are cut off at maxDepth
+def printCallTree(root, maxDepth=16, file=sys.stdout):
+    stack = [(root, 0)]
+    while len(stack) != 0:
+        node, depth = stack.pop()
+        if depth > maxDepth:
+            print(f"{'  ' * depth}...", file=file)
+            continue
+        print(f"{'  ' * depth}{node.name:<{max(1, 30 - 2 * depth)}} calls {node.calls:>9}  "
+              f"total {node.total / 1e6:>10.3f} ms  self {node.selfTime() / 1e6:>10.3f} ms", file=file)
+        for child in sorted(node.children.values(), key=lambda child: child.total):
+            stack.append((child, depth + 1))
+
+# Print call tree timing and hot path report of trace file
+def summarize(fileName, top=10, file=sys.stdout):
+    header, records = readTrace(fileName)
+    print(f"Recorded events: {header['count']}, kept in ring: {len(records)}", file=file)
+    if header["every"] == 0:
+        print("Sampling: CALL/RETURN only", file=file)
+    else:
+        print(f"Sampling: every {header['every']}. instruction and all CALL/RETURN", file=file)
+
+    print("\nCall tree:", file=file)
+    printCallTree(buildCallTree(records), file=file)
+
+    # Every sampled record stands for every executed instruction of its period
+    samples = {}
+    for record in records:
+        if header["every"] != 0 and record.opcode not in ("CALL", "RETURN"):
+            key = (record.order, record.opcode)
+            samples[key] = samples.get(key, 0) + 1
+    total = sum(samples.values())
+    if total > 0:
+        print(f"\nHot instructions (top {top}):", file=file)
+        for (order, opcode), count in sorted(samples.items(), key=lambda item: -item[1])[:top]:
+            print(f"  order {order:>8} {opcode:<10} {100 * count / total:6.2f} %", file=file)
+
+    # Hot paths as most frequent transitions between consecutive sampled orders
+    if header["every"] == 1:
+        edges = {}
+        for previous, current in zip(records, records[1:]):
+            key = (previous.order, current.order)
+            edges[key] = edges.get(key, 0) + 1
+        print(f"\nHot paths (top {top}):", file=file)
+        for (source, target), count in sorted(edges.items(), key=lambda item: -item[1])[:top]:
+            print(f"  {source:>8} -> {target:<8} {count:>9}x", file=file)
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.stderr.write("Usage: tracer.py trace.bin [top]")
+        exit(error.wrongArguments)
+    try:
+        summarize(sys.argv[1], int(sys.argv[2]) if len(sys.argv) == 3 else 10)
+    except (IOError, ValueError) as e:
+        sys.stderr.write(f"ERR: Cannot read trace: {e}")
+        exit(error.wrongInputFile)